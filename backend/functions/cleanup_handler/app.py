@@ -423,9 +423,38 @@ def archive_old_file_metadata(logger, cutoff_date, stats):
         print(f"[ARCHIVE_FILES] Error logged")
 
 
+# File statuses whose pay records are on their way out; rows carried over to a
+# file in one of these states are no longer anyone's current version
+RETIRED_FILE_STATUSES = ('ARCHIVED', 'DELETED')
+
+
+def is_file_live(file_id, status_cache):
+    """
+    Check whether a file still holds the current version of its rows
+
+    Args:
+        file_id: FileID to look up
+        status_cache: Dict of FileID -> Status shared across one cleanup run
+
+    Returns:
+        True unless the FILE item is missing, ARCHIVED or DELETED
+    """
+    if file_id not in status_cache:
+        print(f"[DELETE_RECORDS] Looking up status of file {file_id}")
+        item = table.get_item(Key={'PK': f'FILE#{file_id}', 'SK': 'METADATA'}).get('Item')
+        status_cache[file_id] = item.get('Status') if item else None
+        print(f"[DELETE_RECORDS] File {file_id} status: {status_cache[file_id]}")
+    status = status_cache[file_id]
+    return status is not None and status not in RETIRED_FILE_STATUSES
+
+
 def delete_old_pay_records(logger, cutoff_date, stats):
     """
     Delete old pay records from DynamoDB for archived files
+
+    Active rows of a file superseded in diff mode are kept while the file
+    that superseded it is live - they are part of its current version - and
+    deleted once that file has been archived too
     """
     print(f"[DELETE_RECORDS] ==================== Starting pay records deletion ====================")
     print(f"[DELETE_RECORDS] Cutoff date: {cutoff_date.isoformat()}")
@@ -443,6 +472,7 @@ def delete_old_pay_records(logger, cutoff_date, stats):
         print(f"[DELETE_RECORDS] Scan response: {scan_response}")
         print(f"[DELETE_RECORDS] Archived files found: {len(scan_response.get('Items', []))}")
 
+        status_cache = {}
         print("[DELETE_RECORDS] Iterating through archived files")
         for idx, file_item in enumerate(scan_response.get('Items', []), 1):
             print(f"[DELETE_RECORDS] -------------------- Processing archived file {idx} --------------------")
@@ -461,6 +491,12 @@ def delete_old_pay_records(logger, cutoff_date, stats):
                 print(f"[DELETE_RECORDS] Query response: {records_response}")
                 print(f"[DELETE_RECORDS] Records found: {len(records_response.get('Items', []))}")
 
+                superseded_by = file_item.get('SupersededBy')
+                keep_carried = bool(superseded_by) and is_file_live(superseded_by, status_cache)
+                print(f"[DELETE_RECORDS] SupersededBy: {superseded_by}, keep_carried: {keep_carried}")
+
+                records_deleted = 0
+                records_kept = 0
                 print("[DELETE_RECORDS] Deleting records in batch")
                 print(f"[DELETE_RECORDS] Creating batch_writer for table {TABLE_NAME}")
                 with table.batch_writer() as batch:
@@ -470,6 +506,13 @@ def delete_old_pay_records(logger, cutoff_date, stats):
                         print(f"[DELETE_RECORDS] Processing record {rec_num} for deletion")
                         print(f"[DELETE_RECORDS] Record PK: {record['PK']}, SK: {record['SK']}")
 
+                        # A diff supersede leaves unchanged rows active under the
+                        # older file; they belong to the current version now
+                        if keep_carried and record.get('IsActive'):
+                            print(f"[DELETE_RECORDS] Record {rec_num} carried over to file {superseded_by}, keeping")
+                            records_kept += 1
+                            continue
+
                         batch.delete_item(
                             Key={
                                 'PK': record['PK'],
@@ -478,16 +521,18 @@ def delete_old_pay_records(logger, cutoff_date, stats):
                         )
                         print(f"[DELETE_RECORDS] Record {rec_num} added to batch delete")
 
+                        records_deleted += 1
                         print(f"[DELETE_RECORDS] Incrementing dynamodb_records_deleted counter")
                         stats['dynamodb_records_deleted'] += 1
                         print(f"[DELETE_RECORDS] Current dynamodb_records_deleted: {stats['dynamodb_records_deleted']}")
 
                 print(f"[DELETE_RECORDS] Batch delete complete for file {file_id}")
-                print(f"[DELETE_RECORDS] Deleted {len(records_response.get('Items', []))} records")
+                print(f"[DELETE_RECORDS] Deleted {records_deleted} records, kept {records_kept} carried over")
 
                 logger.info("Deleted pay records for archived file",
                            file_id=file_id,
-                           records_deleted=len(records_response.get('Items', [])))
+                           records_deleted=records_deleted,
+                           records_kept=records_kept)
                 print(f"[DELETE_RECORDS] Logged deletion for file {file_id}")
 
             except Exception as e:
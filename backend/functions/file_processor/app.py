@@ -16,10 +16,6 @@ print("[FILE_PROCESSOR] About to execute: import os")
 import os
 print("[FILE_PROCESSOR] Result: os module imported")
 
-print("[FILE_PROCESSOR] About to execute: import tempfile")
-import tempfile
-print("[FILE_PROCESSOR] Result: tempfile module imported")
-
 print("[FILE_PROCESSOR] About to execute: import uuid")
 import uuid
 print("[FILE_PROCESSOR] Result: uuid module imported")
@@ -45,9 +41,36 @@ print("[FILE_PROCESSOR] About to execute: from common.dynamodb import DynamoDBCl
 from common.dynamodb import DynamoDBClient
 print("[FILE_PROCESSOR] Result: DynamoDBClient imported from common.dynamodb")
 
-print("[FILE_PROCESSOR] About to execute: from common.excel_parser import PayFileParser")
-from common.excel_parser import PayFileParser
-print("[FILE_PROCESSOR] Result: PayFileParser imported from common.excel_parser")
+print("[FILE_PROCESSOR] About to execute: from common.excel_parser import ENGINE_AUTO, ENGINE_CSV, PARSE_STREAMING_MIN_BYTES, PARSE_XML_MIN_BYTES, PayFileParser, resolve_filename_metadata, umbrella_code_from_records")
+from common.excel_parser import (
+    ENGINE_AUTO, ENGINE_CSV, PARSE_STREAMING_MIN_BYTES, PARSE_XML_MIN_BYTES,
+    PayFileParser, resolve_filename_metadata, umbrella_code_from_records
+)
+print("[FILE_PROCESSOR] Result: ENGINE_AUTO, ENGINE_CSV, PARSE_STREAMING_MIN_BYTES, PARSE_XML_MIN_BYTES, PayFileParser, resolve_filename_metadata, umbrella_code_from_records imported from common.excel_parser")
+
+print("[FILE_PROCESSOR] About to execute: from common.csv_reader import is_delimited_filename")
+from common.csv_reader import is_delimited_filename
+print("[FILE_PROCESSOR] Result: is_delimited_filename imported from common.csv_reader")
+
+print("[FILE_PROCESSOR] About to execute: from common.header_profiles import PROFILE_DRIFT")
+from common.header_profiles import PROFILE_DRIFT
+print("[FILE_PROCESSOR] Result: PROFILE_DRIFT imported from common.header_profiles")
+
+print("[FILE_PROCESSOR] About to execute: from common.artifact_cache import ParsedArtifactCache")
+from common.artifact_cache import ParsedArtifactCache
+print("[FILE_PROCESSOR] Result: ParsedArtifactCache imported from common.artifact_cache")
+
+print("[FILE_PROCESSOR] About to execute: from common.prefetch import Prefetch")
+from common.prefetch import Prefetch
+print("[FILE_PROCESSOR] Result: Prefetch imported from common.prefetch")
+
+print("[FILE_PROCESSOR] About to execute: from common.record_batch import RecordBatch")
+from common.record_batch import RecordBatch
+print("[FILE_PROCESSOR] Result: RecordBatch imported from common.record_batch")
+
+print("[FILE_PROCESSOR] About to execute: from common.record_diff import SUPERSEDE_DIFF, SUPERSEDE_MODE_PARAM, diff_records, normalize_supersede_mode")
+from common.record_diff import SUPERSEDE_DIFF, SUPERSEDE_MODE_PARAM, diff_records, normalize_supersede_mode
+print("[FILE_PROCESSOR] Result: SUPERSEDE_DIFF, SUPERSEDE_MODE_PARAM, diff_records, normalize_supersede_mode imported from common.record_diff")
 
 print("[FILE_PROCESSOR] About to execute: from common.validators import ValidationEngine")
 from common.validators import ValidationEngine
@@ -62,6 +85,10 @@ print("[FILE_PROCESSOR] About to execute: dynamodb_client = DynamoDBClient()")
 dynamodb_client = DynamoDBClient()
 print(f"[FILE_PROCESSOR] Result: dynamodb_client created = {dynamodb_client}")
 
+print("[FILE_PROCESSOR] About to execute: parsed_artifact_cache = ParsedArtifactCache(s3_client)")
+parsed_artifact_cache = ParsedArtifactCache(s3_client)
+print(f"[FILE_PROCESSOR] Result: parsed_artifact_cache created = {parsed_artifact_cache}")
+
 
 def lambda_handler(event, context):
     """Main Lambda handler"""
@@ -154,6 +181,149 @@ def lambda_handler(event, context):
         raise
 
 
+def _engine_thresholds() -> dict:
+    """Parse engine size thresholds from system parameters (unset ones fall back to the parser defaults)"""
+    thresholds = {}
+    for param in (PARSE_STREAMING_MIN_BYTES, PARSE_XML_MIN_BYTES):
+        print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.get_system_parameter({param})")
+        value = dynamodb_client.get_system_parameter(param)
+        print(f"[FILE_PROCESSOR] Result: {param} = {value}")
+        if not value:
+            continue
+        try:
+            thresholds[param] = int(value)
+        except ValueError:
+            print(f"[FILE_PROCESSOR] Result: {param} = {value} is not an integer, using parser default")
+    return thresholds
+
+
+def _download_object(s3_bucket: str, s3_key: str) -> bytes:
+    """Read an S3 object fully into memory (the parser buffers xlsx bodies anyway)"""
+    print(f"[FILE_PROCESSOR] About to execute: s3_client.get_object(Bucket={s3_bucket}, Key={s3_key})")
+    response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
+    print(f"[FILE_PROCESSOR] Result: get_object returned ContentLength = {response.get('ContentLength')}")
+
+    return response['Body'].read()
+
+
+def _open_pay_file(file_metadata: dict) -> PayFileParser:
+    """
+    Open an uploaded pay file from S3 without touching local disk
+
+    The object body is read into memory and handed to PayFileParser; the
+    original filename is passed along so umbrella code and submission date can
+    still be read from it. CSV uploads (by original filename or S3 key) use the csv engine;
+    xlsx files get an engine picked by size (FileSizeBytes / sheet XML size)
+    against the PARSE_*_MIN_BYTES system parameters. The download and the
+    parameter reads run concurrently.
+    """
+    print(f"[FILE_PROCESSOR] About to execute: _open_pay_file for S3Key = {file_metadata.get('S3Key')}")
+
+    s3_bucket = file_metadata['S3Bucket']
+    s3_key = file_metadata['S3Key']
+    filename = file_metadata.get('OriginalFilename') or s3_key.split('/')[-1]
+    print(f"[FILE_PROCESSOR] Result: s3_bucket = {s3_bucket}, s3_key = {s3_key}, filename = {filename}")
+
+    delimited = is_delimited_filename(filename) or is_delimited_filename(s3_key)
+
+    with Prefetch() as prefetch:
+        print(f"[FILE_PROCESSOR] About to execute: prefetch _download_object(Bucket={s3_bucket}, Key={s3_key})")
+        prefetch.submit('body', _download_object, s3_bucket, s3_key)
+        if not delimited:
+            prefetch.submit('thresholds', _engine_thresholds)
+
+        if delimited:
+            engine, thresholds = ENGINE_CSV, None
+        else:
+            engine, thresholds = ENGINE_AUTO, prefetch.result('thresholds')
+        body = prefetch.result('body')
+    print(f"[FILE_PROCESSOR] Result: downloaded {len(body)} bytes, prefetch timings = {prefetch.timings}")
+
+    size_hint = int(file_metadata['FileSizeBytes']) if file_metadata.get('FileSizeBytes') is not None else len(body)
+
+    print(f"[FILE_PROCESSOR] About to execute: PayFileParser(body, engine={engine}, filename={filename}, size_hint={size_hint}, engine_thresholds={thresholds})")
+    parser = PayFileParser(body, engine=engine, filename=filename,
+                           size_hint=size_hint, engine_thresholds=thresholds)
+    print(f"[FILE_PROCESSOR] Result: parser created = {parser}")
+
+    return parser
+
+
+def _load_parsed_artifact(file_metadata: dict, logger: StructuredLogger) -> dict:
+    """
+    Get parsed metadata and records for an uploaded file
+
+    Served from the parsed-artifact cache (warm /tmp, then S3) when the same
+    file hash has already been parsed by this parser version; otherwise the
+    workbook is parsed once and the result cached for later steps and
+    reprocessing runs.
+
+    Returns:
+        Dict with 'metadata' and 'records' (a RecordBatch)
+    """
+    file_hash = file_metadata.get('FileHashSHA256')
+    s3_bucket = file_metadata['S3Bucket']
+    s3_key = file_metadata['S3Key']
+    filename = file_metadata.get('OriginalFilename') or s3_key.split('/')[-1]
+    print(f"[FILE_PROCESSOR] About to execute: _load_parsed_artifact for file_hash = {file_hash}, filename = {filename}")
+
+    print(f"[FILE_PROCESSOR] About to execute: parsed_artifact_cache.load({file_hash})")
+    artifact = parsed_artifact_cache.load(file_hash, s3_bucket, s3_key)
+    print(f"[FILE_PROCESSOR] Result: cache {'hit' if artifact else 'miss'}")
+
+    # Metadata is read from the filename, so an identical file uploaded under
+    # another name can't reuse it
+    if artifact and artifact['metadata'].get('filename') != filename:
+        print(f"[FILE_PROCESSOR] Result: cached artifact is for filename = {artifact['metadata'].get('filename')}, reparsing")
+        artifact = None
+
+    if artifact:
+        print("[FILE_PROCESSOR] About to execute: RecordBatch.from_payload(artifact['records'])")
+        records = RecordBatch.from_payload(artifact['records'])
+        print(f"[FILE_PROCESSOR] Result: records loaded from cache, count = {len(records)}")
+        return {'metadata': artifact['metadata'], 'records': records}
+
+    print(f"[FILE_PROCESSOR] About to execute: parser = _open_pay_file(s3://{s3_bucket}/{s3_key})")
+    parser = _open_pay_file(file_metadata)
+    print(f"[FILE_PROCESSOR] Result: parser created = {parser}, engine = {parser.engine}")
+
+    logger.info(
+        "Parse engine selected",
+        engine=parser.engine,
+        reason=parser.engine_reason,
+        file_size_bytes=int(file_metadata.get('FileSizeBytes') or 0)
+    )
+
+    print("[FILE_PROCESSOR] About to execute: metadata = parser.extract_metadata()")
+    metadata = parser.extract_metadata()
+    print(f"[FILE_PROCESSOR] Result: metadata = {metadata}")
+
+    print("[FILE_PROCESSOR] About to execute: records = parser.parse_batch()")
+    records = parser.parse_batch()
+    print(f"[FILE_PROCESSOR] Result: records parsed, count = {len(records)}")
+
+    print("[FILE_PROCESSOR] About to execute: parser.close()")
+    parser.close()
+    print("[FILE_PROCESSOR] Result: parser closed")
+
+    # Header format drift is worth alerting on - the umbrella changed their template
+    print(f"[FILE_PROCESSOR] Result: header_profile_status = {parser.header_profile_status}")
+    if parser.header_profile_status == PROFILE_DRIFT:
+        logger.warning(
+            "Header format drift",
+            umbrella_code=metadata.get('umbrella_code'),
+            filename=filename,
+            header_row=parser.header_row,
+            column_map=parser.column_map
+        )
+
+    print(f"[FILE_PROCESSOR] About to execute: parsed_artifact_cache.store({file_hash})")
+    parsed_artifact_cache.store(file_hash, metadata, records.to_payload(), s3_bucket, s3_key)
+    print("[FILE_PROCESSOR] Result: parsed artifact stored")
+
+    return {'metadata': metadata, 'records': records}
+
+
 def extract_metadata(event: dict, logger: StructuredLogger) -> dict:
     """
     Extract metadata from uploaded file
@@ -179,7 +349,6 @@ def extract_metadata(event: dict, logger: StructuredLogger) -> dict:
         print(f"[FILE_PROCESSOR] About to execute: raise ValueError for file {file_id} not found")
         raise ValueError(f"File {file_id} not found")
 
-    # Download file from S3 to temp location
     print("[FILE_PROCESSOR] About to execute: s3_bucket = file_metadata['S3Bucket']")
     s3_bucket = file_metadata['S3Bucket']
     print(f"[FILE_PROCESSOR] Result: s3_bucket = {s3_bucket}")
@@ -188,34 +357,30 @@ def extract_metadata(event: dict, logger: StructuredLogger) -> dict:
     s3_key = file_metadata['S3Key']
     print(f"[FILE_PROCESSOR] Result: s3_key = {s3_key}")
 
-    print("[FILE_PROCESSOR] About to execute: tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')")
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-    print(f"[FILE_PROCESSOR] Result: temp_file = {temp_file.name}")
-
-    print(f"[FILE_PROCESSOR] About to execute: s3_client.download_file({s3_bucket}, {s3_key}, {temp_file.name})")
-    s3_client.download_file(s3_bucket, s3_key, temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: file downloaded to {temp_file.name}")
-
-    # Parse Excel file
-    print(f"[FILE_PROCESSOR] About to execute: parser = PayFileParser({temp_file.name})")
-    parser = PayFileParser(temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: parser created = {parser}")
-
-    print("[FILE_PROCESSOR] About to execute: metadata = parser.extract_metadata()")
-    metadata = parser.extract_metadata()
+    # Fast path - umbrella and submission date come from the filename, no download needed
+    original_filename = file_metadata.get('OriginalFilename')
+    print(f"[FILE_PROCESSOR] About to execute: resolve_filename_metadata({original_filename}, {s3_key})")
+    metadata = resolve_filename_metadata(original_filename, s3_key)
     print(f"[FILE_PROCESSOR] Result: metadata = {metadata}")
 
-    print("[FILE_PROCESSOR] About to execute: parser.close()")
-    parser.close()
-    print("[FILE_PROCESSOR] Result: parser closed")
+    if metadata is None:
+        # Filename doesn't say - open the workbook (parsed once and cached for parse_records)
+        print(f"[FILE_PROCESSOR] About to execute: _load_parsed_artifact(s3://{s3_bucket}/{s3_key})")
+        artifact = _load_parsed_artifact(file_metadata, logger)
+        metadata = dict(artifact['metadata'])
+        print(f"[FILE_PROCESSOR] Result: metadata from workbook = {metadata}")
+
+        if not metadata.get('umbrella_code'):
+            print("[FILE_PROCESSOR] About to execute: umbrella_code_from_records(artifact['records'])")
+            metadata['umbrella_code'] = umbrella_code_from_records(artifact['records'])
+            print(f"[FILE_PROCESSOR] Result: umbrella_code = {metadata['umbrella_code']}")
 
-    # Clean up temp file
-    print(f"[FILE_PROCESSOR] About to execute: os.unlink({temp_file.name})")
-    os.unlink(temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: temp file {temp_file.name} deleted")
+        metadata_source = 'workbook'
+    else:
+        metadata_source = 'filename'
 
     print(f"[FILE_PROCESSOR] About to execute: logger.info 'Metadata extracted' with metadata = {metadata}")
-    logger.info("Metadata extracted", metadata=metadata)
+    logger.info("Metadata extracted", metadata=metadata, metadata_source=metadata_source)
     print("[FILE_PROCESSOR] Result: logger.info executed successfully")
 
     print("[FILE_PROCESSOR] About to execute: build return dict with file_id, umbrella_code, submission_date, filename")
@@ -443,6 +608,12 @@ def supersede_existing(event: dict, logger: StructuredLogger) -> dict:
     """
     Automatically supersede existing file
     Gemini improvement #4: No user prompt, automatic supersede
+
+    In 'diff' mode (SUPERSEDE_MODE parameter, the default) nothing changes here:
+    the old file stays current and its records stay active until import_records
+    has written the new rows, so a resubmission that fails validation leaves the
+    old version in place. 'full' mode marks the old file SUPERSEDED and
+    deactivates every old record straight away.
     """
     print(f"[FILE_PROCESSOR] About to execute: supersede_existing with event = {event}")
 
@@ -458,24 +629,25 @@ def supersede_existing(event: dict, logger: StructuredLogger) -> dict:
     logger.info("Superseding existing file", new_file=file_id, old_file=existing_file_id)
     print("[FILE_PROCESSOR] Result: logger.info executed successfully")
 
-    # Mark old file as SUPERSEDED
-    print(f"[FILE_PROCESSOR] About to execute: datetime.utcnow().isoformat() + 'Z'")
-    timestamp = datetime.utcnow().isoformat() + 'Z'
-    print(f"[FILE_PROCESSOR] Result: timestamp = {timestamp}")
+    print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.get_system_parameter({SUPERSEDE_MODE_PARAM})")
+    supersede_mode = normalize_supersede_mode(dynamodb_client.get_system_parameter(SUPERSEDE_MODE_PARAM))
+    print(f"[FILE_PROCESSOR] Result: supersede_mode = {supersede_mode}")
 
-    print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.table.update_item to mark file {existing_file_id} as SUPERSEDED")
-    dynamodb_client.table.update_item(
-        Key={'PK': f'FILE#{existing_file_id}', 'SK': 'METADATA'},
-        UpdateExpression='SET #status = :status, IsCurrentVersion = :current, SupersededAt = :time, SupersededBy = :by',
-        ExpressionAttributeNames={'#status': 'Status'},
-        ExpressionAttributeValues={
-            ':status': 'SUPERSEDED',
-            ':current': False,
-            ':time': timestamp,
-            ':by': file_id
+    if supersede_mode == SUPERSEDE_DIFF:
+        print(f"[FILE_PROCESSOR] About to execute: logger.info 'Supersede deferred to import' for old_file = {existing_file_id}")
+        logger.info("Supersede deferred to import", old_file=existing_file_id, supersede_mode=supersede_mode)
+        print("[FILE_PROCESSOR] Result: logger.info executed successfully")
+
+        result = {
+            'file_id': file_id,
+            'superseded_file_id': existing_file_id,
+            'supersede_mode': supersede_mode,
+            'records_deactivated': 0
         }
-    )
-    print(f"[FILE_PROCESSOR] Result: file {existing_file_id} marked as SUPERSEDED")
+        print(f"[FILE_PROCESSOR] Result: returning = {result}")
+        return result
+
+    _mark_superseded([existing_file_id], file_id)
 
     # Mark old pay records as inactive
     # Query all records for old file
@@ -513,12 +685,35 @@ def supersede_existing(event: dict, logger: StructuredLogger) -> dict:
     result = {
         'file_id': file_id,
         'superseded_file_id': existing_file_id,
+        'supersede_mode': supersede_mode,
         'records_deactivated': len(response.get('Items', []))
     }
     print(f"[FILE_PROCESSOR] Result: returning = {result}")
     return result
 
 
+def _mark_superseded(file_ids, by_file_id: str):
+    """Mark earlier FILE items SUPERSEDED and no longer the current version"""
+    print(f"[FILE_PROCESSOR] About to execute: datetime.utcnow().isoformat() + 'Z'")
+    timestamp = datetime.utcnow().isoformat() + 'Z'
+    print(f"[FILE_PROCESSOR] Result: timestamp = {timestamp}")
+
+    for old_file_id in file_ids:
+        print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.table.update_item to mark file {old_file_id} as SUPERSEDED")
+        dynamodb_client.table.update_item(
+            Key={'PK': f'FILE#{old_file_id}', 'SK': 'METADATA'},
+            UpdateExpression='SET #status = :status, IsCurrentVersion = :current, SupersededAt = :time, SupersededBy = :by',
+            ExpressionAttributeNames={'#status': 'Status'},
+            ExpressionAttributeValues={
+                ':status': 'SUPERSEDED',
+                ':current': False,
+                ':time': timestamp,
+                ':by': by_file_id
+            }
+        )
+        print(f"[FILE_PROCESSOR] Result: file {old_file_id} marked as SUPERSEDED")
+
+
 def parse_records(event: dict, logger: StructuredLogger) -> dict:
     """
     Parse Excel file into records
@@ -547,7 +742,6 @@ def parse_records(event: dict, logger: StructuredLogger) -> dict:
     file_metadata = dynamodb_client.get_file_metadata(file_id)
     print(f"[FILE_PROCESSOR] Result: file_metadata = {file_metadata}")
 
-    # Download file
     print("[FILE_PROCESSOR] About to execute: s3_bucket = file_metadata['S3Bucket']")
     s3_bucket = file_metadata['S3Bucket']
     print(f"[FILE_PROCESSOR] Result: s3_bucket = {s3_bucket}")
@@ -556,31 +750,11 @@ def parse_records(event: dict, logger: StructuredLogger) -> dict:
     s3_key = file_metadata['S3Key']
     print(f"[FILE_PROCESSOR] Result: s3_key = {s3_key}")
 
-    print("[FILE_PROCESSOR] About to execute: tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')")
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-    print(f"[FILE_PROCESSOR] Result: temp_file = {temp_file.name}")
-
-    print(f"[FILE_PROCESSOR] About to execute: s3_client.download_file({s3_bucket}, {s3_key}, {temp_file.name})")
-    s3_client.download_file(s3_bucket, s3_key, temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: file downloaded to {temp_file.name}")
-
-    # Parse records
-    print(f"[FILE_PROCESSOR] About to execute: parser = PayFileParser({temp_file.name})")
-    parser = PayFileParser(temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: parser created = {parser}")
-
-    print("[FILE_PROCESSOR] About to execute: records = parser.parse_records()")
-    records = parser.parse_records()
-    print(f"[FILE_PROCESSOR] Result: records parsed, count = {len(records)}")
-
-    print("[FILE_PROCESSOR] About to execute: parser.close()")
-    parser.close()
-    print("[FILE_PROCESSOR] Result: parser closed")
-
-    # Clean up
-    print(f"[FILE_PROCESSOR] About to execute: os.unlink({temp_file.name})")
-    os.unlink(temp_file.name)
-    print(f"[FILE_PROCESSOR] Result: temp file {temp_file.name} deleted")
+    # Parsed records from the artifact cache, or a fresh parse on a miss
+    print(f"[FILE_PROCESSOR] About to execute: _load_parsed_artifact(s3://{s3_bucket}/{s3_key})")
+    artifact = _load_parsed_artifact(file_metadata, logger)
+    records = artifact['records']
+    print(f"[FILE_PROCESSOR] Result: records loaded, count = {len(records)}")
 
     print(f"[FILE_PROCESSOR] About to execute: logger.info 'Records parsed' with record_count = {len(records)}")
     logger.info("Records parsed", record_count=len(records))
@@ -600,22 +774,61 @@ def parse_records(event: dict, logger: StructuredLogger) -> dict:
     )
     print(f"[FILE_PROCESSOR] Result: file status updated to PROCESSING")
 
+    # Columnar payload - field names are sent once rather than once per row
     print("[FILE_PROCESSOR] About to execute: build return dict with file_id, umbrella_id, period_id, records, record_count")
     result = {
         'file_id': file_id,
         'umbrella_id': umbrella_id,
         'period_id': period_id,
-        'records': records,
+        'records': records.to_payload(),
         'record_count': len(records)
     }
     print(f"[FILE_PROCESSOR] Result: returning dict with record_count = {len(records)}")
     return result
 
 
+def _coerce_validated_records(validated_records) -> RecordBatch:
+    """
+    Validated records as a RecordBatch
+
+    The validation engine sends a columnar batch payload with contractor_id and
+    association_id columns and umbrella_id/period_id attrs. The older list of
+    {'record', 'contractor_id', 'association_id', 'umbrella_id', 'period_id'}
+    dicts is still accepted so in-flight executions can finish.
+    """
+    if RecordBatch.is_payload(validated_records):
+        return RecordBatch.from_payload(validated_records)
+
+    print(f"[FILE_PROCESSOR] Result: legacy validated_records list with {len(validated_records)} entries")
+    attrs = {}
+    if validated_records:
+        attrs = {
+            'umbrella_id': validated_records[0].get('umbrella_id'),
+            'period_id': validated_records[0].get('period_id')
+        }
+
+    return RecordBatch.from_records(
+        (
+            dict(entry['record'], contractor_id=entry.get('contractor_id'), association_id=entry.get('association_id'))
+            for entry in validated_records
+        ),
+        extra_fields=('contractor_id', 'association_id'),
+        attrs=attrs
+    )
+
+
 def import_records(event: dict, logger: StructuredLogger) -> dict:
     """
     Import validated records to DynamoDB
     Step 5 of Step Functions workflow
+
+    In 'diff' supersede mode the new rows are always diffed against the
+    umbrella's active records for the period, whether or not a duplicate file
+    was flagged: only added and changed rows are written and only changed and
+    removed rows are deactivated. Unchanged rows stay active where they are.
+    Once the writes have gone through, the files those active records came from
+    (and the flagged duplicate) are marked SUPERSEDED. The diff summary is
+    stored on the FILE item.
     """
     print(f"[FILE_PROCESSOR] About to execute: import_records with event keys = {event.keys()}")
 
@@ -623,37 +836,41 @@ def import_records(event: dict, logger: StructuredLogger) -> dict:
     file_id = event['fileId']
     print(f"[FILE_PROCESSOR] Result: file_id = {file_id}")
 
-    print("[FILE_PROCESSOR] About to execute: validated_records = event.get('validated_records', [])")
-    validated_records = event.get('validated_records', [])
+    print("[FILE_PROCESSOR] About to execute: validated_records = _coerce_validated_records(event.get('validated_records', []))")
+    validated_records = _coerce_validated_records(event.get('validated_records', []))
     print(f"[FILE_PROCESSOR] Result: validated_records count = {len(validated_records)}")
 
     print("[FILE_PROCESSOR] About to execute: has_warnings = event.get('has_warnings', False)")
     has_warnings = event.get('has_warnings', False)
     print(f"[FILE_PROCESSOR] Result: has_warnings = {has_warnings}")
 
+    print("[FILE_PROCESSOR] About to execute: existing_file_id = event.get('duplicate_check', {}).get('existing_file_id')")
+    existing_file_id = (event.get('duplicate_check') or {}).get('existing_file_id')
+    print(f"[FILE_PROCESSOR] Result: existing_file_id = {existing_file_id}")
+
     print(f"[FILE_PROCESSOR] About to execute: logger.info 'Importing records' for file_id = {file_id}, record_count = {len(validated_records)}")
     logger.info("Importing records", file_id=file_id, record_count=len(validated_records))
     print("[FILE_PROCESSOR] Result: logger.info executed successfully")
 
+    umbrella_id = validated_records.attrs.get('umbrella_id')
+    period_id = validated_records.attrs.get('period_id')
+    print(f"[FILE_PROCESSOR] Result: umbrella_id = {umbrella_id}, period_id = {period_id}")
+
     # Batch write records
     print("[FILE_PROCESSOR] About to execute: records_to_write = []")
     records_to_write = []
     print(f"[FILE_PROCESSOR] Result: records_to_write initialized = {records_to_write}")
 
     print(f"[FILE_PROCESSOR] About to execute: enumerate through {len(validated_records)} validated_records starting from 1")
-    for idx, record_data in enumerate(validated_records, start=1):
+    for idx, record in enumerate(validated_records, start=1):
         print(f"[FILE_PROCESSOR] About to execute: process record idx = {idx}")
 
-        print(f"[FILE_PROCESSOR] About to execute: record = record_data['record']")
-        record = record_data['record']
-        print(f"[FILE_PROCESSOR] Result: record extracted from record_data")
-
-        print(f"[FILE_PROCESSOR] About to execute: contractor_id = record_data.get('contractor_id')")
-        contractor_id = record_data.get('contractor_id')
+        print(f"[FILE_PROCESSOR] About to execute: contractor_id = record.get('contractor_id')")
+        contractor_id = record.get('contractor_id')
         print(f"[FILE_PROCESSOR] Result: contractor_id = {contractor_id}")
 
-        print(f"[FILE_PROCESSOR] About to execute: association_id = record_data.get('association_id')")
-        association_id = record_data.get('association_id')
+        print(f"[FILE_PROCESSOR] About to execute: association_id = record.get('association_id')")
+        association_id = record.get('association_id')
         print(f"[FILE_PROCESSOR] Result: association_id = {association_id}")
 
         print(f"[FILE_PROCESSOR] About to execute: record_id = str(uuid.uuid4())")
@@ -672,15 +889,15 @@ def import_records(event: dict, logger: StructuredLogger) -> dict:
             'RecordID': record_id,
             'FileID': file_id,
             'ContractorID': contractor_id,
-            'UmbrellaID': record_data.get('umbrella_id'),
-            'PeriodID': record_data.get('period_id'),
+            'UmbrellaID': umbrella_id,
+            'PeriodID': period_id,
             'AssociationID': association_id,
             'EmployeeID': record['employee_id'],
             'UnitDays': Decimal(str(record['unit_days'])),
-            'DayRate': Decimal(str(record['day_rate'])),
-            'Amount': Decimal(str(record['amount'])),
-            'VATAmount': Decimal(str(record['vat_amount'])),
-            'GrossAmount': Decimal(str(record['gross_amount'])),
+            'DayRate': record['day_rate'].to_decimal(),
+            'Amount': record['amount'].to_decimal(),
+            'VATAmount': record['vat_amount'].to_decimal(),
+            'GrossAmount': record['gross_amount'].to_decimal(),
             'TotalHours': Decimal(str(record.get('total_hours', 0))),
             'RecordType': record['record_type'],
             'Notes': record.get('notes', ''),
@@ -688,7 +905,7 @@ def import_records(event: dict, logger: StructuredLogger) -> dict:
             'CreatedAt': timestamp,
             'GSI1PK': f'CONTRACTOR#{contractor_id}',
             'GSI1SK': f'RECORD#{timestamp}',
-            'GSI2PK': f'PERIOD#{record_data.get("period_id")}',
+            'GSI2PK': f'PERIOD#{period_id}',
             'GSI2SK': f'CONTRACTOR#{contractor_id}'
         }
         print(f"[FILE_PROCESSOR] Result: item dict built for record {idx}")
@@ -697,19 +914,72 @@ def import_records(event: dict, logger: StructuredLogger) -> dict:
         records_to_write.append(item)
         print(f"[FILE_PROCESSOR] Result: item appended, records_to_write length = {len(records_to_write)}")
 
+    records_imported = len(records_to_write)
+    supersede_diff = None
+    superseded_file_ids = []
+
+    print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.get_system_parameter({SUPERSEDE_MODE_PARAM})")
+    supersede_mode = normalize_supersede_mode(dynamodb_client.get_system_parameter(SUPERSEDE_MODE_PARAM))
+    print(f"[FILE_PROCESSOR] Result: supersede_mode = {supersede_mode}")
+
+    # In 'full' mode supersede_existing has already deactivated everything, so
+    # every row would come back as added - only diff when a duplicate was flagged
+    if supersede_mode == SUPERSEDE_DIFF or existing_file_id:
+        print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.get_active_pay_records({period_id}, {umbrella_id})")
+        active_records = [
+            item for item in dynamodb_client.get_active_pay_records(period_id, umbrella_id)
+            if item.get('FileID') != file_id
+        ]
+        print(f"[FILE_PROCESSOR] Result: active_records count = {len(active_records)}")
+
+        print(f"[FILE_PROCESSOR] About to execute: diff_records({len(active_records)} old, {len(records_to_write)} new)")
+        diff = diff_records(active_records, records_to_write)
+        print(f"[FILE_PROCESSOR] Result: diff = {diff.summary()}")
+
+        records_to_write = diff.to_write
+        records_to_deactivate = diff.to_deactivate
+
+        print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.deactivate_pay_records with {len(records_to_deactivate)} records")
+        dynamodb_client.deactivate_pay_records(records_to_deactivate)
+        print(f"[FILE_PROCESSOR] Result: deactivate_pay_records completed")
+
+        base_file_ids = sorted({item['FileID'] for item in active_records if item.get('FileID')})
+        if supersede_mode == SUPERSEDE_DIFF:
+            superseded_file_ids = sorted(set(base_file_ids) | ({existing_file_id} if existing_file_id else set()))
+        print(f"[FILE_PROCESSOR] Result: base_file_ids = {base_file_ids}, superseded_file_ids = {superseded_file_ids}")
+
+        if existing_file_id or active_records:
+            supersede_diff = dict(diff.summary(), base_file_id=existing_file_id or base_file_ids[0])
+
     # Write in batches
     print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.batch_write_pay_records with {len(records_to_write)} records")
     dynamodb_client.batch_write_pay_records(records_to_write)
     print(f"[FILE_PROCESSOR] Result: batch_write_pay_records completed for {len(records_to_write)} records")
 
-    print(f"[FILE_PROCESSOR] About to execute: logger.info 'Records imported' with count = {len(records_to_write)}")
-    logger.info("Records imported", count=len(records_to_write))
+    # Only now that the new version is in place does the old one stop being current
+    if superseded_file_ids:
+        _mark_superseded(superseded_file_ids, file_id)
+
+    if supersede_diff is not None:
+        print(f"[FILE_PROCESSOR] About to execute: dynamodb_client.table.update_item SupersedeDiff = {supersede_diff} on file {file_id}")
+        dynamodb_client.table.update_item(
+            Key={'PK': f'FILE#{file_id}', 'SK': 'METADATA'},
+            UpdateExpression='SET SupersedeDiff = :diff',
+            ExpressionAttributeValues={':diff': supersede_diff}
+        )
+        print(f"[FILE_PROCESSOR] Result: SupersedeDiff stored on file {file_id}")
+
+    print(f"[FILE_PROCESSOR] About to execute: logger.info 'Records imported' with count = {records_imported}, written = {len(records_to_write)}")
+    logger.info("Records imported", count=records_imported, written=len(records_to_write), supersede_diff=supersede_diff)
     print("[FILE_PROCESSOR] Result: logger.info executed successfully")
 
-    print("[FILE_PROCESSOR] About to execute: build return dict with records_imported and has_warnings")
+    print("[FILE_PROCESSOR] About to execute: build return dict with records_imported, records_written and has_warnings")
     result = {
         'file_id': file_id,
-        'records_imported': len(records_to_write),
+        'records_imported': records_imported,
+        'records_written': len(records_to_write),
+        'supersede_diff': supersede_diff,
+        'superseded_file_ids': superseded_file_ids,
         'has_warnings': has_warnings
     }
     print(f"[FILE_PROCESSOR] Result: returning = {result}")
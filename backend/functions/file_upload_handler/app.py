@@ -69,6 +69,18 @@ print("[FILE_UPLOAD_HANDLER] Reading STEP_FUNCTION_ARN from environment")
 STEP_FUNCTION_ARN = os.environ.get('STEP_FUNCTION_ARN', '')
 print(f"[FILE_UPLOAD_HANDLER] STEP_FUNCTION_ARN set to: {STEP_FUNCTION_ARN}")
 
+# Accepted upload extensions -> S3 content type. Anything else is stored as
+# .xlsx, as before CSV support. Keep in step with the parser's suffixes
+# (common.csv_reader.DELIMITED_SUFFIXES) and the bucket's S3 suffix rules
+UPLOAD_CONTENT_TYPES = {
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.csv': 'text/csv',
+    '.tsv': 'text/tab-separated-values',
+    '.tab': 'text/tab-separated-values'
+}
+DEFAULT_UPLOAD_EXTENSION = '.xlsx'
+print(f"[FILE_UPLOAD_HANDLER] UPLOAD_CONTENT_TYPES: {UPLOAD_CONTENT_TYPES}")
+
 print("[FILE_UPLOAD_HANDLER] ========================================")
 print("[FILE_UPLOAD_HANDLER] Module loading completed")
 print("[FILE_UPLOAD_HANDLER] ========================================")
@@ -245,7 +257,11 @@ def handle_api_upload(event, logger: StructuredLogger):
     print(f"[FILE_UPLOAD_HANDLER] year: {year}")
     month = now.month
     print(f"[FILE_UPLOAD_HANDLER] month: {month}")
-    s3_key = f"uploads/{year}/{month:02d}/{timestamp}_{file_id}.xlsx"
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in UPLOAD_CONTENT_TYPES:
+        extension = DEFAULT_UPLOAD_EXTENSION
+    print(f"[FILE_UPLOAD_HANDLER] extension: {extension}")
+    s3_key = f"uploads/{year}/{month:02d}/{timestamp}_{file_id}{extension}"
     print(f"[FILE_UPLOAD_HANDLER] s3_key: {s3_key}")
 
     # Calculate file hash
@@ -264,7 +280,7 @@ def handle_api_upload(event, logger: StructuredLogger):
         Bucket=S3_BUCKET,
         Key=s3_key,
         Body=file_bytes,
-        ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        ContentType=UPLOAD_CONTENT_TYPES[extension],
         Metadata={
             'original-filename': filename,
             'uploaded-by': uploaded_by,
@@ -48,6 +48,10 @@ print("[REPORT_GENERATOR] Importing DynamoDBClient from common.dynamodb")
 from common.dynamodb import DynamoDBClient
 print(f"[REPORT_GENERATOR] DynamoDBClient imported: {DynamoDBClient}")
 
+print("[REPORT_GENERATOR] Importing Money from common.money")
+from common.money import Money, pence_to_pounds
+print(f"[REPORT_GENERATOR] Money imported: {Money}")
+
 print("[REPORT_GENERATOR] ========================================")
 print("[REPORT_GENERATOR] Module loading completed")
 print("[REPORT_GENERATOR] ========================================")
@@ -691,10 +695,11 @@ def calculate_statistics(records, logger):
             'record_count': 0
         }
 
+    # Money totals are summed as integer pence, so they are exact
     print("[CALC_STATS] About to execute: initialize accumulators")
-    total_amount = Decimal('0')
-    total_vat = Decimal('0')
-    total_gross = Decimal('0')
+    total_amount = Money(0)
+    total_vat = Money(0)
+    total_gross = Money(0)
     total_days = Decimal('0')
     total_hours = Decimal('0')
     day_rates = []
@@ -705,7 +710,7 @@ def calculate_statistics(records, logger):
         print(f"[CALC_STATS] About to execute: process record {idx+1}/{len(records)}")
 
         print(f"[CALC_STATS] About to execute: extract Amount from record")
-        amount = record.get('Amount', Decimal('0'))
+        amount = Money.parse(record.get('Amount'))
         print(f"[CALC_STATS] Amount: {amount}")
 
         print(f"[CALC_STATS] About to execute: add amount to total_amount")
@@ -713,7 +718,7 @@ def calculate_statistics(records, logger):
         print(f"[CALC_STATS] total_amount: {total_amount}")
 
         print(f"[CALC_STATS] About to execute: extract VATAmount from record")
-        vat = record.get('VATAmount', Decimal('0'))
+        vat = Money.parse(record.get('VATAmount'))
         print(f"[CALC_STATS] VATAmount: {vat}")
 
         print(f"[CALC_STATS] About to execute: add vat to total_vat")
@@ -721,7 +726,7 @@ def calculate_statistics(records, logger):
         print(f"[CALC_STATS] total_vat: {total_vat}")
 
         print(f"[CALC_STATS] About to execute: extract GrossAmount from record")
-        gross = record.get('GrossAmount', Decimal('0'))
+        gross = Money.parse(record.get('GrossAmount'))
         print(f"[CALC_STATS] GrossAmount: {gross}")
 
         print(f"[CALC_STATS] About to execute: add gross to total_gross")
@@ -751,18 +756,18 @@ def calculate_statistics(records, logger):
         print("[CALC_STATS] About to execute: check if day_rate")
         if day_rate:
             print(f"[CALC_STATS] About to execute: append day_rate to day_rates list")
-            day_rates.append(day_rate)
+            day_rates.append(Money.parse(day_rate))
             print(f"[CALC_STATS] day_rates count: {len(day_rates)}")
 
     print("[CALC_STATS] About to execute: calculate average_day_rate")
-    average_day_rate = sum(day_rates) / len(day_rates) if day_rates else Decimal('0')
+    average_day_rate = pence_to_pounds(Decimal(sum(day_rates)) / len(day_rates)) if day_rates else Decimal('0')
     print(f"[CALC_STATS] average_day_rate: {average_day_rate}")
 
     print("[CALC_STATS] About to execute: build stats dict")
     stats = {
-        'total_amount': float(total_amount),
-        'total_vat': float(total_vat),
-        'total_gross': float(total_gross),
+        'total_amount': total_amount.pounds,
+        'total_vat': total_vat.pounds,
+        'total_gross': total_gross.pounds,
         'total_days': float(total_days),
         'total_hours': float(total_hours),
         'average_day_rate': float(average_day_rate),
@@ -814,28 +819,28 @@ def calculate_umbrella_breakdown(records, logger):
             breakdown[umbrella_id] = {
                 'umbrella_name': umbrella.get('LegalName', ''),
                 'umbrella_code': umbrella.get('ShortCode', ''),
-                'total_amount': Decimal('0'),
-                'total_vat': Decimal('0'),
-                'total_gross': Decimal('0'),
+                'total_amount': Money(0),
+                'total_vat': Money(0),
+                'total_gross': Money(0),
                 'total_days': Decimal('0'),
                 'record_count': 0
             }
             print(f"[UMBRELLA_BREAKDOWN] Breakdown entry initialized for umbrella_id")
 
         print(f"[UMBRELLA_BREAKDOWN] About to execute: update breakdown for umbrella_id")
-        breakdown[umbrella_id]['total_amount'] += record.get('Amount', Decimal('0'))
-        breakdown[umbrella_id]['total_vat'] += record.get('VATAmount', Decimal('0'))
-        breakdown[umbrella_id]['total_gross'] += record.get('GrossAmount', Decimal('0'))
+        breakdown[umbrella_id]['total_amount'] += Money.parse(record.get('Amount'))
+        breakdown[umbrella_id]['total_vat'] += Money.parse(record.get('VATAmount'))
+        breakdown[umbrella_id]['total_gross'] += Money.parse(record.get('GrossAmount'))
         breakdown[umbrella_id]['total_days'] += record.get('UnitDays', Decimal('0'))
         breakdown[umbrella_id]['record_count'] += 1
         print(f"[UMBRELLA_BREAKDOWN] Breakdown updated for umbrella_id")
 
-    print("[UMBRELLA_BREAKDOWN] About to execute: convert Decimal to float in breakdown")
+    print("[UMBRELLA_BREAKDOWN] About to execute: convert Money/Decimal to float in breakdown")
     for umbrella_id in breakdown:
         print(f"[UMBRELLA_BREAKDOWN] About to execute: convert values for umbrella_id={umbrella_id}")
-        breakdown[umbrella_id]['total_amount'] = float(breakdown[umbrella_id]['total_amount'])
-        breakdown[umbrella_id]['total_vat'] = float(breakdown[umbrella_id]['total_vat'])
-        breakdown[umbrella_id]['total_gross'] = float(breakdown[umbrella_id]['total_gross'])
+        breakdown[umbrella_id]['total_amount'] = breakdown[umbrella_id]['total_amount'].pounds
+        breakdown[umbrella_id]['total_vat'] = breakdown[umbrella_id]['total_vat'].pounds
+        breakdown[umbrella_id]['total_gross'] = breakdown[umbrella_id]['total_gross'].pounds
         breakdown[umbrella_id]['total_days'] = float(breakdown[umbrella_id]['total_days'])
         print(f"[UMBRELLA_BREAKDOWN] Values converted for umbrella_id={umbrella_id}")
 
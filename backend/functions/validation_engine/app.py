@@ -29,6 +29,22 @@ print("[VALIDATION_ENGINE] About to execute: from common.dynamodb import DynamoD
 from common.dynamodb import DynamoDBClient
 print("[VALIDATION_ENGINE] Completed: from common.dynamodb import DynamoDBClient")
 
+print("[VALIDATION_ENGINE] About to execute: from common.permanent_staff import PermanentStaffRegistry")
+from common.permanent_staff import PermanentStaffRegistry
+print("[VALIDATION_ENGINE] Completed: from common.permanent_staff import PermanentStaffRegistry")
+
+print("[VALIDATION_ENGINE] About to execute: from common.prefetch import Prefetch")
+from common.prefetch import Prefetch
+print("[VALIDATION_ENGINE] Completed: from common.prefetch import Prefetch")
+
+print("[VALIDATION_ENGINE] About to execute: from common.name_aliases import alias_item")
+from common.name_aliases import alias_item
+print("[VALIDATION_ENGINE] Completed: from common.name_aliases import alias_item")
+
+print("[VALIDATION_ENGINE] About to execute: from common.record_batch import RecordBatch")
+from common.record_batch import RecordBatch
+print("[VALIDATION_ENGINE] Completed: from common.record_batch import RecordBatch")
+
 print("[VALIDATION_ENGINE] About to execute: from common.validators import ValidationEngine")
 from common.validators import ValidationEngine
 print("[VALIDATION_ENGINE] Completed: from common.validators import ValidationEngine")
@@ -38,6 +54,12 @@ print("[VALIDATION_ENGINE] About to execute: dynamodb_client = DynamoDBClient()"
 dynamodb_client = DynamoDBClient()
 print(f"[VALIDATION_ENGINE] Completed: dynamodb_client = {dynamodb_client}")
 
+# Lives as long as the warm container; each invocation only re-reads the
+# permanent staff profiles if their version stamp has changed
+print("[VALIDATION_ENGINE] About to execute: permanent_staff = PermanentStaffRegistry(dynamodb_client)")
+permanent_staff = PermanentStaffRegistry(dynamodb_client)
+print("[VALIDATION_ENGINE] Completed: permanent_staff registry created")
+
 
 def lambda_handler(event, context):
     """
@@ -47,7 +69,8 @@ def lambda_handler(event, context):
         {
             'has_critical_errors': bool,
             'has_warnings': bool,
-            'valid_records': List[Dict],  # Records that passed validation
+            'valid_records': Dict,        # RecordBatch payload of records that passed validation,
+                                          # with contractor_id/association_id columns
             'errors': List[Dict],         # Critical errors
             'warnings': List[Dict]        # Non-blocking warnings
         }
@@ -79,38 +102,54 @@ def lambda_handler(event, context):
         period_id = event['period_id']
         print(f"[VALIDATION_ENGINE] Completed: period_id = {period_id}")
 
-        print("[VALIDATION_ENGINE] Extracting records from event")
-        print("[VALIDATION_ENGINE] About to execute: records = event['records']")
-        records = event['records']
-        print(f"[VALIDATION_ENGINE] Completed: records extracted, count = {len(records)}")
+        # Reference data reads run together on a thread pool while the
+        # records payload is decoded; all of it is joined before validation
+        print("[VALIDATION_ENGINE] About to execute: Prefetch period, contractors and system parameters")
+        with Prefetch() as prefetch:
+            prefetch.submit('period_data', _load_period_data, period_id)
+            prefetch.submit('contractors_cache', _load_contractors_cache)
+            prefetch.submit('validator', ValidationEngine, dynamodb_client, permanent_staff=permanent_staff)
+            prefetch.submit('name_aliases', dynamodb_client.get_name_aliases, umbrella_id)
+            prefetch.submit('associations', dynamodb_client.get_umbrella_associations, umbrella_id)
+
+            print("[VALIDATION_ENGINE] Extracting records from event")
+            print("[VALIDATION_ENGINE] About to execute: records = RecordBatch.coerce(event['records'])")
+            records = RecordBatch.coerce(event['records'])
+            print(f"[VALIDATION_ENGINE] Completed: records extracted, count = {len(records)}")
+
+            # Initialize validation engine (system parameters are loaded by its constructor)
+            validator = prefetch.result('validator')
+            print(f"[VALIDATION_ENGINE] Completed: ValidationEngine created: {validator}")
+
+            period_data = prefetch.result('period_data')
+            print(f"[VALIDATION_ENGINE] Completed: Period data retrieved, has_data = {bool(period_data)}, keys = {list(period_data.keys()) if period_data else []}")
+
+            # Pre-load contractors for performance
+            contractors_cache = prefetch.result('contractors_cache')
+            print(f"[VALIDATION_ENGINE] Completed: contractors_cache loaded with {len(contractors_cache)} contractors")
+
+            # Rows resolve by (umbrella, employee ID) first, then by learned
+            # alias, and only then by scoring the name
+            validator.set_associations(prefetch.result('associations'), umbrella_id)
+            validator.set_name_aliases(prefetch.result('name_aliases'))
 
         print("[VALIDATION_ENGINE] Logging validation start")
         print(f"[VALIDATION_ENGINE] About to execute: logger.info('Starting validation', file_id={file_id}, record_count={len(records)})")
-        logger.info("Starting validation", file_id=file_id, record_count=len(records))
+        logger.info("Starting validation", file_id=file_id, record_count=len(records), prefetch_seconds=prefetch.timings)
         print("[VALIDATION_ENGINE] Completed: logger.info - Validation start logged")
 
-        # Initialize validation engine
-        print("[VALIDATION_ENGINE] Creating ValidationEngine instance")
-        print(f"[VALIDATION_ENGINE] About to execute: validator = ValidationEngine(dynamodb_client={dynamodb_client})")
-        validator = ValidationEngine(dynamodb_client)
-        print(f"[VALIDATION_ENGINE] Completed: ValidationEngine created: {validator}")
-
-        # Get period data
-        print(f"[VALIDATION_ENGINE] Getting period data for period_id: {period_id}")
-        print(f"[VALIDATION_ENGINE] About to execute: dynamodb_client.table.get_item with Key PK='PERIOD#{period_id}', SK='PROFILE'")
-        period_response = dynamodb_client.table.get_item(
-            Key={'PK': f'PERIOD#{period_id}', 'SK': 'PROFILE'}
-        )
-        print(f"[VALIDATION_ENGINE] Completed: Period response received: {type(period_response)}")
-
-        print("[VALIDATION_ENGINE] About to execute: period_data = period_response.get('Item', {})")
-        period_data = period_response.get('Item', {})
-        print(f"[VALIDATION_ENGINE] Completed: Period data retrieved, has_data = {bool(period_data)}, keys = {list(period_data.keys()) if period_data else []}")
+        # Permanent staff, period rates and the rest of the reference data are
+        # read for the whole file in batched reads; the rules then run in memory
+        print("[VALIDATION_ENGINE] About to execute: validator.validate_file(records, umbrella_id, period_data, contractors_cache)")
+        validation_results = validator.validate_file(records, umbrella_id, period_data, contractors_cache)
+        print(f"[VALIDATION_ENGINE] Completed: validator.validate_file - {len(validation_results)} results")
 
-        # Validate all records
-        print("[VALIDATION_ENGINE] About to execute: valid_records = []")
-        valid_records = []
-        print(f"[VALIDATION_ENGINE] Completed: valid_records = {valid_records}")
+        # Validate all records - valid rows are tracked by index and sliced out of the batch at the end
+        print("[VALIDATION_ENGINE] About to execute: valid_indices, valid_contractor_ids, valid_association_ids = [], [], []")
+        valid_indices = []
+        valid_contractor_ids = []
+        valid_association_ids = []
+        print(f"[VALIDATION_ENGINE] Completed: valid row accumulators initialised")
 
         print("[VALIDATION_ENGINE] About to execute: all_errors = []")
         all_errors = []
@@ -124,23 +163,12 @@ def lambda_handler(event, context):
         has_critical_errors = False
         print(f"[VALIDATION_ENGINE] Completed: has_critical_errors = {has_critical_errors}")
 
-        # Pre-load contractors for performance
-        print("[VALIDATION_ENGINE] About to execute: contractors_cache = _load_contractors_cache()")
-        contractors_cache = _load_contractors_cache()
-        print(f"[VALIDATION_ENGINE] Completed: contractors_cache loaded with {len(contractors_cache)} contractors")
-
         print(f"[VALIDATION_ENGINE] About to execute: for loop over {len(records)} records")
-        for record in records:
+        for record_index, (record, outcome) in enumerate(zip(records, validation_results)):
             print(f"[VALIDATION_ENGINE] Processing record: {record}")
 
-            print(f"[VALIDATION_ENGINE] About to execute: validator.validate_record for record with employee_id={record.get('employee_id')}")
-            is_valid, errors, warnings = validator.validate_record(
-                record,
-                umbrella_id,
-                period_data,
-                contractors_cache
-            )
-            print(f"[VALIDATION_ENGINE] Completed: validator.validate_record - is_valid={is_valid}, errors_count={len(errors)}, warnings_count={len(warnings)}")
+            is_valid, errors, warnings = outcome['valid'], outcome['errors'], outcome['warnings']
+            print(f"[VALIDATION_ENGINE] Validation outcome - is_valid={is_valid}, errors_count={len(errors)}, warnings_count={len(warnings)}")
 
             print(f"[VALIDATION_ENGINE] About to execute: if not is_valid check (is_valid={is_valid})")
             if not is_valid:
@@ -161,36 +189,16 @@ def lambda_handler(event, context):
             else:
                 print("[VALIDATION_ENGINE] Record IS valid, processing contractor info")
 
-                # Add contractor/association info to record
-                print(f"[VALIDATION_ENGINE] About to execute: validator.find_contractor(record={record.get('employee_id')}, contractors_cache)")
-                contractor_result = validator.find_contractor(record, contractors_cache)
-                print(f"[VALIDATION_ENGINE] Completed: validator.find_contractor - result keys = {list(contractor_result.keys())}")
-
-                print(f"[VALIDATION_ENGINE] About to execute: contractor_id = contractor_result.get('contractor_id')")
-                contractor_id = contractor_result.get('contractor_id')
-                print(f"[VALIDATION_ENGINE] Completed: contractor_id = {contractor_id}")
-
-                print(f"[VALIDATION_ENGINE] About to execute: validator.validate_umbrella_association(contractor_id={contractor_id}, umbrella_id={umbrella_id})")
-                assoc_result = validator.validate_umbrella_association(
-                    contractor_id,
-                    umbrella_id,
-                    period_data
-                )
-                print(f"[VALIDATION_ENGINE] Completed: validator.validate_umbrella_association - result keys = {list(assoc_result.keys())}")
-
-                print(f"[VALIDATION_ENGINE] About to execute: association_id = assoc_result.get('association', {{}}).get('AssociationID')")
-                association_id = assoc_result.get('association', {}).get('AssociationID')
-                print(f"[VALIDATION_ENGINE] Completed: association_id = {association_id}")
-
-                print(f"[VALIDATION_ENGINE] About to execute: valid_records.append - creating record dict")
-                valid_records.append({
-                    'record': record,
-                    'contractor_id': contractor_id,
-                    'association_id': association_id,
-                    'umbrella_id': umbrella_id,
-                    'period_id': period_id
-                })
-                print(f"[VALIDATION_ENGINE] Completed: valid_records.append - total valid records = {len(valid_records)}")
+                # Contractor/association info resolved by validate_file
+                contractor_id = outcome['contractor_id']
+                association_id = outcome['association_id']
+                print(f"[VALIDATION_ENGINE] Completed: contractor_id = {contractor_id}, association_id = {association_id}")
+
+                print(f"[VALIDATION_ENGINE] About to execute: record valid row index {record_index}")
+                valid_indices.append(record_index)
+                valid_contractor_ids.append(contractor_id)
+                valid_association_ids.append(association_id)
+                print(f"[VALIDATION_ENGINE] Completed: valid row recorded - total valid records = {len(valid_indices)}")
 
             print(f"[VALIDATION_ENGINE] About to execute: if warnings check (warnings_count={len(warnings)})")
             if warnings:
@@ -206,6 +214,23 @@ def lambda_handler(event, context):
 
         print(f"[VALIDATION_ENGINE] Completed: for loop over all {len(records)} records")
 
+        # Fuzzy matches in a file that will be imported are accepted: keep them as aliases
+        if not has_critical_errors and validator.learned_aliases:
+            print(f"[VALIDATION_ENGINE] About to execute: _store_learned_aliases({len(validator.learned_aliases)} aliases)")
+            _store_learned_aliases(validator.learned_aliases, file_id, logger)
+            print("[VALIDATION_ENGINE] Completed: _store_learned_aliases")
+
+        print(f"[VALIDATION_ENGINE] About to execute: records.take({len(valid_indices)} rows) with contractor_id/association_id columns")
+        valid_records = records.take(
+            valid_indices,
+            extra_columns={
+                'contractor_id': valid_contractor_ids,
+                'association_id': valid_association_ids
+            },
+            attrs={'umbrella_id': umbrella_id, 'period_id': period_id}
+        )
+        print(f"[VALIDATION_ENGINE] Completed: valid_records batch = {valid_records}")
+
         print(f"[VALIDATION_ENGINE] About to execute: logger.info('Validation complete') with stats")
         logger.info("Validation complete",
                    total_records=len(records),
@@ -218,7 +243,7 @@ def lambda_handler(event, context):
         result = {
             'has_critical_errors': has_critical_errors,
             'has_warnings': len(all_warnings) > 0,
-            'valid_records': valid_records,
+            'valid_records': valid_records.to_payload(),
             'errors': all_errors,
             'warnings': all_warnings,
             'validation_summary': {
@@ -240,6 +265,17 @@ def lambda_handler(event, context):
         raise
 
 
+def _load_period_data(period_id: str) -> dict:
+    """Period profile for the file's period ({} if it doesn't exist)"""
+    print(f"[VALIDATION_ENGINE] About to execute: dynamodb_client.table.get_item with Key PK='PERIOD#{period_id}', SK='PROFILE'")
+    period_response = dynamodb_client.table.get_item(
+        Key={'PK': f'PERIOD#{period_id}', 'SK': 'PROFILE'}
+    )
+    print(f"[VALIDATION_ENGINE] Completed: Period response received: {type(period_response)}")
+
+    return period_response.get('Item', {})
+
+
 def _load_contractors_cache() -> dict:
     """Pre-load all contractors for performance"""
     print("[VALIDATION_ENGINE] _load_contractors_cache() called")
@@ -269,6 +305,19 @@ def _load_contractors_cache() -> dict:
     return contractors
 
 
+def _store_learned_aliases(learned_aliases: dict, file_id: str, logger: StructuredLogger):
+    """Store new fuzzy matches as alias items (existing aliases are left alone)"""
+    print(f"[VALIDATION_ENGINE] _store_learned_aliases() called with {len(learned_aliases)} aliases, file_id={file_id}")
+
+    stored = 0
+    for (umbrella_id, variant), (contractor, confidence) in learned_aliases.items():
+        item = alias_item(variant, contractor, umbrella_id, confidence, file_id)
+        if dynamodb_client.put_name_alias(item):
+            stored += 1
+
+    logger.info("Learned name aliases stored", file_id=file_id, aliases=stored, candidates=len(learned_aliases))
+
+
 def _store_validation_errors(file_id: str, errors: list, logger: StructuredLogger):
     """Store validation errors in DynamoDB"""
     print(f"[VALIDATION_ENGINE] _store_validation_errors() called with file_id={file_id}, errors_count={len(errors)}")
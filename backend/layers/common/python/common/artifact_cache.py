@@ -0,0 +1,201 @@
+"""
+Parsed-workbook artifact cache
+Stores parser output keyed by file hash so workflow steps and reprocessing
+runs don't re-open the same xlsx
+"""
+
+print("[ARTIFACT_CACHE_MODULE] Starting artifact_cache.py module load")
+
+import gzip
+import json
+import os
+from typing import Dict, Optional
+
+print("[ARTIFACT_CACHE_MODULE] Imported gzip, json, os, typing")
+
+from .excel_parser import PARSER_VERSION
+
+print(f"[ARTIFACT_CACHE_MODULE] Imported PARSER_VERSION={PARSER_VERSION}")
+
+# Local tier lives in /tmp, which survives between invocations of a warm container
+LOCAL_CACHE_DIR = os.environ.get('PARSED_ARTIFACT_DIR', '/tmp/parsed-artifacts')
+
+# Durable tier sits in a 'parsed/' folder next to the upload. The suffix must never
+# be .xlsx, otherwise the bucket notification would treat it as a new upload.
+ARTIFACT_SUFFIX = '.json.gz'
+
+print(f"[ARTIFACT_CACHE_MODULE] LOCAL_CACHE_DIR={LOCAL_CACHE_DIR}, ARTIFACT_SUFFIX={ARTIFACT_SUFFIX}")
+
+
+class ParsedArtifactCache:
+    """
+    Two-tier cache of parsed pay files
+
+    An artifact is a dict {'parser_version', 'file_hash', 'metadata', 'records'}
+    stored as compact gzip JSON. Lookups try /tmp first, then S3. Cache
+    failures are logged and treated as misses - the caller always falls back
+    to parsing the workbook.
+    """
+
+    def __init__(self, s3_client=None, local_dir: str = LOCAL_CACHE_DIR,
+                 parser_version: str = PARSER_VERSION):
+        """
+        Initialize cache
+
+        Args:
+            s3_client: boto3 S3 client for the durable tier (None = local tier only)
+            local_dir: Directory for the local tier
+            parser_version: Parser version baked into every key, so a parser
+                            change never serves stale records
+        """
+        print(f"[ARTIFACT_CACHE_INIT] Starting initialization with local_dir={local_dir}, parser_version={parser_version}")
+
+        self.s3_client = s3_client
+        self.local_dir = local_dir
+        self.parser_version = parser_version
+
+        print(f"[ARTIFACT_CACHE_INIT] Initialization complete (durable tier {'enabled' if s3_client else 'disabled'})")
+
+    def artifact_name(self, file_hash: str) -> str:
+        """Artifact file name for a file hash"""
+        return f"{file_hash}.v{self.parser_version}{ARTIFACT_SUFFIX}"
+
+    def local_path(self, file_hash: str) -> str:
+        """Local tier path for a file hash"""
+        return os.path.join(self.local_dir, self.artifact_name(file_hash))
+
+    def s3_artifact_key(self, s3_key: str, file_hash: str) -> str:
+        """
+        Durable tier key, next to the upload
+
+        uploads/2025/09/20250901_abc.xlsx -> uploads/2025/09/parsed/<hash>.v<version>.json.gz
+        """
+        upload_dir = s3_key.rsplit('/', 1)[0] if '/' in s3_key else ''
+        prefix = f"{upload_dir}/parsed" if upload_dir else 'parsed'
+        return f"{prefix}/{self.artifact_name(file_hash)}"
+
+    def load(self, file_hash: Optional[str], s3_bucket: Optional[str] = None,
+             s3_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Load a cached artifact
+
+        Args:
+            file_hash: SHA256 of the uploaded file (FileHashSHA256)
+            s3_bucket: Upload bucket (for the durable tier)
+            s3_key: Upload key (for the durable tier)
+
+        Returns:
+            Artifact dict or None on a miss
+        """
+        print(f"[ARTIFACT_CACHE_LOAD] Called with file_hash={file_hash}, s3_bucket={s3_bucket}, s3_key={s3_key}")
+
+        if not file_hash:
+            print(f"[ARTIFACT_CACHE_LOAD] No file hash, cache bypassed")
+            return None
+
+        # Tier 1: warm container /tmp
+        path = self.local_path(file_hash)
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    artifact = self._decode(f.read())
+                print(f"[ARTIFACT_CACHE_LOAD] Local hit: {path}")
+                return artifact
+            except Exception as e:
+                print(f"[ARTIFACT_CACHE_LOAD] WARNING: Unreadable local artifact {path}: {type(e).__name__}: {str(e)}")
+
+        # Tier 2: S3 next to the upload
+        if self.s3_client and s3_bucket and s3_key:
+            artifact_key = self.s3_artifact_key(s3_key, file_hash)
+            try:
+                print(f"[ARTIFACT_CACHE_LOAD] Checking durable tier s3://{s3_bucket}/{artifact_key}")
+                response = self.s3_client.get_object(Bucket=s3_bucket, Key=artifact_key)
+                payload = response['Body'].read()
+                artifact = self._decode(payload)
+                print(f"[ARTIFACT_CACHE_LOAD] Durable hit: {artifact_key}")
+            except Exception as e:
+                # NoSuchKey is the normal miss path
+                print(f"[ARTIFACT_CACHE_LOAD] Durable miss for {artifact_key}: {type(e).__name__}")
+                return None
+
+            # Promote to the local tier for the next step in this container
+            self._write_local(path, payload)
+            return artifact
+
+        print(f"[ARTIFACT_CACHE_LOAD] Cache miss for {file_hash}")
+        return None
+
+    def store(self, file_hash: Optional[str], metadata: Dict, records,
+              s3_bucket: Optional[str] = None, s3_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Store parser output in both tiers
+
+        Args:
+            file_hash: SHA256 of the uploaded file (FileHashSHA256)
+            metadata: Output of PayFileParser.extract_metadata()
+            records: Parsed records in JSON-ready form (RecordBatch.to_payload())
+            s3_bucket: Upload bucket (for the durable tier)
+            s3_key: Upload key (for the durable tier)
+
+        Returns:
+            The stored artifact, or None if no hash was given
+        """
+        print(f"[ARTIFACT_CACHE_STORE] Called with file_hash={file_hash}")
+
+        if not file_hash:
+            print(f"[ARTIFACT_CACHE_STORE] No file hash, cache bypassed")
+            return None
+
+        artifact = {
+            'parser_version': self.parser_version,
+            'file_hash': file_hash,
+            'metadata': metadata,
+            'records': records
+        }
+        payload = self._encode(artifact)
+        print(f"[ARTIFACT_CACHE_STORE] Encoded artifact: {len(payload)} bytes compressed")
+
+        self._write_local(self.local_path(file_hash), payload)
+
+        if self.s3_client and s3_bucket and s3_key:
+            artifact_key = self.s3_artifact_key(s3_key, file_hash)
+            try:
+                print(f"[ARTIFACT_CACHE_STORE] Writing durable tier s3://{s3_bucket}/{artifact_key}")
+                self.s3_client.put_object(
+                    Bucket=s3_bucket,
+                    Key=artifact_key,
+                    Body=payload,
+                    ContentType='application/json',
+                    ContentEncoding='gzip'
+                )
+                print(f"[ARTIFACT_CACHE_STORE] Durable tier written")
+            except Exception as e:
+                print(f"[ARTIFACT_CACHE_STORE] WARNING: Failed to write durable tier: {type(e).__name__}: {str(e)}")
+
+        return artifact
+
+    def _write_local(self, path: str, payload: bytes):
+        """Write the local tier atomically (best effort)"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            print(f"[ARTIFACT_CACHE_WRITE_LOCAL] Wrote {path}")
+        except Exception as e:
+            print(f"[ARTIFACT_CACHE_WRITE_LOCAL] WARNING: Failed to write {path}: {type(e).__name__}: {str(e)}")
+
+    def _encode(self, artifact: Dict) -> bytes:
+        """Compact JSON, gzip compressed"""
+        raw = json.dumps(artifact, separators=(',', ':')).encode('utf-8')
+        return gzip.compress(raw)
+
+    def _decode(self, payload: bytes) -> Dict:
+        """Decode and check the artifact was written by this parser version"""
+        artifact = json.loads(gzip.decompress(payload).decode('utf-8'))
+        if artifact.get('parser_version') != self.parser_version:
+            raise ValueError(f"Artifact parser version {artifact.get('parser_version')} != {self.parser_version}")
+        return artifact
+
+print("[ARTIFACT_CACHE_MODULE] artifact_cache.py module load complete")
@@ -0,0 +1,83 @@
+"""
+Contractor-umbrella associations indexed by umbrella employee ID
+Lets validation resolve a row's contractor from (UmbrellaID, EmployeeID)
+with a dict lookup, leaving name matching to confirm the result
+"""
+
+print("[ASSOCIATIONS_MODULE] Starting associations.py module load")
+
+import re
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+print("[ASSOCIATIONS_MODULE] Imported re, collections, Decimal, typing")
+
+_WHOLE_NUMBER_TEXT = re.compile(r'^(\d+)\.0*$')
+
+
+def normalize_employee_id(value) -> str:
+    """
+    Canonical text of an employee ID
+
+    Excel hands numeric IDs over as floats, so the parser sees '812277.0'
+    where the association holds '812277'; both become '812277'. Other IDs
+    are only stripped (leading zeros are kept).
+
+    Args:
+        value: Employee ID as parsed (str, int, float) or stored (str, Decimal)
+
+    Returns:
+        Normalised ID, '' when missing
+    """
+    if value is None or isinstance(value, bool):
+        return ''
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (float, Decimal)):
+        if value == value and value == int(value):
+            return str(int(value))
+        return str(value)
+
+    text = str(value).strip()
+    match = _WHOLE_NUMBER_TEXT.match(text)
+    return match.group(1) if match else text
+
+
+class AssociationIndex:
+    """
+    Association items keyed by (UmbrellaID, normalised EmployeeID)
+
+    Built once per file from the umbrella's associations. lookup() returns
+    every association carrying the ID (usually one; more than one means the
+    umbrella reused an ID and the name has to break the tie).
+    for_contractor() gives Rule 3 a contractor's associations with the
+    umbrella without a query per contractor.
+    """
+
+    def __init__(self, associations: Iterable[Dict] = ()):
+        self._by_employee = defaultdict(list)
+        self._by_contractor = defaultdict(list)
+        count = 0
+        for association in associations:
+            self._by_contractor[(association.get('UmbrellaID'), association.get('ContractorID'))].append(association)
+            employee_id = normalize_employee_id(association.get('EmployeeID'))
+            if employee_id:
+                self._by_employee[(association.get('UmbrellaID'), employee_id)].append(association)
+                count += 1
+        self._by_employee = dict(self._by_employee)
+        self._by_contractor = dict(self._by_contractor)
+        print(f"[ASSOCIATION_INDEX] Indexed {count} associations under {len(self._by_employee)} employee IDs")
+
+    def lookup(self, umbrella_id: str, employee_id) -> List[Dict]:
+        """Associations of an umbrella carrying an employee ID ([] if none)"""
+        return self._by_employee.get((umbrella_id, normalize_employee_id(employee_id)), [])
+
+    def for_contractor(self, umbrella_id: str, contractor_id: str) -> List[Dict]:
+        """A contractor's associations with an umbrella ([] if none)"""
+        return self._by_contractor.get((umbrella_id, contractor_id), [])
+
+    def __len__(self):
+        return len(self._by_employee)
+
+print("[ASSOCIATIONS_MODULE] associations.py module load complete")
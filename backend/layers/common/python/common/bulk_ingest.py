@@ -0,0 +1,166 @@
+"""
+Bulk ingest of a directory of pay files
+Parses every workbook in parallel and writes normalised records to JSON Lines.
+Runs fully offline - no AWS calls.
+
+Usage (from backend/layers/common/python):
+    python -m common.bulk_ingest ../../../../InputData --output-dir /tmp/pay-jsonl
+    python -m common.bulk_ingest ../../../../InputData --workers 4 --engine streaming
+"""
+
+print("[BULK_INGEST_MODULE] Starting bulk_ingest.py module load")
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+print("[BULK_INGEST_MODULE] Imported argparse, contextlib, glob, json, os, sys, time, concurrent.futures, typing")
+
+from .excel_parser import ENGINE_XML, PARSE_ENGINES, PayFileParser
+from .money import MONEY_FIELDS
+
+print("[BULK_INGEST_MODULE] Imported PayFileParser, money")
+
+DEFAULT_PATTERN = '*.xlsx'
+
+
+def _silence_stdout():
+    """Process pool initializer - the parser's trace output would swamp the report"""
+    sys.stdout = open(os.devnull, 'w')
+
+
+def ingest_file(path: str, output_dir: str, engine: str = ENGINE_XML) -> Dict:
+    """
+    Parse one pay file and write its records to <output_dir>/<name>.jsonl
+
+    Each line is one record dict (money in pounds) plus source_file,
+    umbrella_code and submission_date.
+
+    Returns:
+        Per-file stats: file, output, rows, seconds, rows_per_sec, umbrella_code, error
+    """
+    filename = os.path.basename(path)
+    output_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.jsonl')
+    stats = {
+        'file': filename,
+        'output': output_path,
+        'rows': 0,
+        'seconds': 0.0,
+        'rows_per_sec': 0.0,
+        'umbrella_code': None,
+        'error': None
+    }
+
+    started = time.perf_counter()
+    try:
+        with PayFileParser(path, engine=engine) as parser:
+            metadata = parser.extract_metadata()
+            stats['umbrella_code'] = metadata['umbrella_code']
+
+            with open(output_path, 'w', encoding='utf-8') as out:
+                for record in parser.iter_records():
+                    line = dict(record)
+                    for field in MONEY_FIELDS:
+                        line[field] = line[field].pounds
+                    line['source_file'] = filename
+                    line['umbrella_code'] = metadata['umbrella_code']
+                    line['submission_date'] = metadata['submission_date']
+                    out.write(json.dumps(line, separators=(',', ':'), default=str))
+                    out.write('\n')
+                    stats['rows'] += 1
+    except Exception as e:
+        stats['error'] = f"{type(e).__name__}: {str(e)}"
+
+    stats['seconds'] = time.perf_counter() - started
+    if stats['seconds'] > 0:
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds']
+
+    return stats
+
+
+def ingest_directory(input_dir: str, output_dir: str, workers: Optional[int] = None,
+                     engine: str = ENGINE_XML, pattern: str = DEFAULT_PATTERN,
+                     report=print) -> List[Dict]:
+    """
+    Parse every matching file in input_dir with a process pool
+
+    Args:
+        input_dir: Directory of pay files
+        output_dir: Directory for the .jsonl output (created if missing)
+        workers: Process count (default: CPU count; 1 = parse in this process)
+        engine: PayFileParser engine
+        pattern: Glob pattern for input files
+        report: Callable for per-file progress lines
+
+    Returns:
+        Per-file stats in input order
+    """
+    paths = sorted(glob.glob(os.path.join(input_dir, pattern)))
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = {}
+    if workers == 1:
+        with open(os.devnull, 'w') as devnull:
+            for path in paths:
+                with contextlib.redirect_stdout(devnull):
+                    stats = ingest_file(path, output_dir, engine)
+                results[path] = stats
+                report(_format_stats(stats))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_silence_stdout) as pool:
+            futures = {pool.submit(ingest_file, path, output_dir, engine): path for path in paths}
+            for future in as_completed(futures):
+                stats = future.result()
+                results[futures[future]] = stats
+                report(_format_stats(stats))
+
+    return [results[path] for path in paths]
+
+
+def _format_stats(stats: Dict) -> str:
+    """One report line per file"""
+    if stats['error']:
+        return f"  FAILED  {stats['file']}: {stats['error']}"
+    return (f"  {stats['rows']:>7} rows  {stats['seconds']:>7.3f}s  "
+            f"{stats['rows_per_sec']:>10.0f} rows/s  {stats['umbrella_code'] or '-':<10} {stats['file']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Parse a directory of contractor pay files to JSON Lines')
+    parser.add_argument('input_dir', help='Directory containing pay files')
+    parser.add_argument('--output-dir', default='bulk-ingest-output', help='Directory for .jsonl output')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--engine', choices=PARSE_ENGINES, default=ENGINE_XML, help='Parse engine')
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN, help='Glob pattern for input files')
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*80)
+    print(f"Bulk ingest: {args.input_dir} -> {args.output_dir} (engine={args.engine}, workers={args.workers or os.cpu_count()})")
+    print("="*80)
+
+    started = time.perf_counter()
+    results = ingest_directory(args.input_dir, args.output_dir, args.workers, args.engine, args.pattern)
+    elapsed = time.perf_counter() - started
+
+    total_rows = sum(r['rows'] for r in results)
+    failed = [r for r in results if r['error']]
+
+    print("="*80)
+    print(f"Files: {len(results)} ({len(failed)} failed)  Rows: {total_rows}  "
+          f"Wall time: {elapsed:.3f}s  Throughput: {total_rows / elapsed if elapsed else 0:.0f} rows/s")
+    print("="*80)
+
+    return 1 if failed else 0
+
+print("[BULK_INGEST_MODULE] bulk_ingest.py module load complete")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
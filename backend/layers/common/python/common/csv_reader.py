@@ -0,0 +1,169 @@
+"""
+Delimited text reader for CSV/TSV pay files
+Presents a CSV export through the same worksheet interface the parser uses for
+xlsx, so header discovery, column mapping and row parsing are shared
+"""
+
+print("[CSV_READER_MODULE] Starting csv_reader.py module load")
+
+import codecs
+import csv
+import io
+from typing import Iterable, Iterator, Optional
+
+print("[CSV_READER_MODULE] Imported codecs, csv, io, typing")
+
+CSV_SUFFIXES = ('.csv',)
+TSV_SUFFIXES = ('.tsv', '.tab')
+DELIMITED_SUFFIXES = CSV_SUFFIXES + TSV_SUFFIXES
+
+# Bytes read up front to sniff the delimiter; the encoding check reads the
+# whole file in chunks of this size
+SNIFF_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ',\t;|'
+
+# Excel's "CSV UTF-8" export starts with a BOM; plain "CSV" is Windows-1252
+FALLBACK_ENCODING = 'cp1252'
+
+print(f"[CSV_READER_MODULE] DELIMITED_SUFFIXES={DELIMITED_SUFFIXES}, SNIFF_BYTES={SNIFF_BYTES}")
+
+
+def is_delimited_filename(name: Optional[str]) -> bool:
+    """Check whether a filename or S3 key names a CSV/TSV file"""
+    return bool(name) and name.lower().endswith(DELIMITED_SUFFIXES)
+
+
+def _detect_encoding(chunks: Iterable[bytes]) -> str:
+    """
+    utf-8-sig if the whole file decodes as UTF-8, else cp1252
+
+    A plain Excel "CSV" export can be ASCII for thousands of rows before its
+    first accented name, so no prefix of the file is enough to decide on.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for chunk in chunks:
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+class CsvReader:
+    """
+    Workbook-level reader for a delimited text file
+
+    Mirrors XlsxReader: exposes the single 'sheet' as .active and a close().
+    """
+
+    def __init__(self, source, filename: Optional[str] = None):
+        """
+        Initialize reader
+
+        Args:
+            source: Path or seekable binary file object of a CSV/TSV file
+            filename: Name used to pick the delimiter (.tsv/.tab = tab); other
+                      names are sniffed
+        """
+        print(f"[CSV_READER_INIT] Opening delimited file: {source}, filename={filename}")
+
+        self.path = source if isinstance(source, str) else None
+        self._stream = None if self.path else source
+        self._start = 0 if self.path else source.tell()
+
+        sample = self._read_sample()
+        self.encoding = _detect_encoding(self._iter_bytes())
+
+        if filename and filename.lower().endswith(TSV_SUFFIXES):
+            self.delimiter = '\t'
+        else:
+            self.delimiter = self._sniff_delimiter(sample.decode(self.encoding, errors='ignore'))
+        print(f"[CSV_READER_INIT] encoding={self.encoding}, delimiter={self.delimiter!r}")
+
+        self.active = CsvSheet(self)
+        print(f"[CSV_READER_INIT] Initialization complete")
+
+    def _read_sample(self) -> bytes:
+        if self.path:
+            with open(self.path, 'rb') as f:
+                return f.read(SNIFF_BYTES)
+        sample = self._stream.read(SNIFF_BYTES)
+        self._stream.seek(self._start)
+        return sample
+
+    def _iter_bytes(self) -> Iterator[bytes]:
+        """The whole file in SNIFF_BYTES chunks, leaving a stream back at its start"""
+        f = open(self.path, 'rb') if self.path else self._stream
+        try:
+            while True:
+                chunk = f.read(SNIFF_BYTES)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            if self.path:
+                f.close()
+            else:
+                self._stream.seek(self._start)
+
+    @staticmethod
+    def _sniff_delimiter(text: str) -> str:
+        """Guess the delimiter from the first lines, defaulting to a comma"""
+        lines = text.splitlines()[:20]
+        try:
+            return csv.Sniffer().sniff('\n'.join(lines), delimiters=SNIFF_DELIMITERS).delimiter
+        except csv.Error:
+            print(f"[CSV_READER_SNIFF] Could not sniff delimiter, defaulting to ','")
+            return ','
+
+    def open_text(self):
+        """Fresh text stream positioned at the start of the file"""
+        if self.path:
+            return open(self.path, 'r', encoding=self.encoding, newline='')
+        self._stream.seek(self._start)
+        return _DetachingTextWrapper(self._stream, encoding=self.encoding, newline='')
+
+    def close(self):
+        """Nothing is held open between reads; provided for parity with XlsxReader"""
+        print(f"[CSV_READER_CLOSE] Closing reader")
+
+
+class _DetachingTextWrapper(io.TextIOWrapper):
+    """TextIOWrapper that leaves the caller's binary stream open when closed"""
+
+    def close(self):
+        if not self.closed:
+            self.detach()
+
+
+class CsvSheet:
+    """
+    Rows of a delimited file as value tuples
+
+    Mirrors the subset of openpyxl's worksheet API the parser uses:
+    iter_rows(min_row, max_row, max_col, values_only=True). Empty fields come
+    back as None, like empty cells from openpyxl; everything else stays text and
+    goes through the parser's usual value conversion.
+    """
+
+    def __init__(self, reader: CsvReader):
+        self.reader = reader
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  max_col: Optional[int] = None, values_only: bool = True) -> Iterator[tuple]:
+        """Yield row value tuples, one per line of the file"""
+        if not values_only:
+            raise ValueError("CsvSheet only supports values_only=True")
+
+        with self.reader.open_text() as text:
+            for row_idx, fields in enumerate(csv.reader(text, delimiter=self.reader.delimiter), start=1):
+                if max_row is not None and row_idx > max_row:
+                    return
+                if row_idx < min_row:
+                    continue
+                if max_col is not None:
+                    fields = fields[:max_col]
+                yield tuple(field if field != '' else None for field in fields)
+
+print("[CSV_READER_MODULE] csv_reader.py module load complete")
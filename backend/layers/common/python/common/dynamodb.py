@@ -48,12 +48,14 @@ class DynamoDBClient:
         pk_value = f'NAME#{normalized_name}'
         print(f"[GET_CONTRACTOR_BY_NAME] Generated PK value: {pk_value}")
 
+        # NAME# also holds learned aliases (GSI2SK ALIAS#...); only contractors are wanted here
         print(f"[GET_CONTRACTOR_BY_NAME] Querying GSI2 with KeyConditionExpression")
         response = self.table.query(
             IndexName='GSI2',
-            KeyConditionExpression='GSI2PK = :pk',
+            KeyConditionExpression='GSI2PK = :pk AND begins_with(GSI2SK, :sk)',
             ExpressionAttributeValues={
-                ':pk': pk_value
+                ':pk': pk_value,
+                ':sk': 'CONTRACTOR#'
             }
         )
         print(f"[GET_CONTRACTOR_BY_NAME] Query response: {response}")
@@ -88,8 +90,41 @@ class DynamoDBClient:
         print(f"[GET_CONTRACTOR_UMBRELLA_ASSOC] Returning {len(items)} items")
         return items
 
+    def get_umbrella_associations(self, umbrella_id):
+        """
+        Get every contractor association an umbrella has
+
+        Args:
+            umbrella_id: Umbrella UUID
+
+        Returns:
+            List of ContractorUmbrellaAssociation items (with EmployeeID)
+        """
+        print(f"[GET_UMBRELLA_ASSOCIATIONS] Called with umbrella_id={umbrella_id}")
+
+        query_kwargs = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': Key('GSI1PK').eq(f'UMBRELLA#{umbrella_id}') & Key('GSI1SK').begins_with('CONTRACTOR#')
+        }
+
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_UMBRELLA_ASSOCIATIONS] Returning {len(items)} associations")
+        return items
+
     def check_permanent_staff(self, first_name, last_name):
-        """Check if person is permanent staff (should NOT be in contractor files)"""
+        """
+        Check if one person is permanent staff (should NOT be in contractor files)
+
+        Validation uses PermanentStaffRegistry instead of a read per record.
+        """
         print(f"[CHECK_PERMANENT_STAFF] Called with first_name={first_name}, last_name={last_name}")
 
         normalized_name = f"{first_name} {last_name}".lower()
@@ -99,23 +134,56 @@ class DynamoDBClient:
         sk_value = 'PROFILE'
         print(f"[CHECK_PERMANENT_STAFF] Generated key: PK={pk_value}, SK={sk_value}")
 
-        try:
-            print(f"[CHECK_PERMANENT_STAFF] Attempting get_item query")
-            response = self.table.get_item(
-                Key={
-                    'PK': pk_value,
-                    'SK': sk_value
-                }
-            )
-            print(f"[CHECK_PERMANENT_STAFF] get_item response: {response}")
-
-            is_permanent = 'Item' in response
-            print(f"[CHECK_PERMANENT_STAFF] Is permanent staff: {is_permanent}")
-            return is_permanent
-        except Exception as e:
-            print(f"[CHECK_PERMANENT_STAFF] Exception caught: {type(e).__name__}: {str(e)}")
-            print(f"[CHECK_PERMANENT_STAFF] Returning False due to exception")
-            return False
+        # Errors propagate: a failed read must not pass someone as "not permanent"
+        print(f"[CHECK_PERMANENT_STAFF] Attempting get_item query")
+        response = self.table.get_item(
+            Key={
+                'PK': pk_value,
+                'SK': sk_value
+            }
+        )
+        print(f"[CHECK_PERMANENT_STAFF] get_item response: {response}")
+
+        is_permanent = 'Item' in response
+        print(f"[CHECK_PERMANENT_STAFF] Is permanent staff: {is_permanent}")
+        return is_permanent
+
+    def get_permanent_staff(self):
+        """
+        Get every permanent staff profile (see common.permanent_staff)
+
+        Returns:
+            List of PermanentStaff items
+        """
+        from .permanent_staff import PERMANENT_STAFF_GSI2PK
+
+        print(f"[GET_PERMANENT_STAFF] Querying GSI2 for {PERMANENT_STAFF_GSI2PK}")
+
+        query_kwargs = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': Key('GSI2PK').eq(PERMANENT_STAFF_GSI2PK)
+        }
+
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_PERMANENT_STAFF] Returning {len(items)} permanent staff")
+        return items
+
+    def get_permanent_staff_version(self):
+        """Version stamp of the permanent staff profiles, or None if never stamped"""
+        from .permanent_staff import PERMANENT_STAFF_VERSION_KEY
+
+        response = self.table.get_item(Key=PERMANENT_STAFF_VERSION_KEY)
+        version = response.get('Item', {}).get('Version')
+        print(f"[GET_PERMANENT_STAFF_VERSION] Version: {version}")
+        return version
 
     def get_system_parameter(self, param_key):
         """Get system configuration parameter"""
@@ -232,6 +300,98 @@ class DynamoDBClient:
         print(f"[BATCH_WRITE_PAY_RECORDS] Batch writer context closed, writes committed")
         print(f"[BATCH_WRITE_PAY_RECORDS] batch_write_pay_records complete")
 
+    def get_active_pay_records(self, period_id, umbrella_id):
+        """
+        Get the active pay records an umbrella has in a period
+
+        These are the current version's rows, whichever FILE# they were written
+        under (rows carried over by a diff supersede stay under the older file).
+
+        Args:
+            period_id: Period number as string
+            umbrella_id: Umbrella UUID
+
+        Returns:
+            List of pay record items
+        """
+        print(f"[GET_ACTIVE_PAY_RECORDS] Called with period_id={period_id}, umbrella_id={umbrella_id}")
+
+        query_kwargs = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': Key('GSI2PK').eq(f'PERIOD#{period_id}'),
+            'FilterExpression': Attr('IsActive').eq(True) & Attr('EntityType').eq('PayRecord') & Attr('UmbrellaID').eq(umbrella_id)
+        }
+
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+            print(f"[GET_ACTIVE_PAY_RECORDS] Page returned {len(response.get('Items', []))} items, total {len(items)}")
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_ACTIVE_PAY_RECORDS] Returning {len(items)} items")
+        return items
+
+    def deactivate_pay_records(self, records):
+        """Batch write pay records back with IsActive = False"""
+        print(f"[DEACTIVATE_PAY_RECORDS] Called with {len(records)} records")
+
+        with self.table.batch_writer() as batch:
+            for record in records:
+                batch.put_item(Item=dict(record, IsActive=False))
+
+        print(f"[DEACTIVATE_PAY_RECORDS] deactivate_pay_records complete")
+
+    def get_name_aliases(self, umbrella_id):
+        """
+        Get the learned name aliases for an umbrella
+
+        Args:
+            umbrella_id: Umbrella UUID
+
+        Returns:
+            List of alias items (see common.name_aliases)
+        """
+        from .name_aliases import ALIASES_GSI1PK, alias_gsi1sk_prefix
+
+        print(f"[GET_NAME_ALIASES] Called with umbrella_id={umbrella_id}")
+
+        query_kwargs = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': Key('GSI1PK').eq(ALIASES_GSI1PK) & Key('GSI1SK').begins_with(alias_gsi1sk_prefix(umbrella_id))
+        }
+
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_NAME_ALIASES] Returning {len(items)} aliases")
+        return items
+
+    def put_name_alias(self, item):
+        """
+        Store a learned name alias unless it already exists
+
+        Returns:
+            True if written, False if the alias was already there (its first-seen
+            file is kept)
+        """
+        print(f"[PUT_NAME_ALIAS] Called for SK={item['SK']} -> {item['ContractorID']}")
+        try:
+            self.table.put_item(Item=item, ConditionExpression='attribute_not_exists(PK)')
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            print(f"[PUT_NAME_ALIAS] Alias already exists, keeping it")
+            return False
+        return True
+
     def get_contractor_pay_records(self, contractor_id, limit=10):
         """
         Get recent pay records for contractor (for rate history lookup)
@@ -315,4 +475,60 @@ class DynamoDBClient:
         print(f"[GET_CONTRACTOR_RATE_IN_PERIOD] No rate found, returning None")
         return None
 
+    def get_period_rates(self, period_id):
+        """
+        Every contractor's normal (STANDARD) rate in a period, in one query
+
+        The same rates get_contractor_rate_in_period returns one contractor at
+        a time, read from the period's GSI2 partition in a paginated query.
+
+        Args:
+            period_id: Period number as string
+
+        Returns:
+            Dict of contractor ID -> Decimal day rate
+        """
+        print(f"[GET_PERIOD_RATES] Called with period_id={period_id}")
+
+        query_kwargs = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': Key('GSI2PK').eq(f'PERIOD#{period_id}') & Key('GSI2SK').begins_with('CONTRACTOR#'),
+            'FilterExpression': Attr('IsActive').eq(True) & Attr('RecordType').eq('STANDARD')
+        }
+
+        rates = {}
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                rates.setdefault(item['GSI2SK'][len('CONTRACTOR#'):], item.get('DayRate'))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_PERIOD_RATES] Returning rates for {len(rates)} contractors")
+        return rates
+
+    def get_contractors(self):
+        """
+        Get every contractor profile
+
+        Returns:
+            List of Contractor items
+        """
+        print("[GET_CONTRACTORS] Scanning for EntityType = Contractor")
+
+        scan_kwargs = {'FilterExpression': Attr('EntityType').eq('Contractor')}
+        items = []
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            items.extend(response.get('Items', []))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print(f"[GET_CONTRACTORS] Returning {len(items)} contractors")
+        return items
+
 print("[DYNAMODB_MODULE] dynamodb.py module load complete")
@@ -5,42 +5,228 @@ Handles the specific format from umbrella companies
 
 print("[EXCEL_PARSER_MODULE] Starting excel_parser.py module load")
 
+import io
+import itertools
+import os
 import re
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
-print("[EXCEL_PARSER_MODULE] Imported standard library modules: re, datetime, Decimal, typing")
+print("[EXCEL_PARSER_MODULE] Imported standard library modules: io, itertools, os, re, datetime, Decimal, typing")
 
 import openpyxl
 from openpyxl.worksheet.worksheet import Worksheet
 
 print("[EXCEL_PARSER_MODULE] Imported openpyxl modules")
 
+from .csv_reader import CsvReader, is_delimited_filename
+from .header_profiles import PROFILE_HIT, HeaderProfileRegistry, default_registry
+from .money import Money
+from .record_batch import RecordBatch
+from .xlsx_reader import XlsxReader, worksheet_xml_size
+
+print("[EXCEL_PARSER_MODULE] Imported csv reader, header profile registry, money, record batch and xlsx reader")
+
+# Bump whenever the shape or values of parsed records change - cached parse
+# artifacts are keyed on this so stale output is never reused
+PARSER_VERSION = '5'
+
+# Parse engines
+# - full: openpyxl full mode, every cell object is built up front
+# - streaming: openpyxl read-only/values-only mode, rows are read lazily from the sheet XML
+# - xml: iterparse over the sheet XML directly, only mapped columns are decoded
+# - csv: CSV/TSV text read line by line (chosen automatically for .csv/.tsv names)
+ENGINE_FULL = 'full'
+ENGINE_STREAMING = 'streaming'
+ENGINE_XML = 'xml'
+ENGINE_CSV = 'csv'
+PARSE_ENGINES = (ENGINE_FULL, ENGINE_STREAMING, ENGINE_XML, ENGINE_CSV)
+
+# 'auto' (the default) picks full, streaming or xml by the size of the sheet XML.
+# Thresholds are bytes of uncompressed sheet XML and can be overridden with the
+# system parameters of the same name.
+ENGINE_AUTO = 'auto'
+PARSE_STREAMING_MIN_BYTES = 'PARSE_STREAMING_MIN_BYTES'
+PARSE_XML_MIN_BYTES = 'PARSE_XML_MIN_BYTES'
+DEFAULT_ENGINE_THRESHOLDS = {
+    PARSE_STREAMING_MIN_BYTES: 2_000_000,   # ~5k rows; full mode holds every cell object
+    PARSE_XML_MIN_BYTES: 16_000_000         # ~35k rows
+}
+
+# Sheet XML is roughly this many times the size of the xlsx file; used when
+# only the file size (FileSizeBytes) is known
+ESTIMATED_XLSX_COMPRESSION_RATIO = 8
+
+# Header row is searched for in the first HEADER_SEARCH_ROWS rows
+HEADER_SEARCH_ROWS = 20
+HEADER_INDICATORS = ['employee id', 'surname', 'forename', 'unit', 'rate', 'amount']
+
+# Umbrella code -> filename pattern
+UMBRELLA_PATTERNS = {
+    'NASA': r'NASA',
+    'PAYSTREAM': r'PAYSTREAM',
+    'PARASOL': r'Parasol',
+    'CLARITY': r'Clarity',
+    'GIANT': r'GIANT',
+    'WORKWELL': r'WORKWELL'
+}
+
+print(f"[EXCEL_PARSER_MODULE] PARSER_VERSION={PARSER_VERSION}, parse engines: {PARSE_ENGINES}")
+print(f"[EXCEL_PARSER_MODULE] DEFAULT_ENGINE_THRESHOLDS={DEFAULT_ENGINE_THRESHOLDS}")
+
+
+def choose_engine(sheet_bytes: Optional[int] = None, file_bytes: Optional[int] = None,
+                  thresholds: Optional[Dict] = None) -> Tuple[str, str]:
+    """
+    Pick a parse engine for an xlsx file by size
+
+    Args:
+        sheet_bytes: Uncompressed sheet XML size (preferred)
+        file_bytes: xlsx file size, e.g. FileSizeBytes from the FILE item
+        thresholds: Overrides for DEFAULT_ENGINE_THRESHOLDS (missing keys use the defaults)
+
+    Returns:
+        (engine, reason)
+    """
+    limits = dict(DEFAULT_ENGINE_THRESHOLDS)
+    limits.update({k: int(v) for k, v in (thresholds or {}).items() if v is not None})
+
+    if sheet_bytes is not None:
+        size, measure = sheet_bytes, f"sheet XML {sheet_bytes} bytes"
+    elif file_bytes is not None:
+        size = file_bytes * ESTIMATED_XLSX_COMPRESSION_RATIO
+        measure = f"file {file_bytes} bytes (~{size} bytes sheet XML)"
+    else:
+        return ENGINE_FULL, "size unknown"
+
+    if size >= limits[PARSE_XML_MIN_BYTES]:
+        engine, reason = ENGINE_XML, f"{measure} >= {PARSE_XML_MIN_BYTES} {limits[PARSE_XML_MIN_BYTES]}"
+    elif size >= limits[PARSE_STREAMING_MIN_BYTES]:
+        engine, reason = ENGINE_STREAMING, f"{measure} >= {PARSE_STREAMING_MIN_BYTES} {limits[PARSE_STREAMING_MIN_BYTES]}"
+    else:
+        engine, reason = ENGINE_FULL, f"{measure} < {PARSE_STREAMING_MIN_BYTES} {limits[PARSE_STREAMING_MIN_BYTES]}"
+
+    print(f"[CHOOSE_ENGINE] {engine}: {reason}")
+    return engine, reason
+
 
 class PayFileParser:
     """Parse contractor pay Excel files"""
 
-    def __init__(self, file_path: str):
-        print(f"[PAYFILEPARSER_INIT] Starting PayFileParser initialization with file_path={file_path}")
-
-        self.file_path = file_path
+    def __init__(self, source: Union[str, bytes, BinaryIO], engine: str = ENGINE_AUTO,
+                 filename: Optional[str] = None, header_profiles: Optional[HeaderProfileRegistry] = None,
+                 size_hint: Optional[int] = None, engine_thresholds: Optional[Dict] = None):
+        """
+        Initialize parser
+
+        Args:
+            source: Path to the Excel file, the file contents as bytes, or a binary
+                    file-like object (BytesIO, S3 get_object Body)
+            engine: 'auto' (default) picks by size, see choose_engine(). Otherwise
+                    'full', or 'streaming' or 'xml' for large files - streaming keeps
+                    peak memory flat by reading rows lazily in openpyxl read-only
+                    mode; xml also skips openpyxl and decodes only mapped columns.
+                    'csv' reads CSV/TSV text and is used automatically when the
+                    filename ends in .csv/.tsv
+            filename: Original filename, used for umbrella/date extraction when
+                      source is not a path
+            header_profiles: Header profile registry (defaults to the container-wide one)
+            size_hint: File size in bytes (FileSizeBytes), used by 'auto' when the
+                       zip directory can't be read
+            engine_thresholds: Overrides for DEFAULT_ENGINE_THRESHOLDS, used by 'auto'
+        """
+        print(f"[PAYFILEPARSER_INIT] Starting PayFileParser initialization with source type={type(source).__name__}, engine={engine}, filename={filename}")
+
+        if engine not in PARSE_ENGINES and engine != ENGINE_AUTO:
+            print(f"[PAYFILEPARSER_INIT] ERROR: Unknown engine '{engine}', raising ValueError")
+            raise ValueError(f"Unknown parse engine '{engine}'. Expected one of: {', '.join(PARSE_ENGINES + (ENGINE_AUTO,))}")
+
+        if isinstance(source, os.PathLike):
+            source = os.fspath(source)
+
+        self.file_path = source if isinstance(source, str) else None
         print(f"[PAYFILEPARSER_INIT] Set self.file_path={self.file_path}")
 
-        print(f"[PAYFILEPARSER_INIT] Loading workbook from {file_path}")
-        self.workbook = openpyxl.load_workbook(file_path, data_only=True)
+        self.filename = filename or (self.file_path.split('/')[-1] if self.file_path else '')
+        print(f"[PAYFILEPARSER_INIT] Set self.filename={self.filename}")
+
+        self.engine_reason = 'requested'
+        if engine != ENGINE_CSV and is_delimited_filename(self.filename):
+            print(f"[PAYFILEPARSER_INIT] '{self.filename}' is delimited text, using csv engine instead of {engine}")
+            engine = ENGINE_CSV
+            self.engine_reason = 'delimited filename'
+
+        self.header_profiles = header_profiles if header_profiles is not None else default_registry
+        self.header_profile_status = None
+
+        workbook_source = self._open_source(source)
+        print(f"[PAYFILEPARSER_INIT] Workbook source: {workbook_source}")
+
+        if engine == ENGINE_AUTO:
+            engine, self.engine_reason = choose_engine(worksheet_xml_size(workbook_source), size_hint, engine_thresholds)
+
+        self.engine = engine
+        print(f"[PAYFILEPARSER_INIT] Set self.engine={self.engine} ({self.engine_reason})")
+
+        print(f"[PAYFILEPARSER_INIT] Loading workbook")
+        if engine == ENGINE_STREAMING:
+            print(f"[PAYFILEPARSER_INIT] Streaming engine - opening workbook in read-only mode")
+            self.workbook = openpyxl.load_workbook(workbook_source, read_only=True, data_only=True)
+        elif engine == ENGINE_XML:
+            print(f"[PAYFILEPARSER_INIT] XML engine - reading sheet XML directly")
+            self.workbook = XlsxReader(workbook_source)
+        elif engine == ENGINE_CSV:
+            print(f"[PAYFILEPARSER_INIT] CSV engine - reading delimited text")
+            self.workbook = CsvReader(workbook_source, filename=self.filename)
+        else:
+            self.workbook = openpyxl.load_workbook(workbook_source, data_only=True)
         print(f"[PAYFILEPARSER_INIT] Workbook loaded: {self.workbook}")
 
         self.worksheet = self.workbook.active
         print(f"[PAYFILEPARSER_INIT] Active worksheet: {self.worksheet}")
+
+        self._header_width = 0
+        self.header_row = None
+        self.column_map = {}
+        self.blank_rows = 0
         print(f"[PAYFILEPARSER_INIT] PayFileParser initialization complete")
 
+    @staticmethod
+    def _open_source(source):
+        """
+        Turn a parser source into something openpyxl can load
+
+        Paths and seekable file objects are passed through. Bytes and
+        non-seekable streams (S3 StreamingBody) are buffered into BytesIO,
+        since the xlsx zip directory has to be read from the end of the file.
+        """
+        if isinstance(source, str):
+            print(f"[OPEN_SOURCE] Source is a file path")
+            return source
+
+        if isinstance(source, (bytes, bytearray)):
+            print(f"[OPEN_SOURCE] Source is {len(source)} bytes, wrapping in BytesIO")
+            return io.BytesIO(source)
+
+        if hasattr(source, 'read'):
+            seekable = getattr(source, 'seekable', None)
+            if callable(seekable) and seekable():
+                print(f"[OPEN_SOURCE] Source is a seekable file object")
+                return source
+
+            print(f"[OPEN_SOURCE] Source is a non-seekable stream, buffering into BytesIO")
+            return io.BytesIO(source.read())
+
+        print(f"[OPEN_SOURCE] ERROR: Unsupported source type {type(source).__name__}")
+        raise TypeError(f"Unsupported pay file source type: {type(source).__name__}")
+
     def extract_metadata(self) -> Dict:
         """Extract metadata from filename and file content"""
         print(f"[EXTRACT_METADATA] Starting metadata extraction")
 
-        filename = self.file_path.split('/')[-1]
-        print(f"[EXTRACT_METADATA] Extracted filename from path: {filename}")
+        filename = self.filename
+        print(f"[EXTRACT_METADATA] Using filename: {filename}")
 
         umbrella_code = self._extract_umbrella_code()
         submission_date = self._extract_submission_date()
@@ -57,96 +243,230 @@ class PayFileParser:
         """Find the row containing column headers"""
         print(f"[FIND_HEADER_ROW] Starting header row search")
 
-        # Common header variations
-        header_indicators = ['employee id', 'surname', 'forename', 'unit', 'rate', 'amount']
-        print(f"[FIND_HEADER_ROW] Header indicators: {header_indicators}")
-
-        print(f"[FIND_HEADER_ROW] Iterating through rows 1-20")
-        for row_idx, row in enumerate(self.worksheet.iter_rows(min_row=1, max_row=20), start=1):
+        print(f"[FIND_HEADER_ROW] Iterating through rows 1-{HEADER_SEARCH_ROWS}")
+        rows = self.worksheet.iter_rows(min_row=1, max_row=HEADER_SEARCH_ROWS, values_only=True)
+        for row_idx, row in enumerate(rows, start=1):
             print(f"[FIND_HEADER_ROW] Checking row {row_idx}")
 
-            row_text = ' '.join([str(cell.value or '').lower() for cell in row])
-            print(f"[FIND_HEADER_ROW] Row {row_idx} text: {row_text[:100]}...")
-
-            # Check if this row contains most header indicators
-            matches = sum(1 for indicator in header_indicators if indicator in row_text)
-            print(f"[FIND_HEADER_ROW] Row {row_idx} has {matches} header indicator matches")
-
-            if matches >= 4:
-                print(f"[FIND_HEADER_ROW] Found header row at index {row_idx} with {matches} matches")
+            if self._is_header_row(row):
+                print(f"[FIND_HEADER_ROW] Found header row at index {row_idx}")
                 return row_idx
 
         print(f"[FIND_HEADER_ROW] No header row found, defaulting to row 1")
         return 1  # Default to first row
 
+    @staticmethod
+    def _is_header_row(row) -> bool:
+        """Check if a row of cell values contains most of the header indicators"""
+        row_text = ' '.join([str(value or '').lower() for value in row])
+        print(f"[IS_HEADER_ROW] Row text: {row_text[:100]}...")
+
+        matches = sum(1 for indicator in HEADER_INDICATORS if indicator in row_text)
+        print(f"[IS_HEADER_ROW] Row has {matches} header indicator matches")
+
+        return matches >= 4
+
     def parse_records(self) -> List[Dict]:
         """Parse all pay records from the Excel file"""
         print(f"[PARSE_RECORDS] Starting record parsing")
 
-        header_row = self.find_header_row()
-        print(f"[PARSE_RECORDS] Header row identified: {header_row}")
+        records = list(self.iter_records())
+
+        print(f"[PARSE_RECORDS] Parsing complete. Total records parsed: {len(records)}")
+        return records
+
+    def parse_batch(self) -> RecordBatch:
+        """Parse all pay records into a columnar RecordBatch without building a list of dicts"""
+        print(f"[PARSE_BATCH] Starting record parsing")
+
+        batch = RecordBatch.from_records(self.iter_records())
 
-        # Get column mapping
-        print(f"[PARSE_RECORDS] Getting column mapping")
-        column_map = self._get_column_mapping(header_row)
-        print(f"[PARSE_RECORDS] Column mapping: {column_map}")
+        print(f"[PARSE_BATCH] Parsing complete. Total records parsed: {len(batch)}")
+        return batch
 
-        records = []
-        print(f"[PARSE_RECORDS] Initialized empty records list")
+    def iter_records(self) -> Iterator[Dict]:
+        """
+        Yield pay records one at a time
 
-        print(f"[PARSE_RECORDS] Starting row iteration from row {header_row + 1}")
+        The sheet is read in a single forward pass: header resolution, column
+        mapping and row parsing all consume the same row iterator. Rows seen
+        while looking for the header are buffered (at most HEADER_SEARCH_ROWS)
+        so they can be replayed when the header defaults to row 1. Every row up
+        to the sheet's real extent is read; umbrella workbooks are often
+        formatted hundreds of rows past the last pay line, so runs of blank rows
+        are skipped with one log line per run rather than one per row.
+        """
+        print(f"[ITER_RECORDS] Starting record iteration (engine={self.engine})")
 
-        for row_idx, row in enumerate(self.worksheet.iter_rows(min_row=header_row + 1), start=header_row + 1):
+        rows = self.worksheet.iter_rows(min_row=1, values_only=True)
+
+        if self.engine == ENGINE_XML:
+            # Header search needs every column
+            self.worksheet.project_columns(None)
+
+        lookahead, header_row, column_map = self._resolve_header(rows)
+
+        self.header_row = header_row
+        self.column_map = column_map
+        print(f"[ITER_RECORDS] Header row identified: {header_row}")
+        print(f"[ITER_RECORDS] Column mapping: {column_map}")
+
+        if self.engine == ENGINE_XML:
+            # From here on only mapped columns are decoded (column 0 is kept for
+            # the duplicate-header check)
+            self.worksheet.project_columns(set(column_map.values()) | {0})
+
+        # Nothing right of the last header cell is ever mapped, so don't carry it
+        width = self._header_width or None
+        print(f"[ITER_RECORDS] Keeping columns up to width={width}")
+
+        record_count = 0
+        self.blank_rows = 0
+        empty_run = 0
+
+        print(f"[ITER_RECORDS] Starting row iteration from row {header_row + 1}")
+
+        # Replay anything buffered past the header, then carry on with the same iterator
+        data_rows = itertools.chain(lookahead[header_row:], rows)
+        for row_idx, row in enumerate(data_rows, start=header_row + 1):
             row_number = row_idx
-            print(f"[PARSE_RECORDS] Processing row {row_idx}, row_number={row_number}")
+            row = row[:width]
 
-            # Skip empty rows
-            is_empty = all(cell.value is None or str(cell.value).strip() == '' for cell in row)
-            print(f"[PARSE_RECORDS] Row {row_idx} is_empty={is_empty}")
-            if is_empty:
-                print(f"[PARSE_RECORDS] Skipping empty row {row_idx}")
+            # Skip empty rows (styled trailing rows included) without stopping -
+            # data after a gap is still read
+            if self._is_empty_row(row):
+                empty_run += 1
+                self.blank_rows += 1
                 continue
+            if empty_run:
+                print(f"[ITER_RECORDS] Skipped {empty_run} empty rows before row {row_idx}")
+                empty_run = 0
+
+            print(f"[ITER_RECORDS] Processing row {row_idx}, row_number={row_number}")
 
             # Check if this is a duplicate header row
-            first_cell = str(row[0].value or '').lower()
-            print(f"[PARSE_RECORDS] Row {row_idx} first cell: {first_cell}")
+            first_cell = str(row[0] or '').lower()
+            print(f"[ITER_RECORDS] Row {row_idx} first cell: {first_cell}")
             if 'employee' in first_cell or 'surname' in first_cell:
-                print(f"[PARSE_RECORDS] Row {row_idx} is duplicate header, skipping")
+                print(f"[ITER_RECORDS] Row {row_idx} is duplicate header, skipping")
                 continue
 
             try:
-                print(f"[PARSE_RECORDS] Attempting to parse row {row_idx}")
+                print(f"[ITER_RECORDS] Attempting to parse row {row_idx}")
                 record = self._parse_row(row, column_map, row_number, row_idx)
-                print(f"[PARSE_RECORDS] Parsed record: {record}")
-
-                if record:
-                    print(f"[PARSE_RECORDS] Record is valid, appending to records list")
-                    records.append(record)
-                    print(f"[PARSE_RECORDS] Total records so far: {len(records)}")
-                else:
-                    print(f"[PARSE_RECORDS] Record is None, skipping")
+                print(f"[ITER_RECORDS] Parsed record: {record}")
             except Exception as e:
                 # Log parsing error but continue
-                print(f"[PARSE_RECORDS] ERROR parsing row {row_idx}: {type(e).__name__}: {str(e)}")
-                print(f"[PARSE_RECORDS] Continuing to next row")
+                print(f"[ITER_RECORDS] ERROR parsing row {row_idx}: {type(e).__name__}: {str(e)}")
+                print(f"[ITER_RECORDS] Continuing to next row")
                 continue
 
-        print(f"[PARSE_RECORDS] Parsing complete. Total records parsed: {len(records)}")
-        return records
+            if record:
+                record_count += 1
+                print(f"[ITER_RECORDS] Yielding record, total records so far: {record_count}")
+                yield record
+            else:
+                print(f"[ITER_RECORDS] Record is None, skipping")
+
+        if empty_run:
+            print(f"[ITER_RECORDS] Skipped {empty_run} trailing empty rows")
+        print(f"[ITER_RECORDS] Iteration complete. Total records yielded: {record_count}, empty rows skipped: {self.blank_rows}")
+
+    def _resolve_header(self, rows):
+        """
+        Find the header row and column map, consuming rows from the front of the sheet
+
+        If the umbrella has a cached header profile, only the row at the profile's
+        header_row is read and fingerprinted. Full discovery runs when there is
+        no profile or the fingerprint no longer matches; the result is recorded
+        back into the registry (a mismatch is reported as drift).
+
+        Returns:
+            (buffered rows, header row index, column map)
+        """
+        umbrella_code = extract_umbrella_code(self.filename) if self.filename else None
+        profile = self.header_profiles.get(umbrella_code)
+        print(f"[RESOLVE_HEADER] umbrella_code={umbrella_code}, cached profile={profile}")
+
+        lookahead = []
+
+        if profile:
+            # Fast path - O(columns) check of a single row
+            for row in rows:
+                lookahead.append(row)
+                if len(lookahead) >= profile['header_row']:
+                    break
+
+            if len(lookahead) == profile['header_row'] and self.header_profiles.verify(umbrella_code, lookahead[-1]):
+                self._header_width = profile['header_width']
+                self.header_profile_status = PROFILE_HIT
+                print(f"[RESOLVE_HEADER] Header profile hit, skipping discovery")
+                return lookahead, profile['header_row'], dict(profile['column_map'])
+
+            print(f"[RESOLVE_HEADER] Header profile mismatch, running full discovery")
+
+        # Full discovery - check anything already buffered, then read on up to the search window
+        header_row = None
+        print(f"[RESOLVE_HEADER] Searching for header in rows 1-{HEADER_SEARCH_ROWS}")
+        for row_idx, row in enumerate(lookahead, start=1):
+            if self._is_header_row(row):
+                header_row = row_idx
+                break
+
+        while header_row is None and len(lookahead) < HEADER_SEARCH_ROWS:
+            row = next(rows, None)
+            if row is None:
+                break
+            lookahead.append(row)
+            if self._is_header_row(row):
+                header_row = len(lookahead)
+
+        if header_row is None:
+            print(f"[RESOLVE_HEADER] No header row found, defaulting to row 1")
+            header_values = lookahead[0] if lookahead else ()
+            return lookahead, 1, self._map_headers(header_values)
+
+        print(f"[RESOLVE_HEADER] Found header row at index {header_row}")
+        header_values = lookahead[header_row - 1]
+        column_map = self._map_headers(header_values)
+
+        self.header_profile_status = self.header_profiles.record(
+            umbrella_code, header_row, header_values, column_map, self._header_width
+        )
+        print(f"[RESOLVE_HEADER] Header profile status: {self.header_profile_status}")
+
+        return lookahead, header_row, column_map
+
+    @staticmethod
+    def _is_empty_row(row) -> bool:
+        """Check if a row of cell values has no content"""
+        return all(value is None or str(value).strip() == '' for value in row)
 
     def _get_column_mapping(self, header_row: int) -> Dict[str, int]:
         """Map column names to their indices"""
         print(f"[GET_COLUMN_MAPPING] Starting column mapping for header_row={header_row}")
 
-        headers = []
         print(f"[GET_COLUMN_MAPPING] Reading headers from row {header_row}")
-        for idx, cell in enumerate(self.worksheet[header_row]):
-            header_text = str(cell.value or '').lower().strip()
+        header_values = next(
+            self.worksheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True),
+            ()
+        )
+        return self._map_headers(header_values)
+
+    def _map_headers(self, header_values) -> Dict[str, int]:
+        """Map a row of header cell values to standard column names"""
+        headers = []
+        for idx, value in enumerate(header_values):
+            header_text = str(value or '').lower().strip()
             print(f"[GET_COLUMN_MAPPING] Column {idx}: '{header_text}'")
             headers.append(header_text)
 
         print(f"[GET_COLUMN_MAPPING] All headers: {headers}")
 
+        # Width of the header = index of the last non-blank header cell + 1
+        self._header_width = max((idx + 1 for idx, header in enumerate(headers) if header), default=0)
+        print(f"[GET_COLUMN_MAPPING] Header width: {self._header_width}")
+
         # Map common variations to standard names
         column_map = {}
         print(f"[GET_COLUMN_MAPPING] Mapping headers to standard names")
@@ -194,7 +514,7 @@ class PayFileParser:
         return column_map
 
     def _parse_row(self, row, column_map: Dict[str, int], row_number: int, row_idx: int) -> Optional[Dict]:
-        """Parse a single row into a pay record"""
+        """Parse a single row of cell values into a pay record"""
         print(f"[PARSE_ROW] Starting row parse for row_number={row_number}, row_idx={row_idx}")
 
         def get_cell_value(col_name: str, default=None):
@@ -212,7 +532,7 @@ class PayFileParser:
                 print(f"[PARSE_ROW_GET_CELL] Index {idx} >= row length {len(row)}, returning default")
                 return default
 
-            value = row[idx].value
+            value = row[idx]
             print(f"[PARSE_ROW_GET_CELL] Cell value: {value}")
             result = value if value is not None else default
             print(f"[PARSE_ROW_GET_CELL] Returning: {result}")
@@ -244,15 +564,15 @@ class PayFileParser:
         print(f"[PARSE_ROW] unit_days={unit_days}")
 
         print(f"[PARSE_ROW] Getting day_rate")
-        day_rate = self._parse_decimal(get_cell_value('rate', 0))
+        day_rate = Money.parse(get_cell_value('rate', 0))
         print(f"[PARSE_ROW] day_rate={day_rate}")
 
         print(f"[PARSE_ROW] Getting amount")
-        amount = self._parse_decimal(get_cell_value('amount', 0))
+        amount = Money.parse(get_cell_value('amount', 0))
         print(f"[PARSE_ROW] amount={amount}")
 
         print(f"[PARSE_ROW] Getting vat_amount")
-        vat_amount = self._parse_decimal(get_cell_value('vat', 0))
+        vat_amount = Money.parse(get_cell_value('vat', 0))
         print(f"[PARSE_ROW] vat_amount={vat_amount}")
 
         print(f"[PARSE_ROW] Getting total_hours")
@@ -297,10 +617,10 @@ class PayFileParser:
             'surname': surname,
             'forename': forename,
             'unit_days': float(unit_days),
-            'day_rate': float(day_rate),
-            'amount': float(amount),
-            'vat_amount': float(vat_amount),
-            'gross_amount': float(gross_amount),
+            'day_rate': day_rate,
+            'amount': amount,
+            'vat_amount': vat_amount,
+            'gross_amount': gross_amount,
             'total_hours': final_total_hours,
             'record_type': record_type,
             'notes': notes,
@@ -352,54 +672,13 @@ class PayFileParser:
 
     def _extract_umbrella_code(self) -> Optional[str]:
         """Extract umbrella company code from filename"""
-        filename = self.file_path.split('/')[-1]
-        print(f"[EXTRACT_UMBRELLA_CODE] Extracted filename: {filename}")
-
-        umbrella_patterns = {
-            'NASA': r'NASA',
-            'PAYSTREAM': r'PAYSTREAM',
-            'PARASOL': r'Parasol',
-            'CLARITY': r'Clarity',
-            'GIANT': r'GIANT',
-            'WORKWELL': r'WORKWELL'
-        }
-        print(f"[EXTRACT_UMBRELLA_CODE] Umbrella patterns: {umbrella_patterns}")
-
-        umbrella_code = None
-        print(f"[EXTRACT_UMBRELLA_CODE] Searching for umbrella company in filename")
-        for code, pattern in umbrella_patterns.items():
-            print(f"[EXTRACT_UMBRELLA_CODE] Checking pattern '{pattern}' for code '{code}'")
-            if re.search(pattern, filename, re.IGNORECASE):
-                print(f"[EXTRACT_UMBRELLA_CODE] Match found! Setting umbrella_code={code}")
-                umbrella_code = code
-                break
-
-        if umbrella_code is None:
-            print(f"[EXTRACT_UMBRELLA_CODE] No umbrella company match found")
-        else:
-            print(f"[EXTRACT_UMBRELLA_CODE] Final umbrella_code={umbrella_code}")
-
-        return umbrella_code
+        print(f"[EXTRACT_UMBRELLA_CODE] Using filename: {self.filename}")
+        return extract_umbrella_code(self.filename)
 
     def _extract_submission_date(self) -> Optional[str]:
         """Extract submission date from filename (DDMMYYYY format)"""
-        filename = self.file_path.split('/')[-1]
-        print(f"[EXTRACT_SUBMISSION_DATE] Extracted filename: {filename}")
-
-        print(f"[EXTRACT_SUBMISSION_DATE] Searching for date in filename (DDMMYYYY format)")
-        date_match = re.search(r'(\d{8})', filename)
-        print(f"[EXTRACT_SUBMISSION_DATE] Date regex match result: {date_match}")
-
-        submission_date = None
-        if date_match:
-            date_str = date_match.group(1)
-            print(f"[EXTRACT_SUBMISSION_DATE] Extracted date string: {date_str}")
-            submission_date = date_str
-            print(f"[EXTRACT_SUBMISSION_DATE] Parsed submission_date: {submission_date}")
-        else:
-            print(f"[EXTRACT_SUBMISSION_DATE] No date found in filename")
-
-        return submission_date
+        print(f"[EXTRACT_SUBMISSION_DATE] Using filename: {self.filename}")
+        return extract_submission_date(self.filename)
 
     def __enter__(self):
         """Context manager entry"""
@@ -418,4 +697,95 @@ class PayFileParser:
         self.workbook.close()
         print(f"[CLOSE] Workbook closed")
 
+
+def extract_umbrella_code(text: str) -> Optional[str]:
+    """Extract umbrella company code from a filename (or any other text naming the umbrella)"""
+    print(f"[EXTRACT_UMBRELLA_CODE] Umbrella patterns: {UMBRELLA_PATTERNS}")
+
+    umbrella_code = None
+    print(f"[EXTRACT_UMBRELLA_CODE] Searching for umbrella company in '{text}'")
+    for code, pattern in UMBRELLA_PATTERNS.items():
+        print(f"[EXTRACT_UMBRELLA_CODE] Checking pattern '{pattern}' for code '{code}'")
+        if re.search(pattern, text or '', re.IGNORECASE):
+            print(f"[EXTRACT_UMBRELLA_CODE] Match found! Setting umbrella_code={code}")
+            umbrella_code = code
+            break
+
+    if umbrella_code is None:
+        print(f"[EXTRACT_UMBRELLA_CODE] No umbrella company match found")
+    else:
+        print(f"[EXTRACT_UMBRELLA_CODE] Final umbrella_code={umbrella_code}")
+
+    return umbrella_code
+
+
+def extract_submission_date(filename: str) -> Optional[str]:
+    """Extract submission date from a filename (DDMMYYYY format)"""
+    print(f"[EXTRACT_SUBMISSION_DATE] Searching for date in filename (DDMMYYYY format)")
+    date_match = re.search(r'(\d{8})', filename or '')
+    print(f"[EXTRACT_SUBMISSION_DATE] Date regex match result: {date_match}")
+
+    submission_date = None
+    if date_match:
+        date_str = date_match.group(1)
+        print(f"[EXTRACT_SUBMISSION_DATE] Extracted date string: {date_str}")
+        submission_date = date_str
+        print(f"[EXTRACT_SUBMISSION_DATE] Parsed submission_date: {submission_date}")
+    else:
+        print(f"[EXTRACT_SUBMISSION_DATE] No date found in filename")
+
+    return submission_date
+
+
+def resolve_filename_metadata(*names: Optional[str]) -> Optional[Dict]:
+    """
+    Resolve pay file metadata from filenames alone, without opening the workbook
+
+    Args:
+        names: Candidate names in order of preference (e.g. OriginalFilename, S3Key)
+
+    Returns:
+        Same shape as PayFileParser.extract_metadata(), or None if no candidate
+        yields both an umbrella code and a submission date
+    """
+    print(f"[RESOLVE_FILENAME_METADATA] Called with names={names}")
+
+    for name in names:
+        if not name:
+            continue
+
+        filename = name.split('/')[-1]
+        umbrella_code = extract_umbrella_code(filename)
+        submission_date = extract_submission_date(filename)
+
+        if umbrella_code and submission_date:
+            metadata = {
+                'filename': filename,
+                'umbrella_code': umbrella_code,
+                'submission_date': submission_date
+            }
+            print(f"[RESOLVE_FILENAME_METADATA] Resolved from '{name}': {metadata}")
+            return metadata
+
+        print(f"[RESOLVE_FILENAME_METADATA] '{name}' not resolvable (umbrella_code={umbrella_code}, submission_date={submission_date})")
+
+    print(f"[RESOLVE_FILENAME_METADATA] No candidate resolved")
+    return None
+
+
+def umbrella_code_from_records(records: List[Dict]) -> Optional[str]:
+    """Infer the umbrella code from the company column of parsed records"""
+    print(f"[UMBRELLA_CODE_FROM_RECORDS] Checking company column of {len(records)} records")
+
+    for record in records:
+        company = record.get('company')
+        if company:
+            umbrella_code = extract_umbrella_code(company)
+            if umbrella_code:
+                print(f"[UMBRELLA_CODE_FROM_RECORDS] Company '{company}' -> {umbrella_code}")
+                return umbrella_code
+
+    print(f"[UMBRELLA_CODE_FROM_RECORDS] No umbrella found in company column")
+    return None
+
 print("[EXCEL_PARSER_MODULE] excel_parser.py module load complete")
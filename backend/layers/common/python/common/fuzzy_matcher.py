@@ -5,30 +5,212 @@ Uses Levenshtein distance to handle typos and variations
 
 print("[FUZZY_MATCHER_MODULE] Starting fuzzy_matcher.py module load")
 
+import logging
+import re
 from typing import Dict, List, Optional, Tuple
 
-print("[FUZZY_MATCHER_MODULE] Imported typing modules")
+print("[FUZZY_MATCHER_MODULE] Imported logging, re, typing modules")
+
+# Degraded-path warnings go through logging so they reach CloudWatch at
+# WARNING level rather than as another trace line
+logger = logging.getLogger(__name__)
 
 from fuzzywuzzy import fuzz
 
 print("[FUZZY_MATCHER_MODULE] Imported fuzzywuzzy")
 
+from .name_blocking import BLOCKING_MIN_CANDIDATES, BLOCKING_NGRAM_SIZE, BlockingIndex
+
+print("[FUZZY_MATCHER_MODULE] Imported name_blocking")
+
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz
+    from rapidfuzz import process as rapidfuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# cdist returns a numpy matrix; without numpy match_many falls back to one
+# extractOne per name
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    numpy = None
+    NUMPY_AVAILABLE = False
+
+print(f"[FUZZY_MATCHER_MODULE] RAPIDFUZZ_AVAILABLE={RAPIDFUZZ_AVAILABLE}, NUMPY_AVAILABLE={NUMPY_AVAILABLE}")
+
+# Match engines
+# - fuzzywuzzy: the original loop, one fuzz.ratio call per candidate
+# - rapidfuzz: exact matches from a dict, fuzzy ones from one rapidfuzz
+#   extractOne call over the pre-normalised names. Same scores: with
+#   python-Levenshtein installed (as in the Lambda layer) fuzzywuzzy's ratio is
+#   round(100 * Indel similarity), which is rapidfuzz's fuzz.ratio rounded
+MATCH_ENGINE_FUZZYWUZZY = 'fuzzywuzzy'
+MATCH_ENGINE_RAPIDFUZZ = 'rapidfuzz'
+MATCH_ENGINES = (MATCH_ENGINE_FUZZYWUZZY, MATCH_ENGINE_RAPIDFUZZ)
+DEFAULT_MATCH_ENGINE = MATCH_ENGINE_RAPIDFUZZ if RAPIDFUZZ_AVAILABLE else MATCH_ENGINE_FUZZYWUZZY
+
+# Upper bound on names x candidates scored per cdist call (float64 cells),
+# so a large file against a large registry is scored in row chunks
+MATCH_MANY_MAX_CELLS = 4_000_000
+
+print(f"[FUZZY_MATCHER_MODULE] DEFAULT_MATCH_ENGINE={DEFAULT_MATCH_ENGINE}, MATCH_MANY_MAX_CELLS={MATCH_MANY_MAX_CELLS}")
+
+# Match types
+# - EXACT: same normalised name, or the same once a leading honorific is dropped
+# - SWAPPED: same name parts in a different order (surname first)
+# - FUZZY: best score at or above the threshold
+MATCH_TYPE_EXACT = 'EXACT'
+MATCH_TYPE_SWAPPED = 'SWAPPED'
+MATCH_TYPE_FUZZY = 'FUZZY'
+
+# Leading titles ignored by the exact-match keys ('Dr. Jane Smith' is 'jane smith')
+HONORIFICS = frozenset({
+    'mr', 'mrs', 'ms', 'miss', 'mx', 'dr', 'prof', 'sir', 'dame', 'lord', 'lady', 'rev', 'revd'
+})
+
+print(f"[FUZZY_MATCHER_MODULE] HONORIFICS={sorted(HONORIFICS)}")
+
+
+def _name_parts(name: str) -> List[str]:
+    """Lowercased name parts without punctuation or leading honorifics"""
+    parts = re.sub(r'[^a-z0-9\s]', '', name.lower()).split()
+    while len(parts) > 1 and parts[0] in HONORIFICS:
+        parts.pop(0)
+    return parts
+
+
+def name_keys(name: str) -> Tuple[str, str]:
+    """
+    Exact-match keys for a name
+
+    Returns:
+        (plain, swapped): the name without honorifics, and its parts sorted,
+        which is the same for 'Jonathan Mays' and 'Mays Jonathan'
+    """
+    parts = _name_parts(name)
+    return ' '.join(parts), ' '.join(sorted(parts))
+
+
+class CandidateIndex:
+    """
+    Contractor set prepared once for repeated matching
+
+    Holds the lowercased name of every candidate, in order, for scoring, plus
+    hash indexes from name to the first candidate with it: the name itself,
+    the name without honorifics and its sorted parts (first/last swaps). Build
+    one per contractor snapshot and pass it to find_best_match instead of the
+    list, so exact names resolve without scoring anything.
+
+    Registries of BLOCKING_MIN_CANDIDATES or more also get a BlockingIndex, and
+    fuzzy scoring only looks at the block of candidates alike in forename and
+    surname. blocking=True/False forces it on or off; ngram_size tunes recall.
+    """
+
+    def __init__(self, candidates: List[Dict], name_field: str = 'NormalizedName',
+                 blocking: Optional[bool] = None, ngram_size: int = BLOCKING_NGRAM_SIZE):
+        self.candidates = list(candidates)
+        self.name_field = name_field
+        self.names = [(candidate.get(name_field) or '').lower() for candidate in self.candidates]
+        self.exact = {}
+        self.plain = {}
+        self.swapped = {}
+        for idx, name in enumerate(self.names):
+            self.exact.setdefault(name, idx)
+            plain, swapped = name_keys(name)
+            if plain:
+                self.plain.setdefault(plain, idx)
+                self.swapped.setdefault(swapped, idx)
+
+        if blocking is None:
+            blocking = len(self.candidates) >= BLOCKING_MIN_CANDIDATES
+        self.blocking = BlockingIndex(self.names, ngram_size) if blocking else None
+        print(f"[CANDIDATE_INDEX] Indexed {len(self.candidates)} candidates on '{name_field}', blocking={bool(blocking)}")
+
+    def block(self, search_normalized: str) -> Optional[List[int]]:
+        """Candidate positions to score for a name, or None to score them all"""
+        if self.blocking is None:
+            return None
+        positions = self.blocking.candidates(search_normalized)
+        print(f"[CANDIDATE_INDEX] Block of {len(positions)}/{len(self.candidates)} candidates for '{search_normalized}'")
+        return positions
+
+    def lookup(self, search_normalized: str) -> Optional[Tuple[int, str]]:
+        """
+        Exact match for a normalised name without scoring
+
+        Returns:
+            (candidate position, match type) or None if fuzzy scoring is needed
+        """
+        idx = self.exact.get(search_normalized)
+        if idx is not None:
+            return idx, MATCH_TYPE_EXACT
+        plain, swapped = name_keys(search_normalized)
+        if not plain:
+            return None
+        # A candidate named exactly that beats one that also carries a title
+        idx = self.exact.get(plain, self.plain.get(plain))
+        if idx is not None:
+            return idx, MATCH_TYPE_EXACT
+        idx = self.swapped.get(swapped)
+        if idx is not None:
+            return idx, MATCH_TYPE_SWAPPED
+        return None
+
+    def match(self, search_name: str, search_normalized: str) -> Optional[Dict]:
+        """lookup() as a find_best_match result"""
+        found = self.lookup(search_normalized)
+        if found is None:
+            return None
+        idx, match_type = found
+        print(f"[CANDIDATE_INDEX] {match_type} MATCH FOUND at candidate {idx}")
+        candidate = self.candidates[idx]
+        return {
+            'match_type': match_type,
+            'contractor': candidate,
+            'confidence': 100,
+            'searched_name': search_name,
+            'matched_name': candidate.get(self.name_field, '')
+        }
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def __iter__(self):
+        return iter(self.candidates)
+
 
 class FuzzyMatcher:
     """Fuzzy string matching for contractor names"""
 
-    def __init__(self, threshold: int = 75):
+    def __init__(self, threshold: int = 75, engine: Optional[str] = None):
         """
         Initialize fuzzy matcher
 
         Args:
             threshold: Minimum similarity score (0-100) to consider a match
+            engine: 'rapidfuzz' or 'fuzzywuzzy' (default: rapidfuzz when installed)
         """
-        print(f"[FUZZYMATCHER_INIT] Starting FuzzyMatcher initialization with threshold={threshold}")
+        print(f"[FUZZYMATCHER_INIT] Starting FuzzyMatcher initialization with threshold={threshold}, engine={engine}")
         self.threshold = threshold
         print(f"[FUZZYMATCHER_INIT] Set self.threshold={self.threshold}")
+
+        engine = engine or DEFAULT_MATCH_ENGINE
+        if engine not in MATCH_ENGINES:
+            raise ValueError(f"Unknown match engine '{engine}', expected one of {MATCH_ENGINES}")
+        if engine == MATCH_ENGINE_RAPIDFUZZ and not RAPIDFUZZ_AVAILABLE:
+            raise ValueError("Match engine 'rapidfuzz' requested but rapidfuzz is not installed")
+        self.engine = engine
+        print(f"[FUZZYMATCHER_INIT] Set self.engine={self.engine}")
         print(f"[FUZZYMATCHER_INIT] FuzzyMatcher initialization complete")
 
+    def index(self, candidates: List[Dict], name_field: str = 'NormalizedName',
+              blocking: Optional[bool] = None, ngram_size: int = BLOCKING_NGRAM_SIZE) -> CandidateIndex:
+        """Prepare a contractor set for repeated find_best_match calls"""
+        return CandidateIndex(candidates, name_field, blocking, ngram_size)
+
     def find_best_match(
         self,
         search_name: str,
@@ -40,8 +222,10 @@ class FuzzyMatcher:
 
         Args:
             search_name: Name to search for (will be normalized)
-            candidate_names: List of contractor dicts with name fields
-            name_field: Field name containing the normalized name
+            candidate_names: List of contractor dicts with name fields, or a
+                             CandidateIndex from index()
+            name_field: Field name containing the normalized name (taken from
+                        the index when one is passed)
 
         Returns:
             Dict with match info or None if no match found
@@ -56,31 +240,34 @@ class FuzzyMatcher:
         search_normalized = self.normalize_name(search_name)
         print(f"[FIND_BEST_MATCH] Normalized search_name: {search_normalized}")
 
+        # Exact names (and honorific/swapped forms) come from the hash index;
+        # only misses are scored
+        if not isinstance(candidate_names, CandidateIndex):
+            candidate_names = CandidateIndex(candidate_names, name_field)
+        exact_match = candidate_names.match(search_name, search_normalized)
+        if exact_match:
+            return exact_match
+
+        if self.engine == MATCH_ENGINE_RAPIDFUZZ:
+            return self._find_best_match_indexed(search_name, search_normalized, candidate_names)
+
+        name_field = candidate_names.name_field
+        positions = candidate_names.block(search_normalized)
+        candidates = candidate_names.candidates if positions is None else [
+            candidate_names.candidates[position] for position in positions
+        ]
+
         best_match = None
         best_score = 0
         print(f"[FIND_BEST_MATCH] Initialized best_match=None, best_score=0")
 
-        print(f"[FIND_BEST_MATCH] Iterating through {len(candidate_names)} candidates")
-        for idx, candidate in enumerate(candidate_names):
-            print(f"[FIND_BEST_MATCH] Processing candidate {idx+1}/{len(candidate_names)}: {candidate}")
+        print(f"[FIND_BEST_MATCH] Iterating through {len(candidates)} candidates")
+        for idx, candidate in enumerate(candidates):
+            print(f"[FIND_BEST_MATCH] Processing candidate {idx+1}/{len(candidates)}: {candidate}")
 
             candidate_name = candidate.get(name_field, '')
             print(f"[FIND_BEST_MATCH] Candidate name from field '{name_field}': {candidate_name}")
 
-            # Try exact match first
-            print(f"[FIND_BEST_MATCH] Checking for exact match")
-            if search_normalized == candidate_name.lower():
-                print(f"[FIND_BEST_MATCH] EXACT MATCH FOUND!")
-                result = {
-                    'match_type': 'EXACT',
-                    'contractor': candidate,
-                    'confidence': 100,
-                    'searched_name': search_name,
-                    'matched_name': candidate_name
-                }
-                print(f"[FIND_BEST_MATCH] Returning exact match result: {result}")
-                return result
-
             # Calculate fuzzy score
             print(f"[FIND_BEST_MATCH] Calculating fuzzy score for '{search_normalized}' vs '{candidate_name.lower()}'")
             score = fuzz.ratio(search_normalized, candidate_name.lower())
@@ -99,7 +286,7 @@ class FuzzyMatcher:
         if best_score >= self.threshold:
             print(f"[FIND_BEST_MATCH] best_score ({best_score}) >= threshold ({self.threshold}), FUZZY MATCH FOUND")
             result = {
-                'match_type': 'FUZZY',
+                'match_type': MATCH_TYPE_FUZZY,
                 'contractor': best_match,
                 'confidence': best_score,
                 'searched_name': search_name,
@@ -112,6 +299,150 @@ class FuzzyMatcher:
         print(f"[FIND_BEST_MATCH] Returning None")
         return None
 
+    def _find_best_match_indexed(self, search_name: str, search_normalized: str,
+                                 index: CandidateIndex) -> Optional[Dict]:
+        """
+        find_best_match over a CandidateIndex with rapidfuzz
+
+        Called for names the index has no exact match for. Gives the same
+        result as the loop: the first candidate (in list order) with the
+        highest integer score.
+        """
+        positions = index.block(search_normalized)
+        names = index.names if positions is None else [index.names[position] for position in positions]
+
+        best = rapidfuzz_process.extractOne(search_normalized, names,
+                                            scorer=rapidfuzz_fuzz.ratio, processor=None)
+        # fuzzywuzzy rounds its scores with round(); candidates are compared on that
+        best_score = int(round(best[1])) if best else 0
+        print(f"[FIND_BEST_MATCH] rapidfuzz best_score={best_score}, threshold={self.threshold}")
+
+        if not best_score or best_score < self.threshold:
+            print(f"[FIND_BEST_MATCH] best_score ({best_score}) < threshold ({self.threshold}), NO MATCH")
+            return None
+
+        # extractOne picks the highest unrounded score; the loop kept the first
+        # candidate reaching the best rounded score, which may come earlier
+        best_idx = best[2]
+        for _, score, idx in rapidfuzz_process.extract_iter(
+                search_normalized, names, scorer=rapidfuzz_fuzz.ratio,
+                processor=None, score_cutoff=best_score - 0.5):
+            if idx >= best_idx:
+                break
+            if int(round(score)) == best_score:
+                best_idx = idx
+                break
+        if positions is not None:
+            best_idx = positions[best_idx]
+
+        best_match = index.candidates[best_idx]
+        print(f"[FIND_BEST_MATCH] FUZZY MATCH FOUND at candidate {best_idx} with score {best_score}")
+        return {
+            'match_type': MATCH_TYPE_FUZZY,
+            'contractor': best_match,
+            'confidence': best_score,
+            'searched_name': search_name,
+            'matched_name': best_match.get(index.name_field, '')
+        }
+
+    def match_many(
+        self,
+        names: List[str],
+        candidate_names,
+        name_field: str = 'NormalizedName',
+        workers: int = -1
+    ) -> List[Optional[Dict]]:
+        """
+        Find the best match for every name in one batch
+
+        Exact names are looked up in the index. The rest are scored in one
+        rapidfuzz cdist call per chunk of rows, spread over `workers` threads
+        (-1 = all cores). A blocked index scores the union of the names'
+        blocks and masks each row down to its own block, so results match
+        find_best_match. Without numpy or with the fuzzywuzzy engine each
+        name is matched on its own.
+
+        Args:
+            names: Names to search for (each will be normalized)
+            candidate_names: List of contractor dicts, or a CandidateIndex
+            name_field: Field name containing the normalized name
+            workers: cdist worker threads
+
+        Returns:
+            One find_best_match result (dict or None) per name, in order
+        """
+        print(f"[MATCH_MANY] Called with {len(names)} names, {len(candidate_names)} candidates, engine={self.engine}")
+
+        if not isinstance(candidate_names, CandidateIndex):
+            candidate_names = CandidateIndex(candidate_names, name_field)
+        index = candidate_names
+
+        if self.engine == MATCH_ENGINE_RAPIDFUZZ and not NUMPY_AVAILABLE and index:
+            logger.warning("numpy is not installed; match_many is matching %d names one at a time "
+                           "instead of with cdist", len(names))
+        if self.engine != MATCH_ENGINE_RAPIDFUZZ or not NUMPY_AVAILABLE or not index:
+            print(f"[MATCH_MANY] No cdist (engine={self.engine}, numpy={NUMPY_AVAILABLE}), matching per name")
+            return [self.find_best_match(name, index) for name in names]
+
+        results = [None] * len(names)
+        pending = []
+        for row, name in enumerate(names):
+            normalized = self.normalize_name(name)
+            exact_match = index.match(name, normalized)
+            if exact_match:
+                results[row] = exact_match
+            else:
+                pending.append((row, name, normalized))
+        print(f"[MATCH_MANY] {len(names) - len(pending)} exact, {len(pending)} to score")
+
+        # Columns scored: every candidate, or the union of the pending names'
+        # blocks (in list order, so argmax still takes the first best candidate)
+        blocks = None
+        columns = list(range(len(index)))
+        if index.blocking is not None and pending:
+            blocks = [index.block(normalized) for _, _, normalized in pending]
+            columns = sorted(set().union(*blocks))
+            print(f"[MATCH_MANY] Scoring the union of {len(blocks)} blocks: {len(columns)}/{len(index)} candidates")
+        if not columns:
+            print(f"[MATCH_MANY] Matched {sum(result is not None for result in results)}/{len(names)} names")
+            return results
+        column_names = [index.names[position] for position in columns]
+        column_of = {position: column for column, position in enumerate(columns)}
+
+        chunk_rows = max(1, MATCH_MANY_MAX_CELLS // len(columns))
+        for start in range(0, len(pending), chunk_rows):
+            chunk = pending[start:start + chunk_rows]
+            scores = rapidfuzz_process.cdist(
+                [normalized for _, _, normalized in chunk], column_names,
+                scorer=rapidfuzz_fuzz.ratio, processor=None,
+                dtype=numpy.float64, workers=workers
+            )
+            # Integer scores as fuzzywuzzy gives them (round half to even, like
+            # round()); argmax takes the first candidate with the best one
+            rounded = numpy.rint(scores)
+            if blocks is not None:
+                # Candidates outside a name's own block can't win for it
+                in_block = numpy.zeros(rounded.shape, dtype=bool)
+                for offset, block in enumerate(blocks[start:start + chunk_rows]):
+                    in_block[offset, [column_of[position] for position in block]] = True
+                rounded[~in_block] = -1
+            best_columns = rounded.argmax(axis=1)
+            for (row, name, _), best_column, row_scores in zip(chunk, best_columns, rounded):
+                best_score = int(row_scores[best_column])
+                if best_score <= 0 or best_score < self.threshold:
+                    continue
+                best_match = index.candidates[columns[int(best_column)]]
+                results[row] = {
+                    'match_type': MATCH_TYPE_FUZZY,
+                    'contractor': best_match,
+                    'confidence': best_score,
+                    'searched_name': name,
+                    'matched_name': best_match.get(index.name_field, '')
+                }
+
+        print(f"[MATCH_MANY] Matched {sum(result is not None for result in results)}/{len(names)} names")
+        return results
+
     def match_contractor_name(
         self,
         first_name: str,
@@ -190,8 +521,11 @@ class FuzzyMatcher:
         normalized2 = self.normalize_name(name2)
         print(f"[CALCULATE_SIMILARITY] normalized2={normalized2}")
 
-        print(f"[CALCULATE_SIMILARITY] Calculating fuzz.ratio")
-        score = fuzz.ratio(normalized1, normalized2)
+        print(f"[CALCULATE_SIMILARITY] Calculating ratio with engine={self.engine}")
+        if self.engine == MATCH_ENGINE_RAPIDFUZZ:
+            score = 100 if normalized1 == normalized2 else int(round(rapidfuzz_fuzz.ratio(normalized1, normalized2)))
+        else:
+            score = fuzz.ratio(normalized1, normalized2)
         print(f"[CALCULATE_SIMILARITY] Similarity score: {score}")
 
         return score
@@ -0,0 +1,130 @@
+"""
+Per-umbrella header profiles
+Remembers each umbrella's header layout so pay files can be checked against it
+instead of rediscovering the header on every file
+"""
+
+print("[HEADER_PROFILES_MODULE] Starting header_profiles.py module load")
+
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+print("[HEADER_PROFILES_MODULE] Imported hashlib, datetime, typing")
+
+# Outcome of checking a file against the registry
+PROFILE_HIT = 'HIT'        # header matched the cached profile, discovery skipped
+PROFILE_NEW = 'NEW'        # first file seen for this umbrella, profile created
+PROFILE_DRIFT = 'DRIFT'    # header no longer matches the cached profile, profile replaced
+
+print(f"[HEADER_PROFILES_MODULE] Profile outcomes: {PROFILE_HIT}, {PROFILE_NEW}, {PROFILE_DRIFT}")
+
+
+def header_fingerprint(header_values) -> str:
+    """
+    Fingerprint a header row
+
+    Cells are lowercased and trimmed, trailing blank cells are ignored, so
+    extra styled columns to the right don't count as a change.
+    """
+    headers = [str(value or '').lower().strip() for value in header_values]
+    while headers and not headers[-1]:
+        headers.pop()
+
+    return hashlib.sha1('|'.join(headers).encode('utf-8')).hexdigest()[:16]
+
+
+class HeaderProfileRegistry:
+    """
+    Header profiles keyed by umbrella code
+
+    A profile is {'fingerprint', 'header_row', 'column_map', 'header_width', 'updated_at'}.
+    Held in memory, so profiles persist for the life of a warm container.
+    """
+
+    def __init__(self):
+        print("[HEADER_PROFILE_REGISTRY_INIT] Starting initialization")
+
+        self.profiles: Dict[str, Dict] = {}
+        self.stats = {PROFILE_HIT: 0, PROFILE_NEW: 0, PROFILE_DRIFT: 0}
+        self.drift_events: List[Dict] = []
+
+        print("[HEADER_PROFILE_REGISTRY_INIT] Initialization complete")
+
+    def get(self, umbrella_code: Optional[str]) -> Optional[Dict]:
+        """Cached profile for an umbrella, if any"""
+        if not umbrella_code:
+            return None
+        return self.profiles.get(umbrella_code)
+
+    def verify(self, umbrella_code: Optional[str], header_values) -> Optional[Dict]:
+        """
+        Check a candidate header row against the umbrella's cached profile
+
+        Args:
+            umbrella_code: Umbrella the file belongs to
+            header_values: Cell values of the row at the profile's header_row
+
+        Returns:
+            The profile on a match, otherwise None
+        """
+        profile = self.get(umbrella_code)
+        if profile is None:
+            print(f"[HEADER_PROFILE_VERIFY] No profile for umbrella_code={umbrella_code}")
+            return None
+
+        fingerprint = header_fingerprint(header_values)
+        if fingerprint != profile['fingerprint']:
+            print(f"[HEADER_PROFILE_VERIFY] Fingerprint mismatch for {umbrella_code}: {fingerprint} != {profile['fingerprint']}")
+            return None
+
+        self.stats[PROFILE_HIT] += 1
+        print(f"[HEADER_PROFILE_VERIFY] Profile hit for {umbrella_code} (header_row={profile['header_row']})")
+        return profile
+
+    def record(self, umbrella_code: Optional[str], header_row: int, header_values,
+               column_map: Dict[str, int], header_width: int) -> Optional[str]:
+        """
+        Store the layout found by full header discovery
+
+        Returns:
+            PROFILE_NEW or PROFILE_DRIFT (None if there is no umbrella code)
+        """
+        if not umbrella_code:
+            print("[HEADER_PROFILE_RECORD] No umbrella code, profile not recorded")
+            return None
+
+        previous = self.profiles.get(umbrella_code)
+        fingerprint = header_fingerprint(header_values)
+
+        self.profiles[umbrella_code] = {
+            'fingerprint': fingerprint,
+            'header_row': header_row,
+            'column_map': dict(column_map),
+            'header_width': header_width,
+            'updated_at': datetime.utcnow().isoformat() + 'Z'
+        }
+
+        if previous is None:
+            self.stats[PROFILE_NEW] += 1
+            print(f"[HEADER_PROFILE_RECORD] New profile for {umbrella_code}: fingerprint={fingerprint}, header_row={header_row}")
+            return PROFILE_NEW
+
+        self.stats[PROFILE_DRIFT] += 1
+        event = {
+            'umbrella_code': umbrella_code,
+            'previous_fingerprint': previous['fingerprint'],
+            'fingerprint': fingerprint,
+            'previous_header_row': previous['header_row'],
+            'header_row': header_row,
+            'detected_at': self.profiles[umbrella_code]['updated_at']
+        }
+        self.drift_events.append(event)
+        print(f"[HEADER_PROFILE_RECORD] WARNING: Header drift for {umbrella_code}: {event}")
+        return PROFILE_DRIFT
+
+
+# Shared by every parser in this container
+default_registry = HeaderProfileRegistry()
+
+print("[HEADER_PROFILES_MODULE] header_profiles.py module load complete")
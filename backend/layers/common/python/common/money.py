@@ -0,0 +1,174 @@
+"""
+Money as integer pence
+One exact, compact representation shared by the parser, validators, import and reports
+"""
+
+print("[MONEY_MODULE] Starting money.py module load")
+
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Iterable
+
+print("[MONEY_MODULE] Imported math, Decimal, typing")
+
+PENCE_PER_POUND = 100
+_PENNY = Decimal('0.01')
+
+# Parsed record fields that hold money (unit_days and total_hours are quantities, not money)
+MONEY_FIELDS = ('day_rate', 'amount', 'vat_amount', 'gross_amount')
+
+print(f"[MONEY_MODULE] MONEY_FIELDS={MONEY_FIELDS}")
+
+
+def _round_half_up(value: Decimal) -> int:
+    """Decimal pence to whole pence, halves away from zero"""
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _float_to_pence(value: float) -> int:
+    """
+    Pounds as a float to pence without going through a string
+
+    Exact for any float written with up to 2dp. Values sitting on a half
+    penny (1.005, 2.675) take the Decimal(str()) route so they round the way
+    the written number does rather than its binary approximation.
+    """
+    scaled = value * PENCE_PER_POUND
+    nearest = round(scaled)
+    if abs(abs(scaled - nearest) - 0.5) < 1e-6:
+        return _round_half_up(Decimal(str(value)) * PENCE_PER_POUND)
+    return int(nearest)
+
+
+def _text_to_pence(text: str) -> int:
+    """'£1,234.5' / '-12' / '12.345' to pence; blank, '-' and junk are 0"""
+    text = text.strip().replace(',', '').replace('£', '')
+    if not text or text == '-':
+        return 0
+
+    whole, dot, fraction = text.partition('.')
+    sign = -1 if whole.startswith('-') else 1
+    digits = whole.lstrip('+-')
+    if (digits.isdigit() or (not digits and fraction)) and len(fraction) <= 2 and (not fraction or fraction.isdigit()):
+        return sign * (int(digits or 0) * PENCE_PER_POUND + int(fraction.ljust(2, '0')))
+
+    try:
+        return _round_half_up(Decimal(text) * PENCE_PER_POUND)
+    except (InvalidOperation, ValueError):
+        return 0
+
+
+class Money(int):
+    """
+    An amount of money in whole pence
+
+    Money is an int, so it is as compact as one and sums exactly. Adding,
+    subtracting or negating Money gives Money; multiplying by a rate goes
+    through scale(). Formats as pounds: f"£{m:.2f}" and str(m) give '9000.00'.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value) -> 'Money':
+        """
+        Money from a pounds value as it comes out of a pay file or DynamoDB
+
+        Args:
+            value: None, int/float pounds, Decimal, Money, or text such as '£1,234.50'
+
+        Returns:
+            Money, rounded half-up to the penny (unparseable values are 0, as
+            the parser has always treated them)
+        """
+        if isinstance(value, Money):
+            return value
+        if value is None or isinstance(value, bool):
+            return cls(0)
+        if isinstance(value, float):
+            if math.isnan(value) or math.isinf(value):
+                return cls(0)
+            return cls(_float_to_pence(value))
+        if isinstance(value, int):
+            return cls(value * PENCE_PER_POUND)
+        if isinstance(value, Decimal):
+            if not value.is_finite():
+                return cls(0)
+            return cls(_round_half_up(value * PENCE_PER_POUND))
+        return cls(_text_to_pence(str(value)))
+
+    @classmethod
+    def from_pence(cls, pence) -> 'Money':
+        """Money from a whole number of pence"""
+        return cls(pence)
+
+    @property
+    def pence(self) -> int:
+        return int(self)
+
+    @property
+    def pounds(self) -> float:
+        """Pounds as the nearest float (exact to the penny)"""
+        return int(self) / PENCE_PER_POUND
+
+    def to_decimal(self) -> Decimal:
+        """Pounds as a 2dp Decimal, e.g. for DynamoDB"""
+        return Decimal(int(self)).scaleb(-2)
+
+    def scale(self, factor) -> Decimal:
+        """
+        Multiply by a rate (VAT rate, overtime multiplier) without rounding
+
+        Returns:
+            Exact result in pence as a Decimal, for comparing against Money
+        """
+        if not isinstance(factor, Decimal):
+            factor = Decimal(str(factor))
+        return Decimal(int(self)) * factor
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Money(int(other) - int(self))
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-int(self))
+
+    def __abs__(self):
+        return Money(abs(int(self)))
+
+    def __format__(self, spec: str) -> str:
+        return format(self.to_decimal(), spec or 'f')
+
+    def __str__(self) -> str:
+        return format(self.to_decimal(), 'f')
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __reduce__(self):
+        return (Money, (int(self),))
+
+
+def pence_to_pounds(pence) -> Decimal:
+    """Decimal pence (e.g. from Money.scale) to pounds for messages"""
+    return Decimal(pence) / PENCE_PER_POUND
+
+
+def total(values: Iterable) -> Money:
+    """Exact sum of pounds values (floats, Decimals, text or Money)"""
+    return Money(sum(Money.parse(value) for value in values))
+
+print("[MONEY_MODULE] money.py module load complete")
@@ -0,0 +1,89 @@
+"""
+Learned name aliases
+Fuzzy name matches from accepted files, kept so the same misspelling from the
+same umbrella resolves by lookup next time instead of being scored again
+"""
+
+print("[NAME_ALIASES_MODULE] Starting name_aliases.py module load")
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+print("[NAME_ALIASES_MODULE] Imported datetime, typing")
+
+ALIAS_ENTITY_TYPE = 'NameAlias'
+
+# All aliases share one GSI1 partition (like ERRORS and WARNINGS), sorted by
+# umbrella then variant, so a file loads its umbrella's aliases in one query
+# and operators can list every alias for review
+ALIASES_GSI1PK = 'ALIASES'
+
+print(f"[NAME_ALIASES_MODULE] ALIAS_ENTITY_TYPE={ALIAS_ENTITY_TYPE}, ALIASES_GSI1PK={ALIASES_GSI1PK}")
+
+
+def alias_gsi1sk_prefix(umbrella_id: str) -> str:
+    """GSI1SK prefix of an umbrella's aliases"""
+    return f'UMBRELLA#{umbrella_id}#'
+
+
+def alias_item(variant: str, contractor: Dict, umbrella_id: str, confidence: int, file_id: str) -> Dict:
+    """
+    Alias item for a fuzzy match
+
+    Stored under the contractor (PK CONTRACTOR#id, SK ALIAS#umbrella#variant)
+    and on GSI2 as NAME#<variant>, next to the contractor's own NAME# entry.
+
+    Args:
+        variant: Normalised name as it appeared in the pay file
+        contractor: Contractor item it was matched to
+        umbrella_id: Umbrella whose file used the variant
+        confidence: Match score (0-100)
+        file_id: File the variant was first seen in
+
+    Returns:
+        Item ready for put_item
+    """
+    contractor_id = contractor['ContractorID']
+    return {
+        'PK': f'CONTRACTOR#{contractor_id}',
+        'SK': f'ALIAS#{umbrella_id}#{variant}',
+        'EntityType': ALIAS_ENTITY_TYPE,
+        'Variant': variant,
+        'ContractorID': contractor_id,
+        'MatchedName': contractor.get('NormalizedName', ''),
+        'UmbrellaID': umbrella_id,
+        'Confidence': int(confidence),
+        'FirstSeenFileID': file_id,
+        'FirstSeenAt': datetime.utcnow().isoformat() + 'Z',
+        'GSI1PK': ALIASES_GSI1PK,
+        'GSI1SK': f'{alias_gsi1sk_prefix(umbrella_id)}{variant}',
+        'GSI2PK': f'NAME#{variant}',
+        'GSI2SK': f'ALIAS#{umbrella_id}'
+    }
+
+
+class AliasTable:
+    """
+    Aliases keyed by (umbrella, variant) for O(1) lookup
+
+    If two items claim the same variant (two files learning it at once), the
+    one seen first wins.
+    """
+
+    def __init__(self, items: Iterable[Dict] = ()):
+        self._aliases = {}
+        for item in items:
+            key = (item.get('UmbrellaID'), item.get('Variant'))
+            current = self._aliases.get(key)
+            if current is None or item.get('FirstSeenAt', '') < current.get('FirstSeenAt', ''):
+                self._aliases[key] = item
+        print(f"[ALIAS_TABLE] Loaded {len(self._aliases)} aliases")
+
+    def lookup(self, variant: str, umbrella_id: str) -> Optional[Dict]:
+        """Alias item for a normalised name from an umbrella, or None"""
+        return self._aliases.get((umbrella_id, variant))
+
+    def __len__(self):
+        return len(self._aliases)
+
+print("[NAME_ALIASES_MODULE] name_aliases.py module load complete")
@@ -0,0 +1,164 @@
+"""
+Candidate blocking for name matching against large contractor registries
+Narrows the registry to the few candidates worth scoring for a name
+"""
+
+print("[NAME_BLOCKING_MODULE] Starting name_blocking.py module load")
+
+import re
+from collections import defaultdict
+from typing import Iterable, List, Set, Tuple
+
+print("[NAME_BLOCKING_MODULE] Imported re, collections, typing")
+
+# Recall knobs
+# - NGRAM_SIZE: length of the character n-grams (padded with '$' at both
+#   ends); smaller n-grams survive more typos but make bigger blocks
+# - MIN_SHARED_KEYS: blocking keys a candidate must share with the name
+BLOCKING_NGRAM_SIZE = 3
+BLOCKING_MIN_SHARED_KEYS = 1
+
+# Registries smaller than this are scored in full; blocking them saves nothing
+BLOCKING_MIN_CANDIDATES = 500
+
+print(f"[NAME_BLOCKING_MODULE] BLOCKING_NGRAM_SIZE={BLOCKING_NGRAM_SIZE}, "
+      f"BLOCKING_MIN_SHARED_KEYS={BLOCKING_MIN_SHARED_KEYS}, BLOCKING_MIN_CANDIDATES={BLOCKING_MIN_CANDIDATES}")
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+
+def soundex(word: str) -> str:
+    """
+    American Soundex code of a word ('smith' -> 'S530')
+
+    Letters only; digits and punctuation are ignored. Empty for a word with
+    no letters.
+    """
+    letters = [c for c in word.lower() if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+
+    code = [letters[0].upper()]
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # h and w don't separate letters with the same code; vowels do
+        if letter not in 'hw':
+            previous = digit
+    return ''.join(code).ljust(4, '0')
+
+
+def ngrams(word: str, size: int = BLOCKING_NGRAM_SIZE) -> Set[str]:
+    """Character n-grams of a word padded with '$' ('ann' -> {'$an', 'ann', 'nn$'} for size 3)"""
+    padded = f"${word}$"
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """
+    Forename and surname of a name for blocking
+
+    The first part is the forename and the rest, joined, the surname, so
+    'Jane Smith-Jones' and 'jane smithjones' block together.
+    """
+    parts = re.sub(r'[^a-z0-9\s]', '', name.lower()).split()
+    if not parts:
+        return '', ''
+    return parts[0], ''.join(parts[1:])
+
+
+def blocking_keys(name: str, ngram_size: int = BLOCKING_NGRAM_SIZE) -> Set[str]:
+    """
+    Blocking keys of a name
+
+    Forename and surname come from separate pay file columns, so typos stay
+    inside one part. Every key pairs something about the forename with
+    something about the surname, which keeps blocks small, and each family
+    survives a different kind of typo:
+
+    - Soundex of forename + Soundex of surname (misspellings that sound alike)
+    - forename n-gram + Soundex of surname (a typo in the forename)
+    - Soundex of forename + surname n-gram (a typo in the surname)
+    - forename n-gram + surname n-gram (typos in both, or a changed first letter)
+
+    Args:
+        name: Name as searched or as stored (normalised here)
+        ngram_size: Character n-gram length
+
+    Returns:
+        Set of keys; empty for a blank name
+    """
+    forename, surname = split_name(name)
+    if not forename:
+        return set()
+
+    forename_sound, surname_sound = soundex(forename), soundex(surname)
+    forename_grams = ngrams(forename, ngram_size)
+    surname_grams = ngrams(surname, ngram_size) if surname else {''}
+
+    keys = {f"P|{forename_sound}|{surname_sound}"}
+    keys.update(f"F|{gram}|{surname_sound}" for gram in forename_grams)
+    keys.update(f"S|{forename_sound}|{gram}" for gram in surname_grams)
+    keys.update(f"G|{first}|{last}" for first in forename_grams for last in surname_grams)
+    return keys
+
+
+class BlockingIndex:
+    """
+    Inverted index from blocking key to candidate positions
+
+    Built once per contractor snapshot over the names a CandidateIndex holds.
+    candidates() returns the positions sharing at least min_shared keys with a
+    name, in registry order, so scoring them keeps find_best_match's tie-breaking.
+    Each key only covers names alike in both forename and surname, so blocks
+    grow far more slowly than the registry does.
+    """
+
+    def __init__(self, names: Iterable[str], ngram_size: int = BLOCKING_NGRAM_SIZE,
+                 min_shared: int = BLOCKING_MIN_SHARED_KEYS):
+        self.ngram_size = ngram_size
+        self.min_shared = max(1, min_shared)
+        self.postings = defaultdict(list)
+        count = 0
+        for position, name in enumerate(names):
+            for key in blocking_keys(name, ngram_size):
+                self.postings[key].append(position)
+            count += 1
+        self.postings = dict(self.postings)
+        print(f"[BLOCKING_INDEX] Indexed {count} names under {len(self.postings)} keys "
+              f"(ngram_size={ngram_size}, min_shared={self.min_shared})")
+
+    def candidates(self, name: str) -> List[int]:
+        """
+        Candidate positions worth scoring for a name
+
+        Args:
+            name: Normalised search name
+
+        Returns:
+            Sorted candidate positions (empty when nothing shares a key)
+        """
+        keys = blocking_keys(name, self.ngram_size)
+        if self.min_shared == 1:
+            block = set()
+            for key in keys:
+                block.update(self.postings.get(key, ()))
+            return sorted(block)
+
+        shared = defaultdict(int)
+        for key in keys:
+            for position in self.postings.get(key, ()):
+                shared[position] += 1
+        needed = min(self.min_shared, len(keys))
+        return sorted(position for position, count in shared.items() if count >= needed)
+
+print("[NAME_BLOCKING_MODULE] name_blocking.py module load complete")
@@ -0,0 +1,79 @@
+"""
+Permanent staff registry
+Every PERMANENT# profile held as a set of normalised names, loaded once per
+warm container and reloaded only when the registry's version stamp changes
+"""
+
+print("[PERMANENT_STAFF_MODULE] Starting permanent_staff.py module load")
+
+import threading
+from typing import Dict, FrozenSet, Optional
+
+print("[PERMANENT_STAFF_MODULE] Imported threading, typing")
+
+# Permanent staff profiles share one GSI2 partition
+PERMANENT_STAFF_GSI2PK = 'PERMANENT_CHECK'
+
+# Item whose Version changes whenever a permanent staff profile is added,
+# changed or removed (the seed script writes it with the profiles)
+PERMANENT_STAFF_VERSION_KEY = {'PK': 'PERMANENT_STAFF', 'SK': 'VERSION'}
+
+print(f"[PERMANENT_STAFF_MODULE] PERMANENT_STAFF_GSI2PK={PERMANENT_STAFF_GSI2PK}, "
+      f"PERMANENT_STAFF_VERSION_KEY={PERMANENT_STAFF_VERSION_KEY}")
+
+
+def normalize_staff_name(first_name: str, last_name: str) -> str:
+    """Name as keyed under PERMANENT# ("first last", lower case)"""
+    return f"{first_name} {last_name}".lower()
+
+
+def staff_name(item: Dict) -> str:
+    """Normalised name of a permanent staff profile item"""
+    return item.get('NormalizedName') or normalize_staff_name(item.get('FirstName', ''), item.get('LastName', ''))
+
+
+class PermanentStaffRegistry:
+    """
+    Permanent staff names for Rule 1 and reporting
+
+    Keep one per warm container (at module level, next to the DynamoDB
+    client). refresh() reads the version stamp - one get_item - and only
+    re-queries the profiles when it has changed, or on every call if the
+    stamp is missing. Read failures are raised, never taken as "not
+    permanent".
+    """
+
+    def __init__(self, dynamodb_client):
+        self.db = dynamodb_client
+        self.version: Optional[str] = None
+        self.names: Optional[FrozenSet[str]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> FrozenSet[str]:
+        """
+        Current permanent staff names, reloaded if the version stamp moved
+
+        Returns:
+            Frozen set of normalised names
+        """
+        version = self.db.get_permanent_staff_version()
+        with self._lock:
+            if self.names is not None and version is not None and version == self.version:
+                print(f"[PERMANENT_STAFF_REGISTRY] Version {version} unchanged, {len(self.names)} names")
+                return self.names
+
+            print(f"[PERMANENT_STAFF_REGISTRY] Loading permanent staff (version {self.version} -> {version})")
+            self.names = frozenset(staff_name(item) for item in self.db.get_permanent_staff())
+            self.version = version
+            print(f"[PERMANENT_STAFF_REGISTRY] Loaded {len(self.names)} names")
+            return self.names
+
+    def is_permanent(self, first_name: str, last_name: str) -> bool:
+        """Whether a name is permanent staff (loads the registry on first use)"""
+        names = self.names if self.names is not None else self.refresh()
+        return normalize_staff_name(first_name, last_name) in names
+
+    def __len__(self):
+        return len(self.names) if self.names is not None else 0
+
+print("[PERMANENT_STAFF_MODULE] permanent_staff.py module load complete")
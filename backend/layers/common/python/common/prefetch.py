@@ -0,0 +1,90 @@
+"""
+Concurrent prefetch of independent I/O for Lambda steps
+Starts S3 and DynamoDB reads together on a thread pool so their latency
+overlaps with each other and with parse/decode CPU time
+"""
+
+print("[PREFETCH_MODULE] Starting prefetch.py module load")
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+print("[PREFETCH_MODULE] Imported time, ThreadPoolExecutor, typing")
+
+# Reads are network-bound, so a handful of threads is enough even on the
+# smallest Lambda memory size
+PREFETCH_MAX_WORKERS = 8
+
+print(f"[PREFETCH_MODULE] PREFETCH_MAX_WORKERS={PREFETCH_MAX_WORKERS}")
+
+
+class Prefetch:
+    """
+    Named tasks running on a thread pool, joined by name
+
+    Usage:
+        with Prefetch() as prefetch:
+            prefetch.submit('period', load_period, period_id)
+            prefetch.submit('contractors', load_contractors)
+            records = decode(payload)            # overlaps with the reads
+            period = prefetch.result('period')
+
+    result() re-raises a task's exception in the caller. Leaving the block
+    waits for anything still running, so no read outlives the invocation.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_MAX_WORKERS):
+        print(f"[PREFETCH_INIT] Creating thread pool with max_workers={max_workers}")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._futures = {}
+        self.timings: Dict[str, float] = {}
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> 'Prefetch':
+        """
+        Start a task
+
+        Args:
+            name: Key the result is joined by
+            fn: Callable to run on the pool
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            self, so submits can be chained
+        """
+        if name in self._futures:
+            raise ValueError(f"Prefetch task already submitted: {name}")
+        print(f"[PREFETCH_SUBMIT] Starting task '{name}'")
+        self._futures[name] = self._executor.submit(self._timed, name, fn, *args, **kwargs)
+        return self
+
+    def _timed(self, name: str, fn: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 4)
+
+    def result(self, name: str, timeout: float = None) -> Any:
+        """Wait for a task and return its result (or raise its exception)"""
+        print(f"[PREFETCH_RESULT] Joining task '{name}'")
+        value = self._futures[name].result(timeout=timeout)
+        print(f"[PREFETCH_RESULT] Task '{name}' done in {self.timings.get(name)}s")
+        return value
+
+    def results(self) -> Dict[str, Any]:
+        """Wait for every task, returning {name: result}"""
+        return {name: self.result(name) for name in self._futures}
+
+    def close(self):
+        """Wait for running tasks and release the pool"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+print("[PREFETCH_MODULE] prefetch.py module load complete")
@@ -0,0 +1,236 @@
+"""
+Columnar container for parsed pay records
+One array per field instead of one dict per row, shared by parse, validate and import
+"""
+
+print("[RECORD_BATCH_MODULE] Starting record_batch.py module load")
+
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+print("[RECORD_BATCH_MODULE] Imported sys, array, Mapping, typing")
+
+from .money import MONEY_FIELDS, PENCE_PER_POUND, Money
+
+print("[RECORD_BATCH_MODULE] Imported money")
+
+# Fields produced by PayFileParser._parse_row, in record order. Money fields
+# hold whole pence (Money) and are only turned into pounds in to_payload()
+INT_FIELDS = ('row_number', 'row_idx')
+FLOAT_FIELDS = ('unit_days', 'total_hours')
+STRING_FIELDS = ('employee_id', 'surname', 'forename', 'record_type', 'notes', 'company')
+RECORD_FIELDS = (
+    'row_number', 'row_idx', 'employee_id', 'surname', 'forename', 'unit_days', 'day_rate',
+    'amount', 'vat_amount', 'gross_amount', 'total_hours', 'record_type', 'notes', 'company'
+)
+
+PAYLOAD_FORMAT = 'record_batch'
+PAYLOAD_VERSION = 1
+
+print(f"[RECORD_BATCH_MODULE] RECORD_FIELDS={RECORD_FIELDS}")
+
+
+def _intern(value):
+    """Intern strings so repeated names, companies and record types share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class RecordView(Mapping):
+    """
+    Read-only dict-like view of one row of a RecordBatch
+
+    Supports record['field'] and record.get('field') like the plain record
+    dicts the validators were written against, without copying the row.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'RecordBatch', index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key):
+        column = self._batch._columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        if key in MONEY_FIELDS:
+            return Money(column[self._index])
+        return column[self._index]
+
+    def __iter__(self):
+        return iter(self._batch.fields)
+
+    def __len__(self):
+        return len(self._batch.fields)
+
+    def __repr__(self):
+        return f"RecordView({dict(self)})"
+
+    def to_dict(self) -> Dict:
+        """Materialise the row as a plain dict"""
+        return dict(self)
+
+
+class RecordBatch:
+    """
+    Columnar batch of pay records
+
+    Numeric fields are typed arrays (array('q') for row numbers and money in
+    pence, read back as Money; array('d') for days and hours); string fields
+    are lists of interned strings. Extra per-row columns (e.g. contractor_id
+    after validation) and file-level attrs (e.g. umbrella_id) can be attached.
+    to_payload() gives a compact JSON-ready form for Step Functions and the
+    artifact cache, with money in pounds.
+    """
+
+    def __init__(self, extra_fields: Sequence[str] = (), attrs: Optional[Dict] = None):
+        self.fields = RECORD_FIELDS + tuple(f for f in extra_fields if f not in RECORD_FIELDS)
+        self.attrs = dict(attrs or {})
+
+        self._columns = {}
+        for field in self.fields:
+            if field in INT_FIELDS or field in MONEY_FIELDS:
+                self._columns[field] = array('q')
+            elif field in FLOAT_FIELDS:
+                self._columns[field] = array('d')
+            else:
+                self._columns[field] = []
+
+        self._length = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping], extra_fields: Sequence[str] = (),
+                     attrs: Optional[Dict] = None) -> 'RecordBatch':
+        """Build a batch from record dicts (or any iterable of mappings, e.g. a generator)"""
+        batch = cls(extra_fields, attrs)
+        for record in records:
+            batch.append(record)
+        print(f"[RECORD_BATCH_FROM_RECORDS] Built batch with {len(batch)} records")
+        return batch
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> 'RecordBatch':
+        """Rebuild a batch from to_payload() output"""
+        if not cls.is_payload(payload):
+            raise ValueError("Not a record batch payload")
+        if payload.get('version') != PAYLOAD_VERSION:
+            raise ValueError(f"Unsupported record batch payload version: {payload.get('version')}")
+
+        columns = payload['columns']
+        batch = cls([f for f in columns if f not in RECORD_FIELDS], payload.get('attrs'))
+        for field in batch.fields:
+            values = columns.get(field) or [None] * payload['length']
+            if field in MONEY_FIELDS:
+                batch._columns[field].extend(Money.parse(v) for v in values)
+            elif field in INT_FIELDS or field in FLOAT_FIELDS:
+                batch._columns[field].extend(values)
+            else:
+                batch._columns[field].extend(_intern(v) for v in values)
+        batch._length = payload['length']
+
+        print(f"[RECORD_BATCH_FROM_PAYLOAD] Rebuilt batch with {len(batch)} records")
+        return batch
+
+    @classmethod
+    def coerce(cls, records) -> 'RecordBatch':
+        """Accept a RecordBatch, a batch payload or a list of record dicts"""
+        if isinstance(records, RecordBatch):
+            return records
+        if cls.is_payload(records):
+            return cls.from_payload(records)
+        return cls.from_records(records or [])
+
+    @staticmethod
+    def is_payload(value) -> bool:
+        """Check whether a value is a serialised RecordBatch"""
+        return isinstance(value, dict) and value.get('format') == PAYLOAD_FORMAT
+
+    @staticmethod
+    def _cell(field: str, value):
+        """Value as stored in the field's column"""
+        if field in MONEY_FIELDS:
+            return Money.parse(value)
+        if field in INT_FIELDS:
+            return int(value or 0)
+        if field in FLOAT_FIELDS:
+            return float(value or 0.0)
+        return _intern(value)
+
+    def append(self, record: Mapping):
+        """Append one record"""
+        for field in self.fields:
+            self._columns[field].append(self._cell(field, record.get(field)))
+        self._length += 1
+
+    def column(self, field: str):
+        """Whole column for a field (array or list - do not mutate; money columns are plain pence)"""
+        return self._columns[field]
+
+    def take(self, indices: Sequence[int], extra_columns: Optional[Dict[str, List]] = None,
+             attrs: Optional[Dict] = None) -> 'RecordBatch':
+        """
+        New batch with the selected rows, optionally adding per-row columns
+
+        Args:
+            indices: Row indexes to keep, in order
+            extra_columns: Extra column name -> values (one per selected row);
+                           a column the batch already has is replaced
+            attrs: File-level attributes to merge into the new batch's attrs
+        """
+        extra_columns = extra_columns or {}
+        for field, values in extra_columns.items():
+            if len(values) != len(indices):
+                raise ValueError(f"Column '{field}' has {len(values)} values for {len(indices)} rows")
+
+        extra_fields = dict.fromkeys([f for f in self.fields if f not in RECORD_FIELDS] + list(extra_columns))
+        merged_attrs = dict(self.attrs)
+        merged_attrs.update(attrs or {})
+
+        batch = RecordBatch(extra_fields, merged_attrs)
+        for field in self.fields:
+            if field not in extra_columns:
+                source = self._columns[field]
+                batch._columns[field].extend(source[i] for i in indices)
+        for field, values in extra_columns.items():
+            batch._columns[field].extend(self._cell(field, v) for v in values)
+        batch._length = len(indices)
+        return batch
+
+    def to_records(self) -> List[Dict]:
+        """Materialise every row as a plain dict"""
+        return [self[i].to_dict() for i in range(self._length)]
+
+    def to_payload(self) -> Dict:
+        """JSON-ready columnar form - field names appear once, not once per row; money in pounds"""
+        return {
+            'format': PAYLOAD_FORMAT,
+            'version': PAYLOAD_VERSION,
+            'length': self._length,
+            'attrs': self.attrs,
+            'columns': {
+                field: [pence / PENCE_PER_POUND for pence in self._columns[field]] if field in MONEY_FIELDS
+                else list(self._columns[field])
+                for field in self.fields
+            }
+        }
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> RecordView:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('record batch index out of range')
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator[RecordView]:
+        for index in range(self._length):
+            yield RecordView(self, index)
+
+    def __repr__(self):
+        return f"RecordBatch(length={self._length}, fields={len(self.fields)}, attrs={self.attrs})"
+
+print("[RECORD_BATCH_MODULE] record_batch.py module load complete")
@@ -0,0 +1,153 @@
+"""
+Row-level diffing of pay records for superseding files
+Lets a resubmitted file write only the rows that actually changed
+"""
+
+print("[RECORD_DIFF_MODULE] Starting record_diff.py module load")
+
+import hashlib
+from collections import defaultdict, deque
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+print("[RECORD_DIFF_MODULE] Imported hashlib, collections, Decimal, typing")
+
+# System parameter selecting how a superseded file's records are replaced
+SUPERSEDE_MODE_PARAM = 'SUPERSEDE_MODE'
+SUPERSEDE_FULL = 'full'
+SUPERSEDE_DIFF = 'diff'
+SUPERSEDE_MODES = (SUPERSEDE_FULL, SUPERSEDE_DIFF)
+DEFAULT_SUPERSEDE_MODE = SUPERSEDE_DIFF
+
+# Pay record attributes that make up a row's fingerprint; any change to one of
+# these means the row has to be rewritten
+IDENTITY_FIELDS = ('EmployeeID', 'RecordType')
+FINGERPRINT_FIELDS = IDENTITY_FIELDS + (
+    'ContractorID', 'AssociationID', 'UnitDays', 'DayRate', 'Amount',
+    'VATAmount', 'GrossAmount', 'TotalHours', 'Notes'
+)
+
+print(f"[RECORD_DIFF_MODULE] FINGERPRINT_FIELDS={FINGERPRINT_FIELDS}, DEFAULT_SUPERSEDE_MODE={DEFAULT_SUPERSEDE_MODE}")
+
+
+def normalize_supersede_mode(value) -> str:
+    """SUPERSEDE_MODE parameter value, falling back to the default for unset or unknown values"""
+    mode = str(value or '').strip().lower()
+    return mode if mode in SUPERSEDE_MODES else DEFAULT_SUPERSEDE_MODE
+
+
+def _fingerprint_value(value) -> str:
+    """Canonical text for one attribute, so 450, 450.0 and Decimal('450.00') agree"""
+    if value is None:
+        return ''
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        number = Decimal(str(value)).normalize()
+        return format(number if number != 0 else Decimal(0), 'f')
+    return str(value).strip()
+
+
+def record_fingerprint(item: Dict) -> str:
+    """
+    Fingerprint a pay record item
+
+    Args:
+        item: Pay record item as written to DynamoDB (EmployeeID, RecordType, amounts...)
+
+    Returns:
+        SHA-1 hex digest of the fingerprint fields
+    """
+    text = '\x1f'.join(_fingerprint_value(item.get(field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _identity(item: Dict) -> Tuple[str, ...]:
+    return tuple(_fingerprint_value(item.get(field)) for field in IDENTITY_FIELDS)
+
+
+class RecordDiff:
+    """
+    Difference between the active records of a superseded file and a new file
+
+    unchanged: (old, new) pairs with identical fingerprints - nothing to write
+    changed:   (old, new) pairs for the same employee and record type whose
+               amounts differ - write new, deactivate old
+    added:     new items with no counterpart - write
+    removed:   old items with no counterpart - deactivate
+    """
+
+    def __init__(self):
+        self.unchanged: List[Tuple[Dict, Dict]] = []
+        self.changed: List[Tuple[Dict, Dict]] = []
+        self.added: List[Dict] = []
+        self.removed: List[Dict] = []
+
+    @property
+    def to_write(self) -> List[Dict]:
+        """New items that need a put, in file order"""
+        items = self.added + [new for _, new in self.changed]
+        return sorted(items, key=lambda item: item['SK'])
+
+    @property
+    def to_deactivate(self) -> List[Dict]:
+        """Old items that need IsActive set to false"""
+        return [old for old, _ in self.changed] + self.removed
+
+    def summary(self) -> Dict[str, int]:
+        """Row counts for logging and the FILE item"""
+        return {
+            'added': len(self.added),
+            'changed': len(self.changed),
+            'removed': len(self.removed),
+            'unchanged': len(self.unchanged)
+        }
+
+
+def diff_records(old_items: Iterable[Dict], new_items: Iterable[Dict]) -> RecordDiff:
+    """
+    Diff old and new pay record items
+
+    Rows are first paired by fingerprint (a multiset match, so duplicated rows
+    are counted), then the leftovers are paired in order by employee ID and
+    record type as changed rows. Whatever is left after that was added or removed.
+
+    Args:
+        old_items: Active pay record items of the file being superseded
+        new_items: Pay record items built for the new file
+
+    Returns:
+        RecordDiff
+    """
+    print(f"[RECORD_DIFF] diff_records called")
+    diff = RecordDiff()
+
+    old_by_fingerprint = defaultdict(deque)
+    for item in old_items:
+        old_by_fingerprint[record_fingerprint(item)].append(item)
+
+    pending_new = []
+    for item in new_items:
+        matches = old_by_fingerprint.get(record_fingerprint(item))
+        if matches:
+            diff.unchanged.append((matches.popleft(), item))
+        else:
+            pending_new.append(item)
+
+    old_by_identity = defaultdict(deque)
+    for matches in old_by_fingerprint.values():
+        for item in matches:
+            old_by_identity[_identity(item)].append(item)
+
+    for item in pending_new:
+        matches = old_by_identity.get(_identity(item))
+        if matches:
+            diff.changed.append((matches.popleft(), item))
+        else:
+            diff.added.append(item)
+
+    for matches in old_by_identity.values():
+        diff.removed.extend(matches)
+
+    print(f"[RECORD_DIFF] Result: {diff.summary()}")
+    return diff
+
+print("[RECORD_DIFF_MODULE] record_diff.py module load complete")
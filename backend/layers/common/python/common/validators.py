@@ -11,17 +11,24 @@ from typing import Dict, List, Optional, Tuple
 
 print("[VALIDATORS_MODULE] Imported datetime, Decimal, and typing modules")
 
+from .money import Money, pence_to_pounds
+from .permanent_staff import PermanentStaffRegistry, normalize_staff_name
+
+print("[VALIDATORS_MODULE] Imported Money, pence_to_pounds and PermanentStaffRegistry")
+
 
 class ValidationEngine:
     """Validate contractor pay records against business rules"""
 
-    def __init__(self, dynamodb_client, system_params: Dict = None):
+    def __init__(self, dynamodb_client, system_params: Dict = None, permanent_staff=None):
         """
         Initialize validation engine
 
         Args:
             dynamodb_client: DynamoDB client instance
             system_params: System parameters (VAT rate, thresholds, etc.)
+            permanent_staff: PermanentStaffRegistry kept across invocations
+                             (default: a new one, loaded on first use)
         """
         print("[VALIDATION_ENGINE_INIT] Starting ValidationEngine initialization")
 
@@ -31,6 +38,38 @@ class ValidationEngine:
         self.params = system_params or {}
         print(f"[VALIDATION_ENGINE_INIT] Assigned system_params to self.params: {self.params}")
 
+        # param -> (raw value, Decimal) so rates aren't re-parsed for every record
+        self._decimal_params = {}
+
+        # Name matcher and (contractors_cache, CandidateIndex), built on first use
+        self._matcher = None
+        self._contractor_index = None
+
+        # (contractors_cache, threshold, umbrella_id, {search name: match}) from match_names()
+        self._name_matches = None
+
+        # Learned aliases (AliasTable) consulted before scoring, and the new
+        # fuzzy matches seen in this file: (umbrella_id, variant) -> (contractor, confidence)
+        self._aliases = None
+        self.learned_aliases = {}
+
+        # The umbrella's associations by employee ID (AssociationIndex) and
+        # the name-confirmed matches made through it
+        self._associations = None
+        self._employee_matches = {}
+
+        # Permanent staff names for Rule 1, taken from the registry once per engine
+        self.permanent_staff = permanent_staff if permanent_staff is not None else PermanentStaffRegistry(self.db)
+        self._permanent_names = None
+
+        # Reference data held for a whole file (see prefetch_file): the umbrella
+        # whose associations are all in self._associations, period number ->
+        # {contractor ID: rate} and contractors' latest STANDARD rates. Rules
+        # fall back to per-record reads for anything not loaded.
+        self._associations_umbrella = None
+        self._period_rates = {}
+        self._latest_rates = {}
+
         # Load system parameters if not provided
         if not self.params:
             print("[VALIDATION_ENGINE_INIT] system_params is empty, calling _load_system_parameters()")
@@ -49,7 +88,8 @@ class ValidationEngine:
             'OVERTIME_MULTIPLIER',
             'OVERTIME_TOLERANCE_PERCENT',
             'RATE_CHANGE_ALERT_PERCENT',
-            'NAME_MATCH_THRESHOLD'
+            'NAME_MATCH_THRESHOLD',
+            'NAME_BLOCKING_NGRAM_SIZE'
         ]
         print(f"[LOAD_SYSTEM_PARAMETERS] Created params list: {params}")
 
@@ -68,8 +108,8 @@ class ValidationEngine:
                     print(f"[LOAD_SYSTEM_PARAMETERS] Parameter ends with _PERCENT, converting to float")
                     self.params[param] = float(value)
                     print(f"[LOAD_SYSTEM_PARAMETERS] {param} = {self.params[param]}")
-                elif param == 'NAME_MATCH_THRESHOLD':
-                    print(f"[LOAD_SYSTEM_PARAMETERS] Parameter is NAME_MATCH_THRESHOLD, converting to int")
+                elif param in ('NAME_MATCH_THRESHOLD', 'NAME_BLOCKING_NGRAM_SIZE'):
+                    print(f"[LOAD_SYSTEM_PARAMETERS] Parameter is {param}, converting to int")
                     self.params[param] = int(value)
                     print(f"[LOAD_SYSTEM_PARAMETERS] {param} = {self.params[param]}")
                 else:
@@ -81,6 +121,15 @@ class ValidationEngine:
 
         print(f"[LOAD_SYSTEM_PARAMETERS] _load_system_parameters() complete. Final params: {self.params}")
 
+    def _decimal_param(self, param: str, default) -> Decimal:
+        """System parameter as a Decimal, converted once per engine rather than per record"""
+        value = self.params.get(param, default)
+        cached = self._decimal_params.get(param)
+        if cached is None or cached[0] != value:
+            cached = (value, Decimal(str(value)))
+            self._decimal_params[param] = cached
+        return cached[1]
+
     def validate_record(
         self,
         record: Dict,
@@ -103,6 +152,28 @@ class ValidationEngine:
             - errors: List of error dicts (CRITICAL - blocks import)
             - warnings: List of warning dicts (NON-BLOCKING)
         """
+        outcome = self._validate_record(record, umbrella_id, period_data, contractors_cache)
+        return outcome['valid'], outcome['errors'], outcome['warnings']
+
+    def _validate_record(
+        self,
+        record: Dict,
+        umbrella_id: str,
+        period_data: Dict,
+        contractors_cache: Dict = None,
+        contractor_result: Dict = None
+    ) -> Dict:
+        """
+        validate_record, also returning the contractor and association it resolved
+
+        Args:
+            contractor_result: find_contractor result for the record when it has
+                               already been resolved (Rule 2 then isn't re-run)
+
+        Returns:
+            Dict with 'valid', 'errors', 'warnings', 'contractor_id' and
+            'association_id' (both None unless valid)
+        """
         print(f"[VALIDATE_RECORD] Called with record={record}, umbrella_id={umbrella_id}, period_data={period_data}")
 
         errors = []
@@ -121,14 +192,17 @@ class ValidationEngine:
             errors.append(perm_result['error'])
             print(f"[VALIDATE_RECORD] Added error to errors list. Errors count: {len(errors)}")
             print("[VALIDATE_RECORD] Returning early due to permanent staff error")
-            return False, errors, warnings  # Stop validation immediately
+            return self._outcome(False, errors, warnings)  # Stop validation immediately
         else:
             print("[VALIDATE_RECORD] Permanent staff check passed (valid=True)")
 
         # Rule 2: Find and validate contractor
-        print("[VALIDATE_RECORD] Rule 2: Calling find_contractor()")
-        contractor_result = self.find_contractor(record, contractors_cache)
-        print(f"[VALIDATE_RECORD] find_contractor returned: {contractor_result}")
+        if contractor_result is None:
+            print("[VALIDATE_RECORD] Rule 2: Calling find_contractor()")
+            contractor_result = self.find_contractor(record, contractors_cache, umbrella_id)
+            print(f"[VALIDATE_RECORD] find_contractor returned: {contractor_result}")
+        else:
+            print(f"[VALIDATE_RECORD] Rule 2: Contractor already resolved: {contractor_result.get('contractor_id')}")
 
         if not contractor_result['valid']:
             print("[VALIDATE_RECORD] Contractor lookup failed (valid=False)")
@@ -139,7 +213,7 @@ class ValidationEngine:
                 print("[VALIDATE_RECORD] Severity is CRITICAL, returning early")
                 errors.append(contractor_result['error'])
                 print(f"[VALIDATE_RECORD] Added error to errors list. Errors count: {len(errors)}")
-                return False, errors, warnings
+                return self._outcome(False, errors, warnings)
             else:
                 print("[VALIDATE_RECORD] Severity is not CRITICAL, adding to warnings")
                 warnings.append(contractor_result['warning'])
@@ -167,7 +241,7 @@ class ValidationEngine:
             errors.append(assoc_result['error'])
             print(f"[VALIDATE_RECORD] Added error to errors list. Errors count: {len(errors)}")
             print("[VALIDATE_RECORD] Returning early due to umbrella association error")
-            return False, errors, warnings
+            return self._outcome(False, errors, warnings)
         else:
             print("[VALIDATE_RECORD] Umbrella association validation passed (valid=True)")
 
@@ -249,7 +323,173 @@ class ValidationEngine:
         print(f"[VALIDATE_RECORD] Calculated is_valid (len(errors) == 0): {is_valid}")
 
         print(f"[VALIDATE_RECORD] Final result: is_valid={is_valid}, errors_count={len(errors)}, warnings_count={len(warnings)}")
-        return is_valid, errors, warnings
+        if not is_valid:
+            return self._outcome(False, errors, warnings)
+        return self._outcome(True, errors, warnings, contractor_id,
+                             assoc_result.get('association', {}).get('AssociationID'))
+
+    @staticmethod
+    def _outcome(is_valid: bool, errors: List[Dict], warnings: List[Dict],
+                 contractor_id: str = None, association_id: str = None) -> Dict:
+        """_validate_record result"""
+        return {
+            'valid': is_valid,
+            'errors': errors,
+            'warnings': warnings,
+            'contractor_id': contractor_id,
+            'association_id': association_id
+        }
+
+    def validate_file(
+        self,
+        records: List[Dict],
+        umbrella_id: str,
+        period_data: Dict,
+        contractors_cache: Dict = None
+    ) -> List[Dict]:
+        """
+        Validate every record of a file against reference data read up front
+
+        prefetch_file() reads what the seven rules need in a fixed number of
+        batched reads and resolves each record's contractor once; each record
+        is then validated in memory against that contractor. Valid records also
+        get their contractor and association, so callers don't look them up
+        again.
+
+        Args:
+            records: Parsed pay records (list of dicts or a RecordBatch)
+            umbrella_id: Umbrella company ID
+            period_data: Pay period information
+            contractors_cache: Contractors keyed by ID (loaded when not given)
+
+        Returns:
+            One dict per record with 'valid', 'errors', 'warnings',
+            'contractor_id' and 'association_id' (both None unless valid)
+        """
+        print(f"[VALIDATE_FILE] Called with {len(records)} records, umbrella_id={umbrella_id}")
+        contractors_cache, contractor_results = self.prefetch_file(records, umbrella_id, period_data, contractors_cache)
+
+        results = [
+            self._validate_record(record, umbrella_id, period_data, contractors_cache, contractor_result)
+            for record, contractor_result in zip(records, contractor_results)
+        ]
+
+        print(f"[VALIDATE_FILE] {sum(r['valid'] for r in results)}/{len(results)} records valid")
+        return results
+
+    def prefetch_file(
+        self,
+        records: List[Dict],
+        umbrella_id: str,
+        period_data: Dict,
+        contractors_cache: Dict = None
+    ) -> Dict:
+        """
+        Read the reference data a file's records need, in batched reads
+
+        Independent reads run together on a Prefetch pool:
+        - the permanent staff registry (refreshed if its version stamp moved)
+        - every STANDARD rate in this period and the previous one (one query each)
+        - the umbrella's associations and learned aliases, unless already set
+        - the contractor registry, when no contractors_cache is given
+
+        Names are then matched in one batch and each record's contractor is
+        resolved from it. Contractors with no rate in the periods checked get
+        their latest STANDARD pay record read once each, concurrently, rather
+        than once per record.
+
+        Returns:
+            (contractors_cache as given or loaded, one find_contractor result per
+            record - None where Rule 1 stops the record first or there is no
+            contractors_cache)
+        """
+        from .prefetch import Prefetch
+
+        print(f"[PREFETCH_FILE] Starting for {len(records)} records, umbrella_id={umbrella_id}")
+
+        period_number = period_data.get('PeriodNumber')
+        periods = [str(period_number)] if period_number else []
+        if period_number and period_number > 1:
+            periods.append(str(period_number - 1))
+
+        with Prefetch() as prefetch:
+            prefetch.submit('permanent_staff', self._permanent_staff_names)
+            for period_id in periods:
+                if period_id not in self._period_rates:
+                    prefetch.submit(f'rates_{period_id}', self.db.get_period_rates, period_id)
+            if self._associations is None or self._associations_umbrella != umbrella_id:
+                prefetch.submit('associations', self.db.get_umbrella_associations, umbrella_id)
+            if self._aliases is None:
+                prefetch.submit('name_aliases', self.db.get_name_aliases, umbrella_id)
+            if contractors_cache is None:
+                prefetch.submit('contractors', self.db.get_contractors)
+
+            results = prefetch.results()
+
+        permanent_names = results['permanent_staff']
+        for period_id in periods:
+            if f'rates_{period_id}' in results:
+                self._period_rates[period_id] = results[f'rates_{period_id}']
+        if 'associations' in results:
+            self.set_associations(results['associations'], umbrella_id)
+        if 'name_aliases' in results:
+            self.set_name_aliases(results['name_aliases'])
+        if 'contractors' in results:
+            contractors_cache = {item['ContractorID']: item for item in results['contractors']}
+        print(f"[PREFETCH_FILE] Loaded in {prefetch.timings}")
+
+        self.match_names(records, contractors_cache, umbrella_id)
+
+        # Contractors the rate rules will need a fallback rate for (Rules 1
+        # and 3 stop permanent staff and unassociated contractors before them)
+        contractor_results = [None] * len(records)
+        missing = set()
+        for position, record in enumerate(records if contractors_cache else ()):
+            if normalize_staff_name(record['forename'], record['surname']) in permanent_names:
+                continue
+            contractor_results[position] = self.find_contractor(record, contractors_cache, umbrella_id)
+            contractor_id = contractor_results[position].get('contractor_id')
+            if not contractor_id or contractor_id in self._latest_rates:
+                continue
+            if not self._associations.for_contractor(umbrella_id, contractor_id):
+                continue
+            if record.get('record_type') == 'OVERTIME' and periods and not self._rate_in_period(contractor_id, periods[0]):
+                missing.add(contractor_id)
+            elif len(periods) > 1 and not self._rate_in_period(contractor_id, periods[1]):
+                missing.add(contractor_id)
+
+        if missing:
+            print(f"[PREFETCH_FILE] Reading latest rates for {len(missing)} contractors with no period rate")
+            with Prefetch() as prefetch:
+                for contractor_id in missing:
+                    prefetch.submit(contractor_id, self.db.get_contractor_pay_records, contractor_id, limit=5)
+                for contractor_id, recent_records in prefetch.results().items():
+                    self._latest_rates[contractor_id] = recent_records[0].get('DayRate') if recent_records else None
+
+        return contractors_cache, contractor_results
+
+    def _rate_in_period(self, contractor_id: str, period_id: str):
+        """Contractor's STANDARD day rate in a period (prefetched when available), or None"""
+        rates = self._period_rates.get(str(period_id))
+        if rates is not None:
+            return rates.get(contractor_id)
+        print(f"[RATE_IN_PERIOD] Calling db.get_contractor_rate_in_period({contractor_id}, {period_id})")
+        return self.db.get_contractor_rate_in_period(contractor_id, str(period_id))
+
+    def _latest_rate(self, contractor_id: str):
+        """DayRate of the contractor's most recent STANDARD pay record (prefetched when available), or None"""
+        if contractor_id in self._latest_rates:
+            return self._latest_rates[contractor_id]
+        print(f"[LATEST_RATE] Calling db.get_contractor_pay_records({contractor_id}, limit=5)")
+        recent_records = self.db.get_contractor_pay_records(contractor_id, limit=5)
+        print(f"[LATEST_RATE] Retrieved {len(recent_records)} recent records")
+        return recent_records[0].get('DayRate') if recent_records else None
+
+    def _permanent_staff_names(self):
+        """Permanent staff names, refreshed from the registry on the engine's first use"""
+        if self._permanent_names is None:
+            self._permanent_names = self.permanent_staff.refresh()
+        return self._permanent_names
 
     def check_permanent_staff(self, record: Dict) -> Dict:
         """
@@ -264,8 +504,8 @@ class ValidationEngine:
         last_name = record['surname']
         print(f"[CHECK_PERMANENT_STAFF] Extracted last_name: {last_name}")
 
-        print(f"[CHECK_PERMANENT_STAFF] Calling db.check_permanent_staff({first_name}, {last_name})")
-        is_permanent = self.db.check_permanent_staff(first_name, last_name)
+        print(f"[CHECK_PERMANENT_STAFF] Looking up {first_name} {last_name} in the permanent staff registry")
+        is_permanent = normalize_staff_name(first_name, last_name) in self._permanent_staff_names()
         print(f"[CHECK_PERMANENT_STAFF] check_permanent_staff returned: {is_permanent}")
 
         if is_permanent:
@@ -292,18 +532,187 @@ class ValidationEngine:
         print("[CHECK_PERMANENT_STAFF] Person is not permanent staff - returning valid=True")
         return {'valid': True}
 
-    def find_contractor(self, record: Dict, contractors_cache: Dict = None) -> Dict:
+    def _get_matcher(self):
+        """FuzzyMatcher for the current NAME_MATCH_THRESHOLD, reused across records"""
+        from .fuzzy_matcher import FuzzyMatcher
+
+        threshold = int(self.params.get('NAME_MATCH_THRESHOLD', 75))
+        print(f"[GET_MATCHER] NAME_MATCH_THRESHOLD: {threshold}")
+        if self._matcher is None or self._matcher.threshold != threshold:
+            print("[GET_MATCHER] Creating FuzzyMatcher instance")
+            self._matcher = FuzzyMatcher(threshold=threshold)
+        return self._matcher
+
+    def _get_contractor_index(self, contractors_cache: Dict):
+        """
+        CandidateIndex over contractors_cache
+
+        The cache is the same dict for every record of a file, so it is
+        indexed (names normalised) once rather than listed per record.
+        NAME_BLOCKING_NGRAM_SIZE tunes candidate blocking (0 turns it off).
+        """
+        from .name_blocking import BLOCKING_NGRAM_SIZE
+
+        if self._contractor_index is None or self._contractor_index[0] is not contractors_cache:
+            ngram_size = int(self.params.get('NAME_BLOCKING_NGRAM_SIZE', BLOCKING_NGRAM_SIZE))
+            print(f"[GET_CONTRACTOR_INDEX] Indexing {len(contractors_cache)} contractors, ngram_size={ngram_size}")
+            index = self._get_matcher().index(list(contractors_cache.values()),
+                                              blocking=None if ngram_size > 0 else False,
+                                              ngram_size=ngram_size or BLOCKING_NGRAM_SIZE)
+            self._contractor_index = (contractors_cache, index)
+        return self._contractor_index[1]
+
+    def set_associations(self, association_items: List[Dict], umbrella_id: str = None):
+        """
+        Resolve contractors by employee ID first (from db.get_umbrella_associations)
+
+        Args:
+            association_items: Association items for the file's umbrella
+            umbrella_id: Umbrella the items are all the associations of; Rule 3
+                         then reads them instead of querying per contractor
+        """
+        from .associations import AssociationIndex
+
+        print(f"[SET_ASSOCIATIONS] Indexing {len(association_items)} association items, umbrella_id={umbrella_id}")
+        self._associations = AssociationIndex(association_items)
+        self._associations_umbrella = umbrella_id
+        self._employee_matches = {}
+
+    def _employee_id_match(self, record: Dict, search_name: str, umbrella_id: str,
+                           contractors_cache: Dict) -> Optional[Dict]:
+        """
+        Contractor for a row's (umbrella, employee ID), confirmed by name
+
+        The association gives the contractor with one dict lookup; the name is
+        then scored against that contractor only (or against each of them when
+        the umbrella reused the ID, which breaks the tie). A name that does not
+        reach the threshold is not trusted and the row falls back to name
+        matching.
+
+        Returns:
+            find_best_match result, or None to fall back to name matching
+        """
+        if not self._associations or not umbrella_id or not contractors_cache:
+            return None
+
+        associations = self._associations.lookup(umbrella_id, record.get('employee_id'))
+        if not associations:
+            return None
+
+        key = (umbrella_id, record.get('employee_id'), search_name)
+        if key not in self._employee_matches:
+            contractors = {}
+            for association in associations:
+                contractor = contractors_cache.get(association.get('ContractorID'))
+                if contractor is not None:
+                    contractors.setdefault(contractor['ContractorID'], contractor)
+
+            match = self._get_matcher().find_best_match(search_name, list(contractors.values())) if contractors else None
+            print(f"[EMPLOYEE_ID_MATCH] employee_id={record.get('employee_id')}: {len(contractors)} contractors, "
+                  f"name confirmed={match is not None}")
+            self._employee_matches[key] = match
+        return self._employee_matches[key]
+
+    def set_name_aliases(self, alias_items: List[Dict]):
+        """
+        Use learned aliases (from db.get_name_aliases) ahead of fuzzy scoring
+
+        Args:
+            alias_items: Alias items for the file's umbrella
+        """
+        from .name_aliases import AliasTable
+
+        print(f"[SET_NAME_ALIASES] Loading {len(alias_items)} alias items")
+        self._aliases = AliasTable(alias_items)
+
+    def _alias_match(self, search_name: str, umbrella_id: str, contractors_cache: Dict) -> Optional[Dict]:
+        """
+        Learned alias for a name as a fuzzy match result, or None
+
+        Aliases whose contractor is no longer in the cache, or whose confidence
+        is below the current threshold, are ignored and the name is scored.
+        """
+        if not self._aliases or not umbrella_id or not contractors_cache:
+            return None
+
+        matcher = self._get_matcher()
+        alias = self._aliases.lookup(matcher.normalize_name(search_name), umbrella_id)
+        if alias is None:
+            return None
+
+        contractor = contractors_cache.get(alias['ContractorID'])
+        confidence = int(alias.get('Confidence', 0))
+        if contractor is None or confidence < matcher.threshold:
+            print(f"[ALIAS_MATCH] Ignoring alias {alias['SK']} (contractor cached={contractor is not None}, confidence={confidence})")
+            return None
+
+        print(f"[ALIAS_MATCH] Learned alias: '{search_name}' -> {alias['ContractorID']}")
+        return {
+            'match_type': 'FUZZY',
+            'contractor': contractor,
+            'confidence': confidence,
+            'searched_name': search_name,
+            'matched_name': contractor.get('NormalizedName', ''),
+            'alias': alias
+        }
+
+    def match_names(self, records: List[Dict], contractors_cache: Dict, umbrella_id: str = None) -> int:
+        """
+        Match every distinct name in a file against the contractors in one batch
+
+        Rows resolved by employee ID are skipped and learned aliases are
+        looked up; the remaining names are scored together. find_contractor
+        then looks its record's name up instead of scoring it against the
+        whole registry again.
+
+        Args:
+            records: Parsed pay records (forename/surname)
+            contractors_cache: Contractors keyed by ID, as passed to validate_record
+            umbrella_id: Umbrella of the file (for learned aliases)
+
+        Returns:
+            Number of distinct names matched
+        """
+        print(f"[MATCH_NAMES] Starting match_names() for {len(records)} records")
+        if not contractors_cache:
+            print("[MATCH_NAMES] No contractors_cache - names will be matched per record")
+            self._name_matches = None
+            return 0
+
+        matcher = self._get_matcher()
+        search_names = []
+        for record in records:
+            search_name = f"{record['forename']} {record['surname']}"
+            if self._employee_id_match(record, search_name, umbrella_id, contractors_cache) is None:
+                search_names.append(search_name)
+        search_names = list(dict.fromkeys(search_names))
+
+        matches = {}
+        for search_name in search_names:
+            alias_match = self._alias_match(search_name, umbrella_id, contractors_cache)
+            if alias_match:
+                matches[search_name] = alias_match
+        to_score = [search_name for search_name in search_names if search_name not in matches]
+        print(f"[MATCH_NAMES] {len(matches)} names resolved by learned aliases, {len(to_score)} to match")
+
+        matches.update(zip(to_score, matcher.match_many(to_score, self._get_contractor_index(contractors_cache))))
+
+        self._name_matches = (contractors_cache, matcher.threshold, umbrella_id, matches)
+        print(f"[MATCH_NAMES] Matched {len(search_names)} distinct names")
+        return len(search_names)
+
+    def find_contractor(self, record: Dict, contractors_cache: Dict = None, umbrella_id: str = None) -> Dict:
         """
         Rule 2: Find contractor using fuzzy matching
         CRITICAL if not found after fuzzy match
         WARNING if fuzzy matched (confidence < 100%)
+
+        With umbrella_id, the row's employee ID is tried first (see
+        set_associations), then learned aliases, before any scoring; new fuzzy
+        matches are collected in learned_aliases.
         """
         print("[FIND_CONTRACTOR] Starting find_contractor()")
 
-        print("[FIND_CONTRACTOR] Importing FuzzyMatcher from fuzzy_matcher module")
-        from .fuzzy_matcher import FuzzyMatcher
-        print("[FIND_CONTRACTOR] FuzzyMatcher imported successfully")
-
         first_name = record['forename']
         print(f"[FIND_CONTRACTOR] Extracted first_name: {first_name}")
 
@@ -313,26 +722,42 @@ class ValidationEngine:
         # Get contractors from cache or database
         print(f"[FIND_CONTRACTOR] contractors_cache is provided: {contractors_cache is not None}")
 
-        if contractors_cache:
-            print("[FIND_CONTRACTOR] Using contractors_cache")
-            contractors = list(contractors_cache.values())
-            print(f"[FIND_CONTRACTOR] Extracted {len(contractors)} contractors from cache")
+        # Fuzzy match
+        matcher = self._get_matcher()
+        search_name = f"{first_name} {last_name}"
+
+        batch = self._name_matches
+        batch_hit = bool(contractors_cache and batch and batch[0] is contractors_cache
+                         and batch[1] == matcher.threshold and batch[2] == umbrella_id
+                         and search_name in batch[3])
+        match_result = self._employee_id_match(record, search_name, umbrella_id, contractors_cache)
+        if match_result is not None:
+            print(f"[FIND_CONTRACTOR] Resolved by employee ID: {match_result}")
+        elif batch_hit:
+            match_result = batch[3][search_name]
+            print(f"[FIND_CONTRACTOR] Using batch match from match_names(): {match_result}")
         else:
-            print("[FIND_CONTRACTOR] Cache not provided, calling db.get_contractor_by_name()")
-            contractors = self.db.get_contractor_by_name(first_name, last_name)
-            print(f"[FIND_CONTRACTOR] Retrieved {len(contractors)} contractors from database")
+            match_result = self._alias_match(search_name, umbrella_id, contractors_cache)
 
-        # Fuzzy match
-        threshold = int(self.params.get('NAME_MATCH_THRESHOLD', 75))
-        print(f"[FIND_CONTRACTOR] NAME_MATCH_THRESHOLD: {threshold}")
+        if match_result is None and not batch_hit:
+            if contractors_cache:
+                print("[FIND_CONTRACTOR] Using contractors_cache")
+                contractors = self._get_contractor_index(contractors_cache)
+                print(f"[FIND_CONTRACTOR] Using {len(contractors)} indexed contractors from cache")
+            else:
+                print("[FIND_CONTRACTOR] Cache not provided, calling db.get_contractor_by_name()")
+                contractors = self.db.get_contractor_by_name(first_name, last_name)
+                print(f"[FIND_CONTRACTOR] Retrieved {len(contractors)} contractors from database")
 
-        print("[FIND_CONTRACTOR] Creating FuzzyMatcher instance")
-        matcher = FuzzyMatcher(threshold=threshold)
-        print("[FIND_CONTRACTOR] FuzzyMatcher instance created")
+            print(f"[FIND_CONTRACTOR] Calling matcher.match_contractor_name({first_name}, {last_name}, ...)")
+            match_result = matcher.match_contractor_name(first_name, last_name, contractors)
+            print(f"[FIND_CONTRACTOR] match_contractor_name returned: {match_result}")
 
-        print(f"[FIND_CONTRACTOR] Calling matcher.match_contractor_name({first_name}, {last_name}, ...)")
-        match_result = matcher.match_contractor_name(first_name, last_name, contractors)
-        print(f"[FIND_CONTRACTOR] match_contractor_name returned: {match_result}")
+        # New fuzzy matches become aliases once the file is accepted (see the validation Lambda)
+        if match_result and match_result['match_type'] == 'FUZZY' and umbrella_id and 'alias' not in match_result:
+            variant = matcher.normalize_name(search_name)
+            print(f"[FIND_CONTRACTOR] Collecting learned alias candidate '{variant}' for umbrella {umbrella_id}")
+            self.learned_aliases.setdefault((umbrella_id, variant), (match_result['contractor'], match_result['confidence']))
 
         if not match_result:
             print("[FIND_CONTRACTOR] No match found - returning CRITICAL error")
@@ -364,8 +789,9 @@ class ValidationEngine:
         match_type = match_result.get('match_type')
         print(f"[FIND_CONTRACTOR] match_type: {match_type}")
 
-        if match_type == 'FUZZY':
-            print("[FIND_CONTRACTOR] Match type is FUZZY - returning with warning")
+        # Swapped first/last names resolve without scoring but are still flagged
+        if match_type in ('FUZZY', 'SWAPPED'):
+            print(f"[FIND_CONTRACTOR] Match type is {match_type} - returning with warning")
             confidence = match_result.get('confidence')
             contractor_full_name = f"{contractor['FirstName']} {contractor['LastName']}"
             searched_name = match_result.get('searched_name')
@@ -377,11 +803,13 @@ class ValidationEngine:
                 'contractor_id': contractor_id,
                 'contractor': contractor,
                 'warning': {
-                    'warning_type': 'FUZZY_NAME_MATCH',
+                    'warning_type': f"{match_type}_NAME_MATCH",
                     'row_number': record.get('row_number'),
                     'warning_message': f"Name '{first_name} {last_name}' matched to '{contractor_full_name}' with {confidence}% confidence",
                     'auto_resolved': True,
-                    'resolution_notes': f"Fuzzy matched: {searched_name} → {matched_name}"
+                    'resolution_notes': f"{'Name parts swapped' if match_type == 'SWAPPED' else 'Fuzzy matched'}: {searched_name} → {matched_name}"
+                                        + (f" (learned alias, first seen in file {match_result['alias'].get('FirstSeenFileID')})"
+                                           if 'alias' in match_result else '')
                 }
             }
             print(f"[FIND_CONTRACTOR] Returning fuzzy match result: {fuzzy_result}")
@@ -418,9 +846,13 @@ class ValidationEngine:
             print("[VALIDATE_UMBRELLA_ASSOCIATION] contractor_id is empty - returning error")
             return {'valid': False, 'error': {'error_type': 'NO_CONTRACTOR_ID'}}
 
-        # Get all associations for contractor
-        print(f"[VALIDATE_UMBRELLA_ASSOCIATION] Calling db.get_contractor_umbrella_associations({contractor_id})")
-        associations = self.db.get_contractor_umbrella_associations(contractor_id)
+        # Get all associations for contractor (only this umbrella's matter)
+        if self._associations is not None and umbrella_id == self._associations_umbrella:
+            print(f"[VALIDATE_UMBRELLA_ASSOCIATION] Reading prefetched associations for {contractor_id}")
+            associations = self._associations.for_contractor(umbrella_id, contractor_id)
+        else:
+            print(f"[VALIDATE_UMBRELLA_ASSOCIATION] Calling db.get_contractor_umbrella_associations({contractor_id})")
+            associations = self.db.get_contractor_umbrella_associations(contractor_id)
         print(f"[VALIDATE_UMBRELLA_ASSOCIATION] Retrieved {len(associations)} associations")
 
         period_start = period_data.get('WorkStartDate')
@@ -496,36 +928,29 @@ class ValidationEngine:
         """
         print("[VALIDATE_VAT] Starting validate_vat()")
 
-        amount_str = record['amount']
-        print(f"[VALIDATE_VAT] Retrieved amount string: {amount_str}")
-
-        amount = Decimal(str(amount_str))
-        print(f"[VALIDATE_VAT] Converted amount to Decimal: {amount}")
+        amount = Money.parse(record['amount'])
+        print(f"[VALIDATE_VAT] Amount: {amount}")
 
-        vat_amount_str = record['vat_amount']
-        print(f"[VALIDATE_VAT] Retrieved vat_amount string: {vat_amount_str}")
+        vat_amount = Money.parse(record['vat_amount'])
+        print(f"[VALIDATE_VAT] VAT amount: {vat_amount}")
 
-        vat_amount = Decimal(str(vat_amount_str))
-        print(f"[VALIDATE_VAT] Converted vat_amount to Decimal: {vat_amount}")
+        vat_rate = self._decimal_param('VAT_RATE', 0.20)
+        print(f"[VALIDATE_VAT] VAT rate: {vat_rate}")
 
-        vat_rate_value = self.params.get('VAT_RATE', 0.20)
-        print(f"[VALIDATE_VAT] Retrieved VAT_RATE from params: {vat_rate_value}")
-
-        vat_rate = Decimal(str(vat_rate_value))
-        print(f"[VALIDATE_VAT] Converted vat_rate to Decimal: {vat_rate}")
-
-        expected_vat = amount * vat_rate
+        # Exact, in pence
+        expected_vat_pence = amount.scale(vat_rate)
+        expected_vat = pence_to_pounds(expected_vat_pence)
         print(f"[VALIDATE_VAT] Calculated expected_vat: {amount} * {vat_rate} = {expected_vat}")
 
         # Allow 1p tolerance for rounding
-        tolerance = Decimal('0.01')
-        print(f"[VALIDATE_VAT] Set tolerance to: {tolerance}")
+        tolerance_pence = 1
+        print(f"[VALIDATE_VAT] Set tolerance to: {tolerance_pence}p")
 
-        difference = abs(vat_amount - expected_vat)
-        print(f"[VALIDATE_VAT] Calculated difference: abs({vat_amount} - {expected_vat}) = {difference}")
+        difference_pence = abs(vat_amount - expected_vat_pence)
+        print(f"[VALIDATE_VAT] Calculated difference: {difference_pence}p")
 
-        if difference > tolerance:
-            print(f"[VALIDATE_VAT] Difference ({difference}) exceeds tolerance ({tolerance}) - returning error")
+        if difference_pence > tolerance_pence:
+            print(f"[VALIDATE_VAT] Difference ({difference_pence}p) exceeds tolerance ({tolerance_pence}p) - returning error")
             error_dict = {
                 'valid': False,
                 'error': {
@@ -565,48 +990,28 @@ class ValidationEngine:
         print(f"[VALIDATE_OVERTIME_RATE] contractor_id={contractor_id}, period_id={period_data.get('PeriodNumber')}")
 
         print("[VALIDATE_OVERTIME_RATE] About to execute: Extract overtime day_rate from record")
-        day_rate_str = record['day_rate']
-        print(f"[VALIDATE_OVERTIME_RATE] Retrieved day_rate string: {day_rate_str}")
-
-        overtime_rate = Decimal(str(day_rate_str))
-        print(f"[VALIDATE_OVERTIME_RATE] Converted overtime_rate to Decimal: {overtime_rate}")
+        overtime_rate = Money.parse(record['day_rate'])
+        print(f"[VALIDATE_OVERTIME_RATE] Overtime rate: {overtime_rate}")
 
-        print("[VALIDATE_OVERTIME_RATE] About to execute: Get overtime multiplier from system params")
-        multiplier_value = self.params.get('OVERTIME_MULTIPLIER', 1.5)
-        print(f"[VALIDATE_OVERTIME_RATE] Retrieved OVERTIME_MULTIPLIER from params: {multiplier_value}")
-
-        multiplier = Decimal(str(multiplier_value))
-        print(f"[VALIDATE_OVERTIME_RATE] Converted multiplier to Decimal: {multiplier}")
-
-        print("[VALIDATE_OVERTIME_RATE] About to execute: Get tolerance percent from system params")
-        tolerance_percent_value = self.params.get('OVERTIME_TOLERANCE_PERCENT', 2.0)
-        print(f"[VALIDATE_OVERTIME_RATE] Retrieved OVERTIME_TOLERANCE_PERCENT from params: {tolerance_percent_value}")
-
-        tolerance_percent = Decimal(str(tolerance_percent_value))
-        print(f"[VALIDATE_OVERTIME_RATE] Converted tolerance_percent to Decimal: {tolerance_percent}")
+        print("[VALIDATE_OVERTIME_RATE] About to execute: Get overtime multiplier and tolerance from system params")
+        multiplier = self._decimal_param('OVERTIME_MULTIPLIER', 1.5)
+        tolerance_percent = self._decimal_param('OVERTIME_TOLERANCE_PERCENT', 2.0)
+        print(f"[VALIDATE_OVERTIME_RATE] multiplier={multiplier}, tolerance_percent={tolerance_percent}")
 
         # Lookup contractor's normal rate from current period
         print("[VALIDATE_OVERTIME_RATE] About to execute: Query contractor's normal rate for current period")
         period_id = str(period_data.get('PeriodNumber'))
         print(f"[VALIDATE_OVERTIME_RATE] period_id={period_id}")
 
-        print(f"[VALIDATE_OVERTIME_RATE] About to execute: db.get_contractor_rate_in_period({contractor_id}, {period_id})")
-        normal_rate = self.db.get_contractor_rate_in_period(contractor_id, period_id)
+        print(f"[VALIDATE_OVERTIME_RATE] About to execute: _rate_in_period({contractor_id}, {period_id})")
+        normal_rate = self._rate_in_period(contractor_id, period_id)
         print(f"[VALIDATE_OVERTIME_RATE] Retrieved normal_rate from current period: {normal_rate}")
 
         # If not found in current period, try to get from recent pay history
         if not normal_rate:
             print("[VALIDATE_OVERTIME_RATE] Normal rate not found in current period, checking recent pay history")
-            print(f"[VALIDATE_OVERTIME_RATE] About to execute: db.get_contractor_pay_records({contractor_id}, limit=5)")
-            recent_records = self.db.get_contractor_pay_records(contractor_id, limit=5)
-            print(f"[VALIDATE_OVERTIME_RATE] Retrieved {len(recent_records)} recent records")
-
-            if recent_records:
-                print("[VALIDATE_OVERTIME_RATE] About to execute: Extract DayRate from most recent STANDARD record")
-                normal_rate = recent_records[0].get('DayRate')
-                print(f"[VALIDATE_OVERTIME_RATE] Extracted normal_rate from most recent record: {normal_rate}")
-            else:
-                print("[VALIDATE_OVERTIME_RATE] No recent pay records found for contractor")
+            normal_rate = self._latest_rate(contractor_id)
+            print(f"[VALIDATE_OVERTIME_RATE] normal_rate from most recent STANDARD record: {normal_rate}")
 
         # If we still don't have normal rate, we cannot validate
         if not normal_rate:
@@ -626,32 +1031,28 @@ class ValidationEngine:
             print(f"[VALIDATE_OVERTIME_RATE] Returning error: {error_dict}")
             return error_dict
 
-        print("[VALIDATE_OVERTIME_RATE] About to execute: Convert normal_rate to Decimal for calculation")
-        normal_rate = Decimal(str(normal_rate))
-        print(f"[VALIDATE_OVERTIME_RATE] Converted normal_rate to Decimal: {normal_rate}")
+        print("[VALIDATE_OVERTIME_RATE] About to execute: Convert normal_rate to Money for calculation")
+        normal_rate = Money.parse(normal_rate)
+        print(f"[VALIDATE_OVERTIME_RATE] Normal rate: {normal_rate}")
 
+        # All in pence; expected and tolerance are exact Decimals, not rounded
         print("[VALIDATE_OVERTIME_RATE] About to execute: Calculate expected overtime rate")
-        expected_overtime_rate = normal_rate * multiplier
+        expected_pence = normal_rate.scale(multiplier)
+        expected_overtime_rate = pence_to_pounds(expected_pence)
         print(f"[VALIDATE_OVERTIME_RATE] Calculated expected_overtime_rate: {normal_rate} * {multiplier} = {expected_overtime_rate}")
 
         print("[VALIDATE_OVERTIME_RATE] About to execute: Calculate tolerance amount")
-        tolerance_amount = expected_overtime_rate * (tolerance_percent / Decimal('100'))
-        print(f"[VALIDATE_OVERTIME_RATE] Calculated tolerance_amount: {expected_overtime_rate} * ({tolerance_percent}/100) = {tolerance_amount}")
-
-        print("[VALIDATE_OVERTIME_RATE] About to execute: Calculate min and max acceptable overtime rates")
-        min_acceptable_rate = expected_overtime_rate - tolerance_amount
-        max_acceptable_rate = expected_overtime_rate + tolerance_amount
-        print(f"[VALIDATE_OVERTIME_RATE] Acceptable range: {min_acceptable_rate:.2f} to {max_acceptable_rate:.2f}")
+        tolerance_pence = expected_pence * tolerance_percent / Decimal('100')
+        print(f"[VALIDATE_OVERTIME_RATE] Calculated tolerance: {tolerance_pence}p ({tolerance_percent}%)")
 
-        print("[VALIDATE_OVERTIME_RATE] About to execute: Calculate actual difference")
-        difference = abs(overtime_rate - expected_overtime_rate)
-        print(f"[VALIDATE_OVERTIME_RATE] Calculated difference: abs({overtime_rate} - {expected_overtime_rate}) = {difference}")
+        difference_pence = abs(overtime_rate - expected_pence)
+        print(f"[VALIDATE_OVERTIME_RATE] Calculated difference: {difference_pence}p")
 
         print(f"[VALIDATE_OVERTIME_RATE] About to execute: Check if overtime_rate {overtime_rate} is within acceptable range")
-        if overtime_rate < min_acceptable_rate or overtime_rate > max_acceptable_rate:
+        if difference_pence > tolerance_pence:
             print(f"[VALIDATE_OVERTIME_RATE] Overtime rate {overtime_rate} is OUTSIDE acceptable range - returning error")
 
-            percent_diff = (difference / expected_overtime_rate) * Decimal('100')
+            percent_diff = (difference_pence / expected_pence) * Decimal('100')
             print(f"[VALIDATE_OVERTIME_RATE] Calculated percent_diff: {percent_diff:.2f}%")
 
             error_dict = {
@@ -708,8 +1109,8 @@ class ValidationEngine:
         print(f"[CHECK_RATE_CHANGE] previous_period_num={previous_period_num}")
 
         print("[CHECK_RATE_CHANGE] About to execute: Query contractor's rate from previous period")
-        print(f"[CHECK_RATE_CHANGE] Calling db.get_contractor_rate_in_period({contractor_id}, {previous_period_num})")
-        previous_rate = self.db.get_contractor_rate_in_period(contractor_id, str(previous_period_num))
+        print(f"[CHECK_RATE_CHANGE] Calling _rate_in_period({contractor_id}, {previous_period_num})")
+        previous_rate = self._rate_in_period(contractor_id, str(previous_period_num))
         print(f"[CHECK_RATE_CHANGE] Retrieved previous_rate from period {previous_period_num}: {previous_rate}")
 
         print("[CHECK_RATE_CHANGE] About to execute: Check if previous_rate exists")
@@ -718,24 +1119,20 @@ class ValidationEngine:
             print("[CHECK_RATE_CHANGE] This might be contractor's first period, checking further back")
 
             print("[CHECK_RATE_CHANGE] About to execute: Query recent pay records as fallback")
-            print(f"[CHECK_RATE_CHANGE] Calling db.get_contractor_pay_records({contractor_id}, limit=5)")
-            recent_records = self.db.get_contractor_pay_records(contractor_id, limit=5)
-            print(f"[CHECK_RATE_CHANGE] Retrieved {len(recent_records)} recent records")
-
-            if recent_records:
-                print("[CHECK_RATE_CHANGE] About to execute: Extract DayRate from most recent record")
-                previous_rate = recent_records[0].get('DayRate')
-                print(f"[CHECK_RATE_CHANGE] Extracted previous_rate from most recent record: {previous_rate}")
+            previous_rate = self._latest_rate(contractor_id)
+
+            if previous_rate is not None:
+                print(f"[CHECK_RATE_CHANGE] previous_rate from most recent record: {previous_rate}")
             else:
                 print("[CHECK_RATE_CHANGE] No previous pay records found - this is contractor's first payment")
                 print("[CHECK_RATE_CHANGE] Returning no warning (warning=None)")
                 return {'warning': None}
 
-        print("[CHECK_RATE_CHANGE] About to execute: Convert rates to Decimal for comparison")
-        new_rate_decimal = Decimal(str(new_rate))
+        print("[CHECK_RATE_CHANGE] About to execute: Convert rates to Money for comparison")
+        new_rate_decimal = Money.parse(new_rate)
         print(f"[CHECK_RATE_CHANGE] new_rate_decimal={new_rate_decimal}")
 
-        previous_rate_decimal = Decimal(str(previous_rate))
+        previous_rate_decimal = Money.parse(previous_rate)
         print(f"[CHECK_RATE_CHANGE] previous_rate_decimal={previous_rate_decimal}")
 
         print("[CHECK_RATE_CHANGE] About to execute: Calculate rate change amount and percentage")
@@ -749,11 +1146,11 @@ class ValidationEngine:
             return {'warning': None}
 
         print("[CHECK_RATE_CHANGE] About to execute: Calculate percentage change")
-        rate_change_percent = (rate_change_amount / previous_rate_decimal) * Decimal('100')
+        rate_change_percent = (Decimal(rate_change_amount) / Decimal(previous_rate_decimal)) * Decimal('100')
         print(f"[CHECK_RATE_CHANGE] rate_change_percent=({rate_change_amount}/{previous_rate_decimal}) * 100 = {rate_change_percent:.2f}%")
 
         print("[CHECK_RATE_CHANGE] About to execute: Get alert threshold from system params")
-        alert_threshold = Decimal(str(self.params.get('RATE_CHANGE_ALERT_PERCENT', 5.0)))
+        alert_threshold = self._decimal_param('RATE_CHANGE_ALERT_PERCENT', 5.0)
         print(f"[CHECK_RATE_CHANGE] alert_threshold={alert_threshold}%")
 
         print("[CHECK_RATE_CHANGE] About to execute: Check if absolute rate change exceeds threshold")
@@ -0,0 +1,311 @@
+"""
+Direct xlsx reader for large pay files
+Streams the worksheet XML out of the zip with iterparse and only decodes the
+columns the parser actually maps
+"""
+
+print("[XLSX_READER_MODULE] Starting xlsx_reader.py module load")
+
+import posixpath
+import zipfile
+from typing import Iterator, Optional, Set, Tuple
+from xml.etree.ElementTree import iterparse
+
+print("[XLSX_READER_MODULE] Imported posixpath, zipfile, typing, iterparse")
+
+# Value conversion is delegated to openpyxl helpers so cells decode exactly as
+# they do in the openpyxl engines
+from openpyxl.reader.strings import read_string_table
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+print("[XLSX_READER_MODULE] Imported openpyxl conversion helpers")
+
+SHEET_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+SHEET_DATA_TAG = f'{{{SHEET_MAIN_NS}}}sheetData'
+ROW_TAG = f'{{{SHEET_MAIN_NS}}}row'
+CELL_TAG = f'{{{SHEET_MAIN_NS}}}c'
+VALUE_TAG = f'{{{SHEET_MAIN_NS}}}v'
+INLINE_STRING_TAG = f'{{{SHEET_MAIN_NS}}}is'
+TEXT_TAG = f'{{{SHEET_MAIN_NS}}}t'
+RUN_TAG = f'{{{SHEET_MAIN_NS}}}r'
+
+DEFAULT_SHEET_PATH = 'xl/worksheets/sheet1.xml'
+
+print(f"[XLSX_READER_MODULE] DEFAULT_SHEET_PATH={DEFAULT_SHEET_PATH}")
+
+
+def column_index(coordinate: str) -> int:
+    """1-based column index from a cell reference such as 'AB12'"""
+    idx = 0
+    for char in coordinate:
+        if char.isdigit():
+            break
+        idx = idx * 26 + (ord(char.upper()) - 64)
+    return idx
+
+
+def worksheet_xml_size(source) -> Optional[int]:
+    """
+    Uncompressed size of the largest worksheet part, read from the zip directory
+
+    Nothing is decompressed, so this is cheap even for very large workbooks.
+    File objects are returned to their starting position.
+
+    Returns:
+        Size in bytes, or None if source is not a readable xlsx zip
+    """
+    position = source.tell() if hasattr(source, 'tell') else None
+    try:
+        with zipfile.ZipFile(source) as archive:
+            sizes = [info.file_size for info in archive.infolist()
+                     if info.filename.startswith('xl/worksheets/') and info.filename.endswith('.xml')]
+        return max(sizes) if sizes else None
+    except (zipfile.BadZipFile, OSError) as e:
+        print(f"[WORKSHEET_XML_SIZE] Could not read zip directory: {type(e).__name__}: {str(e)}")
+        return None
+    finally:
+        if position is not None:
+            source.seek(position)
+
+
+class XlsxReader:
+    """
+    Workbook-level reader: opens the zip, loads shared strings and date styles,
+    and hands out the active worksheet
+    """
+
+    def __init__(self, source):
+        """
+        Initialize reader
+
+        Args:
+            source: Path or seekable binary file object of an .xlsx file
+        """
+        print(f"[XLSX_READER_INIT] Opening xlsx archive: {source}")
+
+        self.archive = zipfile.ZipFile(source)
+        names = set(self.archive.namelist())
+        print(f"[XLSX_READER_INIT] Archive contains {len(names)} parts")
+
+        self.epoch = CALENDAR_WINDOWS_1900
+        self.sheet_path = self._find_active_sheet(names)
+        print(f"[XLSX_READER_INIT] Active sheet part: {self.sheet_path}, epoch={self.epoch}")
+
+        self.shared_strings = []
+        if 'xl/sharedStrings.xml' in names:
+            with self.archive.open('xl/sharedStrings.xml') as stream:
+                self.shared_strings = read_string_table(stream)
+        print(f"[XLSX_READER_INIT] Loaded {len(self.shared_strings)} shared strings")
+
+        self.date_styles, self.timedelta_styles = set(), set()
+        if 'xl/styles.xml' in names:
+            self.date_styles, self.timedelta_styles = self._read_date_styles()
+        print(f"[XLSX_READER_INIT] Date styles: {sorted(self.date_styles)}")
+
+        self.active = XlsxSheet(self)
+        print(f"[XLSX_READER_INIT] Initialization complete")
+
+    def _find_active_sheet(self, names: Set[str]) -> str:
+        """Resolve the active sheet's part name from workbook.xml and its rels"""
+        if 'xl/workbook.xml' not in names or 'xl/_rels/workbook.xml.rels' not in names:
+            print(f"[XLSX_FIND_ACTIVE_SHEET] Workbook parts missing, using {DEFAULT_SHEET_PATH}")
+            return DEFAULT_SHEET_PATH
+
+        sheet_rel_ids = []
+        active_tab = None
+        with self.archive.open('xl/workbook.xml') as stream:
+            for _, elem in iterparse(stream):
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag == 'sheet':
+                    sheet_rel_ids.append(elem.get(f'{{{REL_NS}}}id'))
+                elif tag == 'workbookView' and active_tab is None and elem.get('activeTab') is not None:
+                    active_tab = int(elem.get('activeTab'))
+                elif tag == 'workbookPr' and elem.get('date1904') in ('1', 'true'):
+                    self.epoch = CALENDAR_MAC_1904
+
+        targets = {}
+        with self.archive.open('xl/_rels/workbook.xml.rels') as stream:
+            for _, elem in iterparse(stream):
+                if elem.tag == f'{{{PKG_REL_NS}}}Relationship':
+                    targets[elem.get('Id')] = elem.get('Target')
+
+        active_tab = active_tab or 0
+        if active_tab >= len(sheet_rel_ids) or sheet_rel_ids[active_tab] not in targets:
+            print(f"[XLSX_FIND_ACTIVE_SHEET] Active tab {active_tab} not resolvable, using {DEFAULT_SHEET_PATH}")
+            return DEFAULT_SHEET_PATH
+
+        target = targets[sheet_rel_ids[active_tab]]
+        if target.startswith('/'):
+            return target.lstrip('/')
+        return posixpath.normpath(posixpath.join('xl', target))
+
+    def _read_date_styles(self) -> Tuple[Set[int], Set[int]]:
+        """Indexes of cell styles whose number format is a date or timedelta"""
+        custom_formats = {}
+        cell_formats = []
+        in_cell_xfs = False
+
+        with self.archive.open('xl/styles.xml') as stream:
+            for event, elem in iterparse(stream, events=('start', 'end')):
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag == 'cellXfs':
+                    in_cell_xfs = event == 'start'
+                elif event == 'end' and tag == 'numFmt':
+                    custom_formats[int(elem.get('numFmtId'))] = elem.get('formatCode')
+                elif event == 'end' and tag == 'xf' and in_cell_xfs:
+                    cell_formats.append(int(elem.get('numFmtId', 0)))
+
+        date_styles, timedelta_styles = set(), set()
+        for idx, fmt_id in enumerate(cell_formats):
+            fmt = custom_formats.get(fmt_id) or builtin_format_code(fmt_id)
+            if is_date_format(fmt):
+                date_styles.add(idx)
+            if is_timedelta_format(fmt):
+                timedelta_styles.add(idx)
+
+        return date_styles, timedelta_styles
+
+    def close(self):
+        """Close the archive"""
+        print(f"[XLSX_READER_CLOSE] Closing archive")
+        self.archive.close()
+
+
+class XlsxSheet:
+    """
+    Worksheet rows straight from the sheet XML
+
+    Mirrors the subset of openpyxl's worksheet API the parser uses:
+    iter_rows(min_row, max_row, max_col, values_only=True). Once columns are
+    projected, cells outside the projection are skipped without being decoded
+    and come back as None.
+    """
+
+    def __init__(self, reader: XlsxReader):
+        self.reader = reader
+        self.columns: Optional[Set[int]] = None
+
+    def project_columns(self, columns: Optional[Set[int]]):
+        """
+        Restrict decoding to a set of 0-based column indexes (None = all columns)
+
+        Takes effect immediately, including on row iterators already in progress.
+        """
+        print(f"[XLSX_SHEET_PROJECT] Projecting columns: {sorted(columns) if columns is not None else 'ALL'}")
+        self.columns = set(columns) if columns is not None else None
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  max_col: Optional[int] = None, values_only: bool = True) -> Iterator[tuple]:
+        """Yield row value tuples, including empty tuples for rows missing from the XML"""
+        if not values_only:
+            raise ValueError("XlsxSheet only supports values_only=True")
+
+        with self.reader.archive.open(self.reader.sheet_path) as stream:
+            sheet_data = None
+            expected_row = 1
+
+            for event, elem in iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == SHEET_DATA_TAG:
+                        sheet_data = elem
+                    continue
+
+                if elem.tag != ROW_TAG:
+                    continue
+
+                row_idx = int(elem.get('r') or expected_row)
+
+                # Rows with no cells at all are left out of the XML
+                while expected_row < row_idx:
+                    if max_row is not None and expected_row > max_row:
+                        return
+                    if expected_row >= min_row:
+                        yield ()
+                    expected_row += 1
+
+                if max_row is not None and row_idx > max_row:
+                    return
+
+                if row_idx >= min_row:
+                    yield self._row_values(elem, max_col)
+                expected_row = row_idx + 1
+
+                # Drop parsed rows so memory stays flat
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+    def _row_values(self, row_elem, max_col: Optional[int]) -> tuple:
+        """Decode the cells of one <row> element"""
+        values = []
+        col = 0
+        columns = self.columns
+
+        for cell in row_elem:
+            if cell.tag != CELL_TAG:
+                continue
+
+            coordinate = cell.get('r')
+            col = column_index(coordinate) if coordinate else col + 1
+
+            if max_col is not None and col > max_col:
+                break
+            if columns is not None and (col - 1) not in columns:
+                continue
+
+            value = self._cell_value(cell)
+            if value is None:
+                continue
+
+            if len(values) < col:
+                values.extend([None] * (col - len(values)))
+            values[col - 1] = value
+
+        return tuple(values)
+
+    def _cell_value(self, cell):
+        """Decode a <c> element the same way openpyxl does with data_only=True"""
+        data_type = cell.get('t', 'n')
+
+        if data_type == 'inlineStr':
+            inline = cell.find(INLINE_STRING_TAG)
+            if inline is None:
+                return None
+            return self._text_content(inline)
+
+        value = cell.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+
+        if data_type == 'n':
+            number = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+            style_id = int(cell.get('s') or 0)
+            if style_id in self.reader.date_styles:
+                try:
+                    return from_excel(number, self.reader.epoch,
+                                      timedelta=style_id in self.reader.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return '#VALUE!'
+            return number
+        if data_type == 's':
+            return self.reader.shared_strings[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'd':
+            return from_ISO8601(value)
+
+        # 'str' (formula result) and 'e' (error) keep the raw text
+        return value
+
+    @staticmethod
+    def _text_content(element) -> str:
+        """Plain text plus rich text runs, ignoring phonetic hints"""
+        snippets = [element.findtext(TEXT_TAG) or ''] if element.find(TEXT_TAG) is not None else []
+        for run in element.findall(RUN_TAG):
+            snippets.append(run.findtext(TEXT_TAG) or '')
+        return ''.join(snippets)
+
+print("[XLSX_READER_MODULE] xlsx_reader.py module load complete")
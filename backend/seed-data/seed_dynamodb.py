@@ -41,6 +41,10 @@ def seed_system_parameters(table):
         ('OVERTIME_TOLERANCE_PERCENT', '2.0', 'DECIMAL', 'Allowed variance in overtime rate (%)', True),
         ('RATE_CHANGE_ALERT_PERCENT', '5.0', 'DECIMAL', 'Alert if rate changes by more than this %', True),
         ('NAME_MATCH_THRESHOLD', '85', 'INTEGER', 'Fuzzy name matching threshold (0-100)', True),
+        ('PARSE_STREAMING_MIN_BYTES', '2000000', 'INTEGER', 'Sheet XML size (bytes) at which files are parsed in streaming mode', True),
+        ('PARSE_XML_MIN_BYTES', '16000000', 'INTEGER', 'Sheet XML size (bytes) at which files are parsed with the direct XML reader', True),
+        ('SUPERSEDE_MODE', 'diff', 'STRING', "How a resubmitted file replaces the old one's records: 'diff' (changed rows only) or 'full'", True),
+        ('NAME_BLOCKING_NGRAM_SIZE', '3', 'INTEGER', 'N-gram length for name-match candidate blocking on large registries (smaller = more recall, 0 = off)', True),
     ]
 
     with table.batch_writer() as batch:
@@ -127,6 +131,15 @@ def seed_permanent_staff(table):
                 'GSI2SK': f'NAME#{normalized_name}'
             })
 
+        # Warm validation Lambdas reload their permanent staff set when this changes
+        batch.put_item(Item={
+            'PK': 'PERMANENT_STAFF',
+            'SK': 'VERSION',
+            'EntityType': 'PermanentStaffVersion',
+            'Version': str(uuid.uuid4()),
+            'UpdatedAt': datetime.utcnow().isoformat() + 'Z'
+        })
+
     print(f"✓ Inserted {len(staff)} permanent staff members")
     print("  → These names will trigger CRITICAL errors if found in pay files")
 
@@ -344,7 +357,7 @@ def verify_seed_data(table):
 
     # Count items by entity type
     checks = {
-        'System parameters': ('PARAM#', 6),
+        'System parameters': ('PARAM#', 10),
         'Umbrella companies': ('UMBRELLA#', 6),
         'Permanent staff': ('PERMANENT#', 4),
         'Pay periods': ('PERIOD#', 13),
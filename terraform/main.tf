@@ -1,5 +1,5 @@
 terraform {
-  required_version = ">= 1.0"
+  required_version = ">= 1.4"
 
   required_providers {
     aws = {
@@ -142,10 +142,44 @@ resource "aws_s3_bucket_public_access_block" "pay_files" {
 }
 
 # Lambda Layer
+# Built like `sam build` does: the layer source plus requirements.txt
+# installed into python/ for the Lambda runtime (python3.12, arm64), so
+# binary dependencies such as numpy are the Linux wheels
+locals {
+  common_layer_source = "${path.module}/../backend/layers/common"
+  common_layer_build  = "${path.module}/.terraform/build/common_layer"
+}
+
+resource "terraform_data" "common_layer_build" {
+  triggers_replace = [
+    filesha256("${local.common_layer_source}/requirements.txt"),
+    sha256(join("", [for f in sort(fileset("${local.common_layer_source}/python/common", "*.py")) : filesha256("${local.common_layer_source}/python/common/${f}")]))
+  ]
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      set -e
+      rm -rf "${local.common_layer_build}"
+      mkdir -p "${local.common_layer_build}"
+      cp -R "${local.common_layer_source}/." "${local.common_layer_build}/"
+      python3 -m pip install \
+        --requirement "${local.common_layer_source}/requirements.txt" \
+        --target "${local.common_layer_build}/python" \
+        --platform manylinux2014_aarch64 \
+        --implementation cp \
+        --python-version 3.12 \
+        --only-binary=:all: \
+        --upgrade
+    EOT
+  }
+}
+
 data "archive_file" "common_layer" {
   type        = "zip"
-  source_dir  = "${path.module}/../backend/layers/common"
+  source_dir  = local.common_layer_build
   output_path = "${path.module}/.terraform/lambda/common_layer.zip"
+
+  depends_on = [terraform_data.common_layer_build]
 }
 
 resource "aws_lambda_layer_version" "common" {
@@ -379,6 +413,24 @@ resource "aws_s3_bucket_notification" "bucket_notification" {
     filter_suffix       = ".xlsx"
   }
 
+  lambda_function {
+    lambda_function_arn = aws_lambda_function.file_upload_handler.arn
+    events              = ["s3:ObjectCreated:*"]
+    filter_suffix       = ".csv"
+  }
+
+  lambda_function {
+    lambda_function_arn = aws_lambda_function.file_upload_handler.arn
+    events              = ["s3:ObjectCreated:*"]
+    filter_suffix       = ".tsv"
+  }
+
+  lambda_function {
+    lambda_function_arn = aws_lambda_function.file_upload_handler.arn
+    events              = ["s3:ObjectCreated:*"]
+    filter_suffix       = ".tab"
+  }
+
   depends_on = [aws_lambda_permission.s3_trigger]
 }
 
@@ -678,10 +730,11 @@ resource "aws_sfn_state_machine" "contractor_pay_workflow" {
         Type     = "Task"
         Resource = aws_lambda_function.file_processor.arn
         Parameters = {
-          "action"       = "import_records"
-          "fileId.$"     = "$.fileId"
-          "records.$"    = "$.parsedRecords.records"
-          "validation.$" = "$.validation"
+          "action"            = "import_records"
+          "fileId.$"          = "$.fileId"
+          "records.$"         = "$.parsedRecords.records"
+          "validation.$"      = "$.validation"
+          "duplicate_check.$" = "$.duplicates"
         }
         ResultPath = "$.import"
         Next       = "MarkComplete"
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for common.excel_parser
+
+Times PayFileParser construction, find_header_row and parse_records for each
+parse engine against the InputData corpus and against generated workbooks of
+increasing size, and writes a JSON results file that can be compared between
+commits.
+
+Usage:
+    python tests/benchmarks/bench_excel_parser.py
+    python tests/benchmarks/bench_excel_parser.py --sizes 1000 10000 --engines xml streaming
+    python tests/benchmarks/bench_excel_parser.py --output new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'backend', 'layers', 'common', 'python'))
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from common.excel_parser import PARSE_ENGINES, PARSER_VERSION, PayFileParser
+    from common.header_profiles import HeaderProfileRegistry
+
+from synthetic_pay_files import generate_pay_file  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+PHASES = ('construct', 'find_header_row', 'parse_records')
+
+def _run_phase(path, engine, phase):
+    """Run one phase on a fresh parser and return (rows, seconds) - construction is only timed for 'construct'"""
+    started = time.perf_counter()
+    parser = PayFileParser(path, engine=engine, header_profiles=HeaderProfileRegistry())
+    try:
+        if phase == 'construct':
+            return 0, time.perf_counter() - started
+        started = time.perf_counter()
+        if phase == 'find_header_row':
+            parser.find_header_row()
+            return 0, time.perf_counter() - started
+        rows = len(parser.parse_records())
+        return rows, time.perf_counter() - started
+    finally:
+        parser.close()
+
+
+def measure(paths, engine, phase, repeat):
+    """
+    Time a phase over a set of files
+
+    Wall time is the median of `repeat` untraced runs; peak memory comes from
+    one extra run under tracemalloc so tracing overhead does not skew timings.
+    Peak memory always includes the workbook load, since every phase needs it.
+
+    Returns:
+        Result dict: files, engine, phase, rows, wall_seconds, min_seconds, rows_per_sec, peak_bytes
+    """
+    timings = []
+    rows = 0
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(repeat):
+            elapsed = 0.0
+            rows = 0
+            for path in paths:
+                file_rows, file_elapsed = _run_phase(path, engine, phase)
+                rows += file_rows
+                elapsed += file_elapsed
+            timings.append(elapsed)
+
+        peak = 0
+        for path in paths:
+            tracemalloc.start()
+            _run_phase(path, engine, phase)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    wall = statistics.median(timings)
+    return {
+        'files': len(paths),
+        'engine': engine,
+        'phase': phase,
+        'rows': rows,
+        'wall_seconds': round(wall, 6),
+        'min_seconds': round(min(timings), 6),
+        'rows_per_sec': round(rows / wall, 1) if rows and wall else None,
+        'peak_bytes': peak
+    }
+
+
+def run_suite(datasets, engines, repeat, report=print):
+    """Benchmark every dataset x engine x phase"""
+    results = []
+    for name, paths in datasets:
+        for engine in engines:
+            for phase in PHASES:
+                result = {'dataset': name}
+                result.update(measure(paths, engine, phase, repeat))
+                results.append(result)
+                report(_format_result(result))
+    return results
+
+
+def _format_result(result):
+    rate = f"{result['rows_per_sec']:>12.0f} rows/s" if result['rows_per_sec'] else ' ' * 19
+    return (f"  {result['dataset']:<16} {result['engine']:<10} {result['phase']:<16} "
+            f"{result['wall_seconds']:>9.4f}s {rate}  peak {result['peak_bytes'] / 1024 / 1024:>8.2f} MiB")
+
+
+def _result_key(result):
+    return f"{result['dataset']}/{result['engine']}/{result['phase']}"
+
+
+def compare(previous, current, report=print):
+    """Print the wall-time and peak-memory ratio of current vs previous for matching entries"""
+    before = {_result_key(r): r for r in previous['results']}
+    for result in current['results']:
+        old = before.get(_result_key(result))
+        if not old or not old['wall_seconds']:
+            continue
+        time_ratio = result['wall_seconds'] / old['wall_seconds']
+        mem_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 0
+        report(f"  {_result_key(result):<50} time x{time_ratio:>6.2f}  peak x{mem_ratio:>6.2f}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark PayFileParser')
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES, help='Generated workbook row counts')
+    parser.add_argument('--engines', nargs='+', choices=PARSE_ENGINES, default=list(PARSE_ENGINES), help='Parse engines')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per measurement')
+    parser.add_argument('--input-dir', default=os.path.join(REPO_ROOT, 'InputData'), help='Real pay file corpus')
+    parser.add_argument('--work-dir', default=None, help='Where generated workbooks are kept (default: temp dir)')
+    parser.add_argument('--output', default='parser-benchmark.json', help='JSON results file')
+    parser.add_argument('--compare', default=None, help='Previous results file to compare against')
+    args = parser.parse_args(argv)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='parser-bench-')
+    os.makedirs(work_dir, exist_ok=True)
+
+    datasets = []
+    corpus = sorted(glob.glob(os.path.join(args.input_dir, '*.xlsx')))
+    if corpus:
+        datasets.append(('InputData', corpus))
+
+    for size in args.sizes:
+        path = os.path.join(work_dir, f'generated_{size}.xlsx')
+        if not os.path.exists(path):
+            print(f"Generating {size}-row workbook: {path}")
+            generate_pay_file(path, size)
+        datasets.append((f'generated_{size}', [path]))
+
+    print("\n" + "="*80)
+    print(f"Parser benchmark (engines={', '.join(args.engines)}, repeat={args.repeat})")
+    print("="*80)
+
+    results = run_suite(datasets, args.engines, args.repeat)
+
+    output = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'parser_version': PARSER_VERSION,
+        'repeat': args.repeat,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+
+    print("="*80)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare} (commit {previous.get('git_commit')}):")
+        compare(previous, output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for common.fuzzy_matcher
+
+Times FuzzyMatcher.find_best_match (against a prebuilt CandidateIndex, as
+validation uses it) and match_contractor_name (against the raw contractor
+list) for each match engine, with the module's print tracing on and off,
+across synthetic contractor registries and input batches of increasing size.
+Writes a JSON results file with per-row and per-pair latency that can be
+compared between commits.
+
+Tracing 'on' leaves every print in place with stdout sent to /dev/null
+(CloudWatch ingestion costs more than that); 'off' replaces the matcher's
+print with a no-op, which drops the I/O but still builds the f-strings.
+
+Large batches against large registries take hours to score, so at most
+--max-timed-rows rows of each batch are timed and the batch time is
+projected from their per-row latency ('projected': true in the results).
+
+Usage:
+    python tests/benchmarks/bench_fuzzy_matcher.py
+    python tests/benchmarks/bench_fuzzy_matcher.py --registry-sizes 1000 10000 --engines rapidfuzz
+    python tests/benchmarks/bench_fuzzy_matcher.py --output new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'backend', 'layers', 'common', 'python'))
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from common import fuzzy_matcher, name_blocking
+    from common.fuzzy_matcher import MATCH_ENGINES, FuzzyMatcher
+
+from synthetic_pay_files import build_pay_file  # noqa: E402
+
+DEFAULT_REGISTRY_SIZES = [25, 1000, 10000, 100000]
+DEFAULT_BATCH_SIZES = [10, 100, 1000, 10000]
+DEFAULT_MAX_TIMED_ROWS = 200
+DEFAULT_REPEAT = 3
+DEFAULT_TYPO_SHARE = 0.1
+DEFAULT_THRESHOLD = 85
+
+# Validation Lambda timeout (ValidationFunction in backend/template.yaml)
+LAMBDA_TIMEOUT_SECONDS = 120
+
+FUNCTIONS = ('find_best_match', 'match_contractor_name')
+TRACING = ('on', 'off')
+
+
+def build_registry(size, typo_share=DEFAULT_TYPO_SHARE, seed=0):
+    """Contractor items and (forename, surname) rows for a registry of size names"""
+    pay_file = build_pay_file(size, overtime_share=0, expense_share=0, typo_share=typo_share, seed=seed)
+    return pay_file['contractors'], [(row[2], row[1]) for row in pay_file['rows']]
+
+
+def build_batch(rows, size, seed=0):
+    """size input rows drawn from a registry's rows (repeating when the batch is larger)"""
+    rng = random.Random(seed)
+    order = list(rows)
+    rng.shuffle(order)
+    return [order[i % len(order)] for i in range(size)]
+
+
+def _silent_print(*args, **kwargs):
+    pass
+
+
+@contextlib.contextmanager
+def tracing(mode):
+    """Run with the matcher's print tracing on (output to /dev/null) or off (no-op print)"""
+    modules = (fuzzy_matcher, name_blocking)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if mode == 'on':
+            yield
+            return
+        for module in modules:
+            module.print = _silent_print
+        try:
+            yield
+        finally:
+            for module in modules:
+                del module.print
+
+
+def _run(matcher, function, rows, registry, index):
+    """Match every row and return (matched, seconds)"""
+    matched = 0
+    started = time.perf_counter()
+    if function == 'find_best_match':
+        for forename, surname in rows:
+            matched += matcher.find_best_match(f"{forename} {surname}", index) is not None
+    else:
+        for forename, surname in rows:
+            matched += matcher.match_contractor_name(forename, surname, registry) is not None
+    return matched, time.perf_counter() - started
+
+
+def measure(registry, batch, engine, function, trace, repeat, max_timed_rows=DEFAULT_MAX_TIMED_ROWS,
+            threshold=DEFAULT_THRESHOLD):
+    """
+    Time one function over a batch against a registry
+
+    Args:
+        registry: Contractor items
+        batch: (forename, surname) rows
+        engine: Match engine
+        function: 'find_best_match' or 'match_contractor_name'
+        trace: 'on' or 'off'
+        repeat: Timed runs (the median is reported)
+        max_timed_rows: Rows timed per run; larger batches are projected
+        threshold: Match threshold
+
+    Returns:
+        Result dict (without dataset labels)
+    """
+    timed = batch[:max_timed_rows]
+    with tracing(trace):
+        matcher = FuzzyMatcher(threshold=threshold, engine=engine)
+        started = time.perf_counter()
+        index = matcher.index(registry)
+        index_seconds = time.perf_counter() - started
+
+        timings = []
+        for _ in range(repeat):
+            matched, elapsed = _run(matcher, function, timed, registry, index)
+            timings.append(elapsed)
+
+    wall = statistics.median(timings)
+    per_row = wall / len(timed) if timed else 0
+    batch_seconds = per_row * len(batch)
+    # match_contractor_name indexes the registry on every call; find_best_match
+    # pays for the index once per file
+    if function == 'find_best_match':
+        batch_seconds += index_seconds
+    return {
+        'engine': engine,
+        'function': function,
+        'tracing': trace,
+        'blocking': index.blocking is not None,
+        'timed_rows': len(timed),
+        'matched': matched,
+        'projected': len(timed) < len(batch),
+        'index_seconds': round(index_seconds, 6),
+        'wall_seconds': round(wall, 6),
+        'per_row_us': round(per_row * 1e6, 3),
+        'per_pair_ns': round(per_row / len(registry) * 1e9, 3) if registry else None,
+        'batch_seconds': round(batch_seconds, 6),
+        'fits_lambda_timeout': batch_seconds < LAMBDA_TIMEOUT_SECONDS,
+        'rows_per_timeout': int(LAMBDA_TIMEOUT_SECONDS / per_row) if per_row else None
+    }
+
+
+def run_suite(registry_sizes, batch_sizes, engines, repeat, functions=FUNCTIONS, tracing_modes=TRACING,
+              max_timed_rows=DEFAULT_MAX_TIMED_ROWS, typo_share=DEFAULT_TYPO_SHARE, report=print):
+    """Benchmark every registry x batch x engine x function x tracing mode"""
+    results = []
+    for registry_size in registry_sizes:
+        registry, rows = build_registry(registry_size, typo_share)
+        for batch_size in batch_sizes:
+            batch = build_batch(rows, batch_size)
+            for engine in engines:
+                for function in functions:
+                    for trace in tracing_modes:
+                        result = {'registry': registry_size, 'batch': batch_size}
+                        result.update(measure(registry, batch, engine, function, trace, repeat, max_timed_rows))
+                        results.append(result)
+                        report(_format_result(result))
+    return results
+
+
+def _format_result(result):
+    flag = '~' if result['projected'] else ' '
+    fits = 'ok' if result['fits_lambda_timeout'] else 'TIMEOUT'
+    return (f"  {result['registry']:>7} x {result['batch']:>6} {result['engine']:<10} {result['function']:<22} "
+            f"trace {result['tracing']:<3} {result['per_row_us']:>12.1f} us/row {result['per_pair_ns']:>10.1f} ns/pair "
+            f"{flag}{result['batch_seconds']:>10.3f}s {fits}")
+
+
+def _result_key(result):
+    return f"{result['registry']}/{result['batch']}/{result['engine']}/{result['function']}/{result['tracing']}"
+
+
+def compare(previous, current, report=print):
+    """Print the per-row latency ratio of current vs previous for matching entries"""
+    before = {_result_key(r): r for r in previous['results']}
+    for result in current['results']:
+        old = before.get(_result_key(result))
+        if not old or not old['per_row_us']:
+            continue
+        report(f"  {_result_key(result):<60} per row x{result['per_row_us'] / old['per_row_us']:>6.2f}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark FuzzyMatcher')
+    parser.add_argument('--registry-sizes', type=int, nargs='+', default=DEFAULT_REGISTRY_SIZES,
+                        help='Contractor registry sizes')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES,
+                        help='Input rows per batch')
+    parser.add_argument('--engines', nargs='+', choices=MATCH_ENGINES,
+                        default=[e for e in MATCH_ENGINES if e != 'rapidfuzz' or fuzzy_matcher.RAPIDFUZZ_AVAILABLE],
+                        help='Match engines')
+    parser.add_argument('--functions', nargs='+', choices=FUNCTIONS, default=list(FUNCTIONS), help='Functions to time')
+    parser.add_argument('--tracing', nargs='+', choices=TRACING, default=list(TRACING), help='Print tracing modes')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per measurement')
+    parser.add_argument('--max-timed-rows', type=int, default=DEFAULT_MAX_TIMED_ROWS,
+                        help='Rows timed per batch; larger batches are projected')
+    parser.add_argument('--typo-share', type=float, default=DEFAULT_TYPO_SHARE, help='Fraction of rows with a typo')
+    parser.add_argument('--output', default='matcher-benchmark.json', help='JSON results file')
+    parser.add_argument('--compare', default=None, help='Previous results file to compare against')
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*80)
+    print(f"Fuzzy matcher benchmark (engines={', '.join(args.engines)}, repeat={args.repeat}, "
+          f"max timed rows={args.max_timed_rows}, timeout={LAMBDA_TIMEOUT_SECONDS}s)")
+    print("="*80)
+
+    results = run_suite(args.registry_sizes, args.batch_sizes, args.engines, args.repeat,
+                        functions=args.functions, tracing_modes=args.tracing,
+                        max_timed_rows=args.max_timed_rows, typo_share=args.typo_share)
+
+    output = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'rapidfuzz_available': fuzzy_matcher.RAPIDFUZZ_AVAILABLE,
+        'threshold': DEFAULT_THRESHOLD,
+        'typo_share': args.typo_share,
+        'lambda_timeout_seconds': LAMBDA_TIMEOUT_SECONDS,
+        'repeat': args.repeat,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+
+    print("="*80)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare} (commit {previous.get('git_commit')}):")
+        compare(previous, output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Synthetic pay-file generator for scale testing
+
+Writes umbrella-style xlsx pay files in the InputData layout, at any row count,
+with a configurable share of overtime and expense rows, injected VAT errors and
+name typos. Can also write the matching contractor, umbrella and association
+seed items (same shape as backend/seed-data/seed_dynamodb.py).
+
+Usage:
+    python tests/benchmarks/synthetic_pay_files.py --rows 10000 --umbrella NASA --out-dir /tmp/pay
+    python tests/benchmarks/synthetic_pay_files.py --rows 100000 --overtime-share 0.1 \\
+        --expense-share 0.05 --vat-error-share 0.01 --typo-share 0.02 --seed-out /tmp/pay/seed.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import uuid
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'backend', 'layers', 'common', 'python'))
+
+from openpyxl import Workbook  # noqa: E402 - vendored in the common layer
+
+# Same layout as the InputData files, except the rate column is headed
+# 'day rate' so PayFileParser maps it (plain 'rate' is not mapped)
+HEADERS = ['employee id', 'surname', 'forename', 'unit', 'day rate', 'per', 'amount', ' vat  ',
+           'total hours per period', 'company', 'notes']
+
+# Short code -> (legal name, company column text, filename prefix, first employee ID)
+UMBRELLAS = {
+    'NASA': ('Nasa Umbrella Ltd', 'NASA GROUP', 'NASA', 800000),
+    'PAYSTREAM': ('PayStream My Max 3 Limited', 'PAYSTREAM MYMAX', 'PAYSTREAM', 3800000),
+    'PARASOL': ('Parasol Limited', 'PARASOL', 'Parasol', 100000),
+    'CLARITY': ('Clarity Umbrella Ltd', 'CLARITY', 'Clarity', 500000),
+    'GIANT': ('Giant Professional Limited', 'GIANT PROFESSIONAL LIMITED (PRG)', 'GIANT', 445000),
+    'WORKWELL': ('Workwell People Solutions Limited', 'WORKWELL (JSA SERVICES)', 'WORKWELL', 2100000),
+}
+
+FORENAMES = [
+    'Aaron', 'Adam', 'Aisha', 'Alan', 'Alice', 'Amir', 'Andrew', 'Anna', 'Barry', 'Basavaraj',
+    'Bilgun', 'Catherine', 'Chris', 'Claire', 'Craig', 'Daniel', 'David', 'Diogo', 'Donna', 'Duncan',
+    'Elena', 'Emma', 'Fatima', 'Gareth', 'Gary', 'Graeme', 'Hannah', 'Helen', 'Ian', 'James',
+    'Jane', 'Jonathan', 'Julie', 'Karen', 'Kevin', 'Laura', 'Liam', 'Lucy', 'Mark', 'Matthew',
+    'Mei', 'Michael', 'Neil', 'Nik', 'Olivia', 'Parag', 'Paul', 'Priya', 'Rachel', 'Richard',
+    'Robert', 'Rohan', 'Sarah', 'Sheela', 'Simon', 'Sophie', 'Thomas', 'Venu', 'Vijetha', 'Zoe',
+]
+
+SURNAMES = [
+    'Adesara', 'Adluru', 'Ahmed', 'Allen', 'Bailey', 'Baker', 'Barton', 'Bennett', 'Breden', 'Brown',
+    'Campbell', 'Carter', 'Chen', 'Clarke', 'Conkerton', 'Cooper', 'Coultas', 'Davies', 'Dayyala', 'Edwards',
+    'Evans', 'Fisher', 'Garrety', 'Graham', 'Green', 'Hall', 'Halfpenny', 'Harris', 'Hughes', 'Hunt',
+    'Jackson', 'Johnson', 'Kaur', 'Kayes', 'Khan', 'King', 'Lee', 'Lewis', 'Macadam', 'Mandaracas',
+    'Maniar', 'Martin', 'Matthews', 'Mays', 'Mitchell', 'Moore', 'Morgan', 'Murphy', 'Nguyen', 'Oldroyd',
+    'Owen', 'Patel', 'Phillips', 'Pomfret', 'Price', 'Puttagangaiah', 'Roberts', 'Robinson', 'Scott', 'Shah',
+    'Singh', 'Smith', 'Taylor', 'Thomas', 'Thompson', 'Turner', 'Walker', 'Ward', 'Watson', 'White',
+    'Williams', 'Wilson', 'Wood', 'Wright', 'Yildirim', 'Young', 'Zhang', 'Ali', 'Begum', 'Novak',
+]
+
+VAT_RATE = 0.20
+OVERTIME_MULTIPLIER = 1.5
+HOURS_PER_DAY = 7.5
+
+
+def contractor_name(index):
+    """Unique (forename, surname) for index - double-barrelled surnames extend the pool"""
+    forename = FORENAMES[index % len(FORENAMES)]
+    rest = index // len(FORENAMES)
+    surname = SURNAMES[rest % len(SURNAMES)]
+    second = rest // len(SURNAMES)
+    if second:
+        surname = f"{surname}-{SURNAMES[(second - 1) % len(SURNAMES)]}"
+    return forename, surname
+
+
+def name_pool_size():
+    return len(FORENAMES) * len(SURNAMES) * (len(SURNAMES) + 1)
+
+
+def add_typo(name, rng):
+    """One keyboard-style slip: swap, drop or double a character past the first"""
+    if len(name) < 4:
+        return name + name[-1]
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.randrange(3)
+    if kind == 0 and name[i] != name[i + 1]:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if kind == 1:
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i] + name[i:]
+
+
+def _stable_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def build_pay_file(rows, umbrella='NASA', overtime_share=0.1, expense_share=0.05,
+                   vat_error_share=0.0, typo_share=0.0, seed=0):
+    """
+    Build the rows and seed items for one synthetic pay file
+
+    Every contractor has one normal row; overtime and expense rows reuse
+    contractors that already have a normal row.
+
+    Args:
+        rows: Total data rows
+        umbrella: Umbrella short code (see UMBRELLAS)
+        overtime_share: Fraction of rows that are overtime at 1.5x the day rate
+        expense_share: Fraction of rows that are expenses
+        vat_error_share: Fraction of rows whose VAT is not 20% of the amount
+        typo_share: Fraction of rows whose forename or surname has a one-character typo
+        seed: Random seed - the same arguments always give the same file
+
+    Returns:
+        Dict with 'rows' (cell value lists), 'expected' (per-row contractor_id,
+        record_type, vat_error, typo), 'contractors' and 'associations' (seed items)
+        and 'umbrella' (seed item)
+    """
+    if umbrella not in UMBRELLAS:
+        raise ValueError(f"Unknown umbrella '{umbrella}'. Expected one of: {', '.join(UMBRELLAS)}")
+
+    if overtime_share + expense_share >= 1:
+        raise ValueError("overtime_share + expense_share must leave room for normal rows")
+
+    rng = random.Random(seed)
+    legal_name, company, _, first_employee_id = UMBRELLAS[umbrella]
+
+    extra_rows = int(rows * overtime_share) + int(rows * expense_share)
+    contractor_count = rows - extra_rows
+    if contractor_count > name_pool_size():
+        raise ValueError(f"At most {name_pool_size()} distinct contractors can be generated")
+
+    umbrella_id = _stable_id(rng)
+    umbrella_item = {
+        'PK': f'UMBRELLA#{umbrella_id}',
+        'SK': 'PROFILE',
+        'EntityType': 'Umbrella',
+        'UmbrellaID': umbrella_id,
+        'ShortCode': umbrella,
+        'LegalName': legal_name,
+        'FileNameVariation': company,
+        'IsActive': True,
+        'GSI2PK': f'UMBRELLA_CODE#{umbrella}',
+        'GSI2SK': 'PROFILE'
+    }
+
+    contractors, associations, people = [], [], []
+    for index in sorted(rng.sample(range(name_pool_size()), contractor_count)):
+        forename, surname = contractor_name(index)
+        contractor_id = _stable_id(rng)
+        employee_id = str(first_employee_id + len(people))
+        normalized_name = f"{forename} {surname}".lower()
+        contractors.append({
+            'PK': f'CONTRACTOR#{contractor_id}',
+            'SK': 'PROFILE',
+            'EntityType': 'Contractor',
+            'ContractorID': contractor_id,
+            'FirstName': forename,
+            'LastName': surname,
+            'NormalizedName': normalized_name,
+            'JobTitle': 'Solution Designer',
+            'IsActive': True,
+            'GSI2PK': f'NAME#{normalized_name}',
+            'GSI2SK': f'CONTRACTOR#{contractor_id}'
+        })
+        associations.append({
+            'PK': f'CONTRACTOR#{contractor_id}',
+            'SK': f'UMBRELLA#{umbrella_id}',
+            'EntityType': 'ContractorUmbrellaAssociation',
+            'AssociationID': _stable_id(rng),
+            'ContractorID': contractor_id,
+            'UmbrellaID': umbrella_id,
+            'EmployeeID': employee_id,
+            'ValidFrom': '2025-01-01',
+            'ValidTo': None,
+            'IsActive': True,
+            'GSI1PK': f'UMBRELLA#{umbrella_id}',
+            'GSI1SK': f'CONTRACTOR#{contractor_id}'
+        })
+        people.append((employee_id, forename, surname, round(rng.uniform(300, 650), 2), contractor_id))
+    rng.shuffle(people)
+
+    record_types = ['NORMAL'] * contractor_count
+    record_types += ['OVERTIME'] * int(rows * overtime_share)
+    record_types += ['EXPENSE'] * (rows - len(record_types))
+    vat_errors = set(rng.sample(range(rows), int(rows * vat_error_share)))
+    typos = set(rng.sample(range(rows), int(rows * typo_share)))
+
+    out_rows, expected = [], []
+    for i, record_type in enumerate(record_types):
+        person = i if record_type == 'NORMAL' else rng.randrange(contractor_count)
+        employee_id, forename, surname, day_rate, contractor_id = people[person]
+
+        if record_type == 'NORMAL':
+            days = rng.choice([10, 12, 15, 16, 18, 18.5, 19, 20])
+            notes = None
+        elif record_type == 'OVERTIME':
+            days = rng.choice([0.5, 1, 1.5, 2, 3])
+            day_rate = round(day_rate * OVERTIME_MULTIPLIER, 2)
+            notes = 'Overtime'
+        else:
+            days = 1
+            day_rate = round(rng.uniform(20, 300), 2)
+            notes = 'Expenses'
+
+        amount = round(days * day_rate, 2)
+        vat = round(amount * VAT_RATE, 2)
+        if i in vat_errors:
+            vat = round(vat + rng.choice([-1, 1]) * rng.uniform(1, 50), 2)
+
+        if i in typos:
+            if rng.random() < 0.5:
+                forename = add_typo(forename, rng)
+            else:
+                surname = add_typo(surname, rng)
+
+        hours = days * HOURS_PER_DAY if record_type != 'EXPENSE' else None
+        out_rows.append([int(employee_id), surname, forename, days, day_rate, 'day', amount, vat,
+                         hours, company, notes])
+        expected.append({
+            'contractor_id': contractor_id,
+            'record_type': record_type,
+            'vat_error': i in vat_errors,
+            'typo': i in typos
+        })
+
+    return {
+        'rows': out_rows,
+        'expected': expected,
+        'umbrella': umbrella_item,
+        'contractors': contractors,
+        'associations': associations
+    }
+
+
+def pay_filename(umbrella, submission_date):
+    """InputData-style filename, e.g. 'NASA GCI Nasstar Contractor Pay Figures 01092025.xlsx'"""
+    return f"{UMBRELLAS[umbrella][2]} GCI Nasstar Contractor Pay Figures {submission_date}.xlsx"
+
+
+def write_workbook(path, rows):
+    """Write header plus rows with openpyxl's write-only mode (flat memory at any size)"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(HEADERS)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def generate_pay_file(path, rows, **options):
+    """Build a synthetic pay file, write it to path and return build_pay_file() output"""
+    pay_file = build_pay_file(rows, **options)
+    write_workbook(path, pay_file['rows'])
+    return pay_file
+
+
+def seed_items(pay_file):
+    """Umbrella, contractor and association items, ready for batch_writer().put_item"""
+    return [pay_file['umbrella']] + pay_file['contractors'] + pay_file['associations']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic contractor pay file')
+    parser.add_argument('--rows', type=int, default=1000, help='Data rows')
+    parser.add_argument('--umbrella', choices=sorted(UMBRELLAS), default='NASA', help='Umbrella company')
+    parser.add_argument('--submission-date', default='01092025', help='DDMMYYYY date for the filename')
+    parser.add_argument('--overtime-share', type=float, default=0.1, help='Fraction of overtime rows')
+    parser.add_argument('--expense-share', type=float, default=0.05, help='Fraction of expense rows')
+    parser.add_argument('--vat-error-share', type=float, default=0.0, help='Fraction of rows with wrong VAT')
+    parser.add_argument('--typo-share', type=float, default=0.0, help='Fraction of rows with a name typo')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--out-dir', default='.', help='Directory for the xlsx file')
+    parser.add_argument('--seed-out', default=None, help='Write matching umbrella/contractor/association items as JSON')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    path = os.path.join(args.out_dir, pay_filename(args.umbrella, args.submission_date))
+
+    pay_file = generate_pay_file(
+        path, args.rows, umbrella=args.umbrella,
+        overtime_share=args.overtime_share, expense_share=args.expense_share,
+        vat_error_share=args.vat_error_share, typo_share=args.typo_share, seed=args.seed
+    )
+
+    expected = pay_file['expected']
+    print(f"✓ Wrote {path}")
+    print(f"  → {len(expected)} rows, {len(pay_file['contractors'])} contractors, "
+          f"{sum(e['record_type'] == 'OVERTIME' for e in expected)} overtime, "
+          f"{sum(e['record_type'] == 'EXPENSE' for e in expected)} expenses, "
+          f"{sum(e['vat_error'] for e in expected)} VAT errors, "
+          f"{sum(e['typo'] for e in expected)} typos")
+
+    if args.seed_out:
+        with open(args.seed_out, 'w') as f:
+            json.dump(seed_items(pay_file), f, indent=2)
+        print(f"✓ Wrote {len(seed_items(pay_file))} seed items to {args.seed_out}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Smoke test for the parser benchmark suite
+Keeps bench_excel_parser.py runnable without paying for a full benchmark
+"""
+
+import json
+
+from bench_excel_parser import PHASES, main, run_suite
+from synthetic_pay_files import generate_pay_file
+
+
+class TestParserBenchmark:
+    """Test the parser benchmark on a tiny workbook"""
+
+    def test_run_suite(self, tmp_path):
+        """Test that every phase is measured with rows, timings and peak memory"""
+        path = tmp_path / "generated_50.xlsx"
+        generate_pay_file(str(path), 50)
+
+        results = run_suite([('generated_50', [str(path)])], ['xml'], repeat=1, report=lambda line: None)
+
+        assert [r['phase'] for r in results] == list(PHASES)
+        parse = results[-1]
+        assert parse['dataset'] == 'generated_50'
+        assert parse['rows'] == 50
+        assert parse['rows_per_sec'] > 0
+        assert all(r['peak_bytes'] > 0 for r in results)
+
+    def test_main_writes_comparable_json(self, tmp_path):
+        """Test that results are written and can be compared with a previous run"""
+        first = tmp_path / "first.json"
+        second = tmp_path / "second.json"
+        args = ['--sizes', '20', '--engines', 'xml', '--repeat', '1',
+                '--input-dir', str(tmp_path / 'missing'), '--work-dir', str(tmp_path)]
+
+        assert main(args + ['--output', str(first)]) == 0
+        assert main(args + ['--output', str(second), '--compare', str(first)]) == 0
+
+        results = json.loads(second.read_text())
+        assert results['parser_version']
+        assert {r['dataset'] for r in results['results']} == {'generated_20'}
@@ -0,0 +1,46 @@
+"""
+Smoke test for the fuzzy matcher benchmark suite
+Keeps bench_fuzzy_matcher.py runnable without paying for a full benchmark
+"""
+
+import builtins
+import json
+
+from bench_fuzzy_matcher import FUNCTIONS, TRACING, main, run_suite, tracing
+from common import fuzzy_matcher
+
+
+class TestMatcherBenchmark:
+    """Test the matcher benchmark on a tiny registry"""
+
+    def test_run_suite(self):
+        """Test that every function and tracing mode is measured with latencies and a timeout verdict"""
+        results = run_suite([25], [40], ['fuzzywuzzy'], repeat=1, max_timed_rows=10, report=lambda line: None)
+
+        assert [(r['function'], r['tracing']) for r in results] == [(f, t) for f in FUNCTIONS for t in TRACING]
+        for result in results:
+            assert result['registry'] == 25 and result['batch'] == 40
+            assert result['timed_rows'] == 10 and result['projected']
+            assert result['matched'] > 0
+            assert result['per_row_us'] > 0 and result['per_pair_ns'] > 0
+            assert result['fits_lambda_timeout']
+
+    def test_tracing_off_is_restored(self):
+        """Test that tracing off silences the matcher only for the duration of the block"""
+        with tracing('off'):
+            assert fuzzy_matcher.print is not builtins.print
+        assert 'print' not in vars(fuzzy_matcher)
+
+    def test_main_writes_comparable_json(self, tmp_path):
+        """Test that results are written and can be compared with a previous run"""
+        first = tmp_path / "first.json"
+        second = tmp_path / "second.json"
+        args = ['--registry-sizes', '25', '--batch-sizes', '10', '--engines', 'fuzzywuzzy',
+                '--functions', 'find_best_match', '--repeat', '1']
+
+        assert main(args + ['--output', str(first)]) == 0
+        assert main(args + ['--output', str(second), '--compare', str(first)]) == 0
+
+        results = json.loads(second.read_text())
+        assert results['lambda_timeout_seconds'] == 120
+        assert {r['tracing'] for r in results['results']} == set(TRACING)
@@ -0,0 +1,64 @@
+"""
+Recall of name-match candidate blocking on synthetic registries
+Blocked matching must give the same answer as scoring the whole registry
+"""
+
+import random
+import string
+
+import pytest
+from common import fuzzy_matcher
+from common.fuzzy_matcher import FuzzyMatcher
+from synthetic_pay_files import build_pay_file
+
+# Lowest threshold in use (the code default); the seeded NAME_MATCH_THRESHOLD
+# of 85 accepts a subset of these matches
+THRESHOLD = 75
+
+
+def edit_each_part(rng, name):
+    """One random edit (anywhere, first letter included) in the forename, surname or both"""
+    parts = name.split(' ', 1)
+    for i in rng.sample(range(len(parts)), rng.randint(1, len(parts))):
+        chars = list(parts[i])
+        pos = rng.randrange(len(chars))
+        op = rng.choice('sid')
+        if op == 's':
+            chars[pos] = rng.choice(string.ascii_lowercase)
+        elif op == 'i':
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        elif len(chars) > 1:
+            del chars[pos]
+        parts[i] = ''.join(chars)
+    return ' '.join(parts)
+
+
+@pytest.mark.skipif(not fuzzy_matcher.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not installed")
+class TestBlockingRecall:
+    """Test blocked matching against a full scan of the registry"""
+
+    def test_no_match_dropped(self):
+        """Test generator typos and one-edit-per-part names at the default n-gram size"""
+        pay_file = build_pay_file(1000, overtime_share=0, expense_share=0, typo_share=0.15, seed=11)
+        registry = pay_file['contractors']
+        rng = random.Random(11)
+        names = [f"{row[2]} {row[1]}" for row, expected in zip(pay_file['rows'], pay_file['expected'])
+                 if expected['typo']]
+        names += [edit_each_part(rng, rng.choice(registry)['NormalizedName']) for _ in range(150)]
+
+        matcher = FuzzyMatcher(threshold=THRESHOLD, engine='rapidfuzz')
+        blocked = matcher.index(registry)
+        full = matcher.index(registry, blocking=False)
+        assert blocked.blocking is not None
+
+        matched = 0
+        block_sizes = []
+        for name in names:
+            expected = matcher.find_best_match(name, full)
+            assert matcher.find_best_match(name, blocked) == expected, name
+            matched += expected is not None
+            block_sizes.append(len(blocked.block(matcher.normalize_name(name))))
+
+        assert matched > 250
+        # Each name scores a few dozen candidates at most, not the registry
+        assert sum(block_sizes) / len(block_sizes) < len(registry) / 20
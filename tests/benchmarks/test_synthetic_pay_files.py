@@ -0,0 +1,107 @@
+"""
+Tests for the synthetic pay-file generator
+Generated files must parse like real umbrella files and match their seed set
+"""
+
+import json
+import random
+from decimal import Decimal
+
+import pytest
+from common.excel_parser import PayFileParser, resolve_filename_metadata
+from common.fuzzy_matcher import FuzzyMatcher
+from synthetic_pay_files import add_typo, build_pay_file, generate_pay_file, main, pay_filename
+
+
+class TestSyntheticPayFiles:
+    """Test synthetic pay-file generation"""
+
+    def test_generated_file_parses(self, tmp_path):
+        """Test that rows, record types and injected errors come back through the parser"""
+        path = tmp_path / pay_filename('PARASOL', '01092025')
+        pay_file = generate_pay_file(str(path), 200, umbrella='PARASOL', overtime_share=0.1,
+                                     expense_share=0.05, vat_error_share=0.05, typo_share=0.1, seed=7)
+
+        with PayFileParser(str(path), engine='xml') as parser:
+            records = parser.parse_records()
+            metadata = parser.extract_metadata()
+
+        assert metadata['umbrella_code'] == 'PARASOL'
+        assert metadata['submission_date'] == '01092025'
+        assert len(records) == 200
+        assert [r['record_type'] for r in records] == [e['record_type'] for e in pay_file['expected']]
+        assert sum(r['record_type'] == 'OVERTIME' for r in records) == 20
+        assert sum(r['record_type'] == 'EXPENSE' for r in records) == 10
+        assert all(r['company'] == 'PARASOL' for r in records)
+        assert all(r['day_rate'] > 0 for r in records)
+
+        # Money is in pence: more than 1p out
+        vat_wrong = [abs(r['vat_amount'] - r['amount'].scale(Decimal('0.2'))) > 1 for r in records]
+        assert vat_wrong == [e['vat_error'] for e in pay_file['expected']]
+
+    def test_seed_set_matches_rows(self):
+        """Test that every row's employee ID and name belong to a seeded contractor"""
+        pay_file = build_pay_file(100, umbrella='NASA', typo_share=0.2, seed=3)
+
+        contractors = {c['ContractorID']: c for c in pay_file['contractors']}
+        employee_ids = {a['ContractorID']: a['EmployeeID'] for a in pay_file['associations']}
+        umbrella_id = pay_file['umbrella']['UmbrellaID']
+
+        assert len(contractors) == 85
+        assert len({c['NormalizedName'] for c in contractors.values()}) == 85
+        assert all(a['UmbrellaID'] == umbrella_id for a in pay_file['associations'])
+
+        matcher = FuzzyMatcher(threshold=85)
+        for row, expected in zip(pay_file['rows'], pay_file['expected']):
+            contractor = contractors[expected['contractor_id']]
+            assert str(row[0]) == employee_ids[contractor['ContractorID']]
+
+            name = f"{row[2]} {row[1]}"
+            if expected['typo']:
+                assert name.lower() != contractor['NormalizedName']
+            else:
+                assert name.lower() == contractor['NormalizedName']
+
+        typo_rows = [(r, e) for r, e in zip(pay_file['rows'], pay_file['expected']) if e['typo']]
+        assert len(typo_rows) == 20
+        matched = 0
+        for row, expected in typo_rows:
+            match = matcher.match_contractor_name(row[2], row[1], list(contractors.values()))
+            matched += bool(match) and match['contractor']['ContractorID'] == expected['contractor_id']
+        assert matched > len(typo_rows) // 2
+
+    def test_deterministic(self):
+        """Test that the same seed gives the same file"""
+        assert build_pay_file(50, seed=1) == build_pay_file(50, seed=1)
+        assert build_pay_file(50, seed=1)['rows'] != build_pay_file(50, seed=2)['rows']
+
+    def test_invalid_options(self):
+        """Test that unknown umbrellas and impossible shares are rejected"""
+        with pytest.raises(ValueError):
+            build_pay_file(10, umbrella='UNKNOWN')
+        with pytest.raises(ValueError):
+            build_pay_file(10, overtime_share=0.6, expense_share=0.4)
+
+    def test_add_typo(self):
+        """Test that typos change the name by one edit"""
+        rng = random.Random(0)
+        for name in ['Jonathan', 'Mays', 'Nik']:
+            typo = add_typo(name, rng)
+            assert typo != name
+            assert abs(len(typo) - len(name)) <= 1
+            assert typo[0] == name[0]
+
+    def test_main_writes_file_and_seed(self, tmp_path, capsys):
+        """Test the CLI output files"""
+        seed_path = tmp_path / "seed.json"
+
+        assert main(['--rows', '30', '--umbrella', 'GIANT', '--submission-date', '15092025',
+                     '--out-dir', str(tmp_path), '--seed-out', str(seed_path)]) == 0
+
+        assert resolve_filename_metadata(pay_filename('GIANT', '15092025'))['umbrella_code'] == 'GIANT'
+        assert (tmp_path / pay_filename('GIANT', '15092025')).exists()
+
+        items = json.loads(seed_path.read_text())
+        assert [i['EntityType'] for i in items].count('Contractor') == 26
+        assert [i['EntityType'] for i in items].count('ContractorUmbrellaAssociation') == 26
+        assert 'VAT errors' in capsys.readouterr().out
@@ -48,6 +48,13 @@ def mock_dynamodb_client():
 
     mock_client.check_permanent_staff = mock_check_permanent_staff
 
+    # Permanent staff registry (PERMANENT_CHECK partition and its version stamp)
+    mock_client.get_permanent_staff = MagicMock(return_value=[
+        {'FirstName': first_name, 'LastName': last_name, 'NormalizedName': f"{first_name} {last_name}".lower()}
+        for first_name, last_name in permanent_staff
+    ])
+    mock_client.get_permanent_staff_version = MagicMock(return_value='1')
+
     return mock_client
 
 
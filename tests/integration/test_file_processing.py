@@ -3,14 +3,17 @@ Integration tests for end-to-end file processing workflow
 Tests the complete flow from upload to validation to import
 """
 
+import importlib.util
 import json
 import os
 import sys
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import boto3
 import pytest
+from boto3.dynamodb.conditions import Key
 from moto import mock_dynamodb, mock_s3, mock_stepfunctions
 
 # Add backend to path
@@ -244,6 +247,72 @@ def seed_test_data(dynamodb_table):
     yield
 
 
+@pytest.fixture
+def file_processor(dynamodb_table, s3_bucket, monkeypatch):
+    """file_processor Lambda module bound to the mock table"""
+    monkeypatch.setenv('TABLE_NAME', dynamodb_table.name)
+    spec = importlib.util.spec_from_file_location(
+        'file_processor_app', os.path.join(backend_path, 'functions', 'file_processor', 'app.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def cleanup_handler(dynamodb_table, s3_bucket, monkeypatch):
+    """cleanup_handler Lambda module bound to the mock table and bucket"""
+    monkeypatch.setenv('TABLE_NAME', dynamodb_table.name)
+    monkeypatch.setenv('S3_BUCKET_NAME', s3_bucket)
+    spec = importlib.util.spec_from_file_location(
+        'cleanup_handler_app', os.path.join(backend_path, 'functions', 'cleanup_handler', 'app.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed_file(dynamodb_table, file_id, status):
+    """Put a FILE metadata item for NASA period 8"""
+    dynamodb_table.put_item(Item={
+        'PK': f'FILE#{file_id}',
+        'SK': 'METADATA',
+        'EntityType': 'File',
+        'FileID': file_id,
+        'Status': status,
+        'IsCurrentVersion': True,
+        'GSI1PK': 'PERIOD#8#UMBRELLA#U001',
+        'GSI1SK': f'FILE#{file_id}'
+    })
+
+
+def validated(rows):
+    """Validated records in the validation engine's list form, for NASA period 8"""
+    return [
+        {
+            'record': {
+                'row_number': idx, 'row_idx': idx, 'employee_id': employee_id, 'surname': '', 'forename': '',
+                'unit_days': days, 'day_rate': rate, 'amount': days * rate, 'vat_amount': days * rate * 0.2,
+                'gross_amount': days * rate * 1.2, 'total_hours': 0, 'record_type': 'NORMAL', 'notes': '',
+                'company': 'NASA GROUP'
+            },
+            'contractor_id': contractor_id,
+            'association_id': association_id,
+            'umbrella_id': 'U001',
+            'period_id': '8'
+        }
+        for idx, (employee_id, contractor_id, association_id, days, rate) in enumerate(rows, start=2)
+    ]
+
+
+def active_records(file_processor):
+    return file_processor.dynamodb_client.get_active_pay_records('8', 'U001')
+
+
+def file_item(dynamodb_table, file_id):
+    return dynamodb_table.get_item(Key={'PK': f'FILE#{file_id}', 'SK': 'METADATA'})['Item']
+
+
 @pytest.mark.integration
 class TestFileProcessingWorkflow:
     """Test complete file processing workflow"""
@@ -340,6 +409,114 @@ class TestEndToEndScenarios:
         """
         pass
 
+    def test_scenario_failed_resubmission_then_new_file(self, dynamodb_table, file_processor, seed_test_data):
+        """
+        Scenario: A resubmission fails validation, then a corrected file arrives
+        Expected: Old file stays current until the new rows are written, no row is counted twice
+        """
+        logger = MagicMock()
+        original = [('812001', 'C001', 'A001', 20, 450), ('812002', 'C002', 'A002', 20, 450)]
+
+        seed_file(dynamodb_table, 'F1', 'COMPLETED')
+        file_processor.import_records({'fileId': 'F1', 'validated_records': validated(original)}, logger)
+
+        # Resubmission is flagged as a duplicate, then fails validation
+        seed_file(dynamodb_table, 'F2', 'PROCESSING')
+        duplicate = file_processor.check_duplicates({'fileId': 'F2', 'umbrella_id': 'U001', 'period_id': '8'}, logger)
+        assert duplicate['existing_file_id'] == 'F1'
+        file_processor.supersede_existing({'fileId': 'F2', 'existing_file_id': 'F1'}, logger)
+        file_processor.mark_error({'fileId': 'F2', 'validation_errors': [{'error': 'bad row'}]}, logger)
+
+        assert file_item(dynamodb_table, 'F1')['IsCurrentVersion'] is True
+        assert file_item(dynamodb_table, 'F1')['Status'] == 'COMPLETED'
+        assert len(active_records(file_processor)) == 2
+
+        # Corrected file: David Hunt's days change, Donna Smith is added
+        corrected = original[:1] + [('812002', 'C002', 'A002', 18, 450), ('812003', 'C003', 'A003', 10, 400)]
+        seed_file(dynamodb_table, 'F3', 'PROCESSING')
+        duplicate = file_processor.check_duplicates({'fileId': 'F3', 'umbrella_id': 'U001', 'period_id': '8'}, logger)
+        result = file_processor.import_records(
+            {'fileId': 'F3', 'validated_records': validated(corrected), 'duplicate_check': duplicate}, logger
+        )
+
+        active = active_records(file_processor)
+        assert sorted((r['EmployeeID'], r['UnitDays']) for r in active) == [
+            ('812001', Decimal('20')), ('812002', Decimal('18')), ('812003', Decimal('10'))
+        ]
+        assert result['supersede_diff']['unchanged'] == 1
+        assert result['supersede_diff']['changed'] == 1
+        assert result['supersede_diff']['added'] == 1
+        assert 'F1' in result['superseded_file_ids']
+        assert file_item(dynamodb_table, 'F1')['Status'] == 'SUPERSEDED'
+        assert file_item(dynamodb_table, 'F1')['SupersededBy'] == 'F3'
+
+    def test_scenario_import_without_duplicate_flag(self, dynamodb_table, file_processor, seed_test_data):
+        """
+        Scenario: A file is imported while another version's rows are active but no duplicate was flagged
+        Expected: New rows are diffed against the active ones rather than added on top
+        """
+        logger = MagicMock()
+        rows = [('812001', 'C001', 'A001', 20, 450), ('812002', 'C002', 'A002', 20, 450)]
+
+        file_processor.import_records({'fileId': 'F1', 'validated_records': validated(rows)}, logger)
+        result = file_processor.import_records(
+            {'fileId': 'F2', 'validated_records': validated(rows), 'duplicate_check': {'duplicate_found': False}}, logger
+        )
+
+        assert len(active_records(file_processor)) == 2
+        assert result['records_written'] == 0
+        assert result['superseded_file_ids'] == ['F1']
+
+    def test_scenario_cleanup_after_diff_supersede(self, dynamodb_table, file_processor, cleanup_handler,
+                                                   seed_test_data):
+        """
+        Scenario: A diff-superseded file is archived before, then after, the file that superseded it
+        Expected: Carried-over rows survive while the newer file is live and are deleted once it is archived
+        """
+        logger = MagicMock()
+        original = [('812001', 'C001', 'A001', 20, 450), ('812002', 'C002', 'A002', 20, 450)]
+        corrected = original[:1] + [('812002', 'C002', 'A002', 18, 450)]
+
+        seed_file(dynamodb_table, 'F1', 'COMPLETED')
+        file_processor.import_records({'fileId': 'F1', 'validated_records': validated(original)}, logger)
+        seed_file(dynamodb_table, 'F2', 'COMPLETED')
+        file_processor.import_records({'fileId': 'F2', 'validated_records': validated(corrected)}, logger)
+        assert file_item(dynamodb_table, 'F1')['SupersededBy'] == 'F2'
+
+        def records(file_id):
+            return dynamodb_table.query(
+                KeyConditionExpression=Key('PK').eq(f'FILE#{file_id}') & Key('SK').begins_with('RECORD#')
+            )['Items']
+
+        def run_cleanup():
+            stats = {'dynamodb_records_deleted': 0, 'errors': []}
+            cleanup_logger = MagicMock()
+            cleanup_handler.delete_old_pay_records(cleanup_logger, datetime.now(timezone.utc), stats)
+            assert stats['errors'] == []
+            return stats, cleanup_logger
+
+        # F1 archived, F2 still current: only F1's replaced row goes
+        dynamodb_table.update_item(
+            Key={'PK': 'FILE#F1', 'SK': 'METADATA'}, UpdateExpression='SET #s = :s',
+            ExpressionAttributeNames={'#s': 'Status'}, ExpressionAttributeValues={':s': 'ARCHIVED'}
+        )
+        stats, cleanup_logger = run_cleanup()
+        assert stats['dynamodb_records_deleted'] == 1
+        assert [r['EmployeeID'] for r in records('F1')] == ['812001']
+        assert len(active_records(file_processor)) == 2
+        cleanup_logger.info.assert_any_call("Deleted pay records for archived file",
+                                            file_id='F1', records_deleted=1, records_kept=1)
+
+        # F2 archived as well: the carried row goes with it
+        dynamodb_table.update_item(
+            Key={'PK': 'FILE#F2', 'SK': 'METADATA'}, UpdateExpression='SET #s = :s',
+            ExpressionAttributeNames={'#s': 'Status'}, ExpressionAttributeValues={':s': 'ARCHIVED'}
+        )
+        stats, _ = run_cleanup()
+        assert stats['dynamodb_records_deleted'] == 2
+        assert records('F1') == []
+        assert records('F2') == []
+
     def test_scenario_fuzzy_match_warning(self, dynamodb_table, s3_bucket, seed_test_data):
         """
         Scenario: File has 'Jon Mays' (fuzzy matches 'Jonathan Mays')
@@ -0,0 +1,115 @@
+"""
+Unit tests for artifact_cache.py
+Tests the two-tier parsed-workbook artifact cache
+"""
+
+import gzip
+import io
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from common.artifact_cache import ParsedArtifactCache
+
+
+SAMPLE_METADATA = {
+    'filename': 'NASA_GCI_Nasstar_Contractor_Pay_01092025.xlsx',
+    'umbrella_code': 'NASA',
+    'submission_date': '01092025'
+}
+
+SAMPLE_RECORDS = [
+    {'row_number': 2, 'employee_id': '812001', 'surname': 'Mays', 'amount': 9000.0, 'record_type': 'NORMAL'},
+    {'row_number': 3, 'employee_id': '812002', 'surname': 'Hunt', 'amount': 9000.0, 'record_type': 'NORMAL'},
+]
+
+UPLOAD_KEY = 'uploads/2025/09/20250901_120000_abc.xlsx'
+
+
+class FakeS3:
+    """In-memory stand-in for the S3 client calls used by the cache"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise KeyError('NoSuchKey')
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+class TestParsedArtifactCache:
+    """Test parsed artifact caching"""
+
+    def test_local_roundtrip(self, tmp_path):
+        """Test that a stored artifact is served from the local tier"""
+        cache = ParsedArtifactCache(local_dir=str(tmp_path))
+
+        cache.store('abc123', SAMPLE_METADATA, SAMPLE_RECORDS)
+        artifact = cache.load('abc123')
+
+        assert artifact['metadata'] == SAMPLE_METADATA
+        assert artifact['records'] == SAMPLE_RECORDS
+
+    def test_miss_returns_none(self, tmp_path):
+        """Test cache misses, including a missing hash"""
+        cache = ParsedArtifactCache(local_dir=str(tmp_path))
+
+        assert cache.load('unknown') is None
+        assert cache.load(None) is None
+        assert cache.store(None, SAMPLE_METADATA, SAMPLE_RECORDS) is None
+
+    def test_durable_tier_next_to_upload(self, tmp_path):
+        """Test that the S3 artifact sits beside the upload and is not an .xlsx"""
+        s3 = FakeS3()
+        cache = ParsedArtifactCache(s3_client=s3, local_dir=str(tmp_path))
+
+        cache.store('abc123', SAMPLE_METADATA, SAMPLE_RECORDS, 'bucket', UPLOAD_KEY)
+
+        [(bucket, key)] = s3.objects.keys()
+        assert bucket == 'bucket'
+        assert key.startswith('uploads/2025/09/parsed/abc123.')
+        assert not key.endswith('.xlsx')
+
+        # Stored as compact gzip JSON
+        payload = json.loads(gzip.decompress(s3.objects[(bucket, key)]))
+        assert payload['records'] == SAMPLE_RECORDS
+
+    def test_durable_hit_from_cold_container(self, tmp_path):
+        """Test that a cold container loads from S3 and warms the local tier"""
+        s3 = FakeS3()
+        warm = ParsedArtifactCache(s3_client=s3, local_dir=str(tmp_path / 'warm'))
+        warm.store('abc123', SAMPLE_METADATA, SAMPLE_RECORDS, 'bucket', UPLOAD_KEY)
+
+        cold = ParsedArtifactCache(s3_client=s3, local_dir=str(tmp_path / 'cold'))
+        artifact = cold.load('abc123', 'bucket', UPLOAD_KEY)
+
+        assert artifact['records'] == SAMPLE_RECORDS
+
+        # Second load no longer touches S3
+        s3.get_object = MagicMock(side_effect=AssertionError('S3 should not be called'))
+        assert cold.load('abc123', 'bucket', UPLOAD_KEY)['records'] == SAMPLE_RECORDS
+
+    def test_parser_version_isolates_artifacts(self, tmp_path):
+        """Test that artifacts from another parser version are never served"""
+        old = ParsedArtifactCache(local_dir=str(tmp_path), parser_version='1')
+        old.store('abc123', SAMPLE_METADATA, SAMPLE_RECORDS)
+
+        new = ParsedArtifactCache(local_dir=str(tmp_path), parser_version='2')
+
+        assert new.load('abc123') is None
+
+    def test_s3_errors_are_cache_misses(self, tmp_path):
+        """Test that S3 failures fall back to a miss instead of raising"""
+        s3 = MagicMock()
+        s3.get_object.side_effect = Exception('AccessDenied')
+        s3.put_object.side_effect = Exception('AccessDenied')
+        cache = ParsedArtifactCache(s3_client=s3, local_dir=str(tmp_path))
+
+        assert cache.load('abc123', 'bucket', UPLOAD_KEY) is None
+
+        artifact = cache.store('abc123', SAMPLE_METADATA, SAMPLE_RECORDS, 'bucket', UPLOAD_KEY)
+        assert artifact['records'] == SAMPLE_RECORDS
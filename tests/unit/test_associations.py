@@ -0,0 +1,49 @@
+"""
+Unit tests for associations.py
+Tests employee ID normalisation and the association index
+"""
+
+from decimal import Decimal
+
+import pytest
+from common.associations import AssociationIndex, normalize_employee_id
+
+
+class TestAssociations:
+    """Test employee ID lookups"""
+
+    @pytest.mark.parametrize('value,expected', [
+        ('812277', '812277'), ('812277.0', '812277'), (' 812277.00 ', '812277'), (812277, '812277'),
+        (812277.0, '812277'), (Decimal('812277'), '812277'), ('00123', '00123'), ('EMP-7', 'EMP-7'),
+        ('812277.5', '812277.5'), (None, ''), ('', ''),
+    ])
+    def test_normalize_employee_id(self, value, expected):
+        """Test Excel floats, Decimals and text normalise to the same ID"""
+        assert normalize_employee_id(value) == expected
+
+    def test_lookup_by_umbrella_and_employee(self):
+        """Test lookups are scoped to the umbrella and keep reused IDs together"""
+        index = AssociationIndex([
+            {'AssociationID': 'A1', 'ContractorID': 'C001', 'UmbrellaID': 'U1', 'EmployeeID': '812001'},
+            {'AssociationID': 'A2', 'ContractorID': 'C002', 'UmbrellaID': 'U2', 'EmployeeID': '812001'},
+            {'AssociationID': 'A3', 'ContractorID': 'C003', 'UmbrellaID': 'U1', 'EmployeeID': Decimal('812003')},
+            {'AssociationID': 'A4', 'ContractorID': 'C004', 'UmbrellaID': 'U1', 'EmployeeID': '812003'},
+            {'AssociationID': 'A5', 'ContractorID': 'C005', 'UmbrellaID': 'U1'},
+        ])
+
+        assert [a['AssociationID'] for a in index.lookup('U1', '812001.0')] == ['A1']
+        assert [a['AssociationID'] for a in index.lookup('U2', 812001)] == ['A2']
+        assert [a['AssociationID'] for a in index.lookup('U1', '812003')] == ['A3', 'A4']
+        assert index.lookup('U1', '') == []
+        assert len(index) == 3
+
+    def test_for_contractor(self):
+        """Test a contractor's associations are looked up per umbrella, with or without an employee ID"""
+        index = AssociationIndex([
+            {'AssociationID': 'A1', 'ContractorID': 'C001', 'UmbrellaID': 'U1', 'EmployeeID': '812001'},
+            {'AssociationID': 'A2', 'ContractorID': 'C001', 'UmbrellaID': 'U2'},
+        ])
+
+        assert [a['AssociationID'] for a in index.for_contractor('U1', 'C001')] == ['A1']
+        assert [a['AssociationID'] for a in index.for_contractor('U2', 'C001')] == ['A2']
+        assert index.for_contractor('U1', 'C002') == []
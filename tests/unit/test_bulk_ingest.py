@@ -0,0 +1,75 @@
+"""
+Unit tests for bulk_ingest.py
+Tests the offline directory-to-JSONL ingest
+"""
+
+import json
+
+import pytest
+from openpyxl import Workbook
+from common.bulk_ingest import ingest_directory, main
+
+
+HEADERS = ['Employee ID', 'Surname', 'Forename', 'Unit (Days)', 'Day Rate', 'Amount', 'VAT', 'Gross Amount', 'Notes', 'Company']
+
+
+@pytest.fixture
+def pay_dir(tmp_path):
+    """Directory with two small pay files and one broken one"""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+
+    for name, rows in [
+        ("NASA_GCI_Nasa_12092025.xlsx", [
+            ['812001', 'Mays', 'Jonathan', 20, 450.00, 9000.00, 1800.00, 10800.00, '', 'NASA GROUP'],
+            ['812002', 'Hunt', 'David', 20, 450.00, 9000.00, 1800.00, 10800.00, '', 'NASA GROUP'],
+        ]),
+        ("PARASOL_Limited_12092025.xlsx", [
+            ['812003', 'Smith', 'Jane', 10, 400.00, 4000.00, 800.00, 4800.00, '', 'PARASOL LIMITED'],
+        ]),
+    ]:
+        wb = Workbook()
+        ws = wb.active
+        ws.append(HEADERS)
+        for row in rows:
+            ws.append(row)
+        wb.save(input_dir / name)
+
+    (input_dir / "broken.xlsx").write_bytes(b"not a zip")
+    return input_dir
+
+
+class TestBulkIngest:
+    """Test bulk ingest"""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_ingest_directory(self, pay_dir, tmp_path, workers):
+        """Test that each file is written to JSONL with per-file stats"""
+        output_dir = tmp_path / "out"
+        lines = []
+
+        results = ingest_directory(str(pay_dir), str(output_dir), workers=workers, report=lines.append)
+
+        assert [r['file'] for r in results] == [
+            "NASA_GCI_Nasa_12092025.xlsx", "PARASOL_Limited_12092025.xlsx", "broken.xlsx"
+        ]
+        assert [r['rows'] for r in results] == [2, 1, 0]
+        assert results[2]['error'] is not None
+        assert len(lines) == 3
+
+        records = [json.loads(line) for line in (output_dir / "NASA_GCI_Nasa_12092025.jsonl").read_text().splitlines()]
+        assert [r['employee_id'] for r in records] == ['812001', '812002']
+        assert records[0]['amount'] == 9000.0
+        assert records[0]['source_file'] == "NASA_GCI_Nasa_12092025.xlsx"
+        assert records[0]['umbrella_code'] == 'NASA'
+        assert records[0]['submission_date'] == '12092025'
+
+    def test_main_exit_code(self, pay_dir, tmp_path, capsys):
+        """Test that the CLI reports totals and fails when a file fails"""
+        output_dir = tmp_path / "out"
+
+        assert main([str(pay_dir), '--output-dir', str(output_dir), '--workers', '1']) == 1
+        assert 'Rows: 3' in capsys.readouterr().out
+
+        assert main([str(pay_dir), '--output-dir', str(output_dir), '--workers', '1',
+                     '--pattern', 'N*.xlsx']) == 0
@@ -0,0 +1,117 @@
+"""
+Unit tests for csv_reader.py
+Tests the CSV/TSV engine against the xlsx engines
+"""
+
+import csv
+import glob
+import io
+import os
+
+import pytest
+from openpyxl import load_workbook
+from common.csv_reader import SNIFF_BYTES, CsvReader, is_delimited_filename
+from common.excel_parser import PayFileParser
+from common.header_profiles import HeaderProfileRegistry
+from common.money import Money
+
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+SAMPLE_FILES = sorted(
+    glob.glob(os.path.join(REPO_ROOT, 'InputData', '*.xlsx')) +
+    glob.glob(os.path.join(REPO_ROOT, 'tests', 'fixtures', '*.xlsx'))
+)
+
+HEADER = ['employee id', 'surname', 'forename', 'unit', 'day rate', 'amount', 'vat', 'company', 'notes']
+
+
+def xlsx_to_csv(path, delimiter=','):
+    """Export the active sheet the way Excel's 'Save as CSV' does (empty cells as empty fields)"""
+    out = io.StringIO()
+    writer = csv.writer(out, delimiter=delimiter, lineterminator='\r\n')
+    for row in load_workbook(path, data_only=True).active.iter_rows(values_only=True):
+        writer.writerow(['' if value is None else value for value in row])
+    return out.getvalue()
+
+
+def parse(source, **kwargs):
+    """Parse with a fresh header profile registry"""
+    with PayFileParser(source, header_profiles=HeaderProfileRegistry(), **kwargs) as parser:
+        return parser.parse_records()
+
+
+class TestCsvReader:
+    """Test CSV/TSV reading"""
+
+    @pytest.mark.parametrize('path', SAMPLE_FILES, ids=os.path.basename)
+    def test_csv_engine_parity(self, path, tmp_path):
+        """Test that a CSV export parses to the same records as the xlsx"""
+        csv_path = tmp_path / (os.path.basename(path)[:-len('.xlsx')] + '.csv')
+        csv_path.write_text(xlsx_to_csv(path), encoding='utf-8')
+
+        assert parse(str(csv_path)) == parse(path)
+
+    def test_tsv_and_bytes_source(self):
+        """Test tab-delimited text given as bytes with a .tsv filename"""
+        path = SAMPLE_FILES[0]
+        data = xlsx_to_csv(path, delimiter='\t').encode('utf-8')
+
+        records = parse(data, filename=os.path.basename(path)[:-len('.xlsx')] + '.tsv')
+
+        assert records == parse(path)
+
+    def test_engine_selected_from_filename(self, tmp_path):
+        """Test that .csv names switch the parser to the csv engine"""
+        file_path = tmp_path / "NASA_GCI_Nasa_01092025.csv"
+        file_path.write_text(','.join(HEADER) + '\n812001,Mays,Jonathan,20,450,9000,1800,NASA GROUP,\n')
+
+        with PayFileParser(str(file_path), engine='xml') as parser:
+            assert parser.engine == 'csv'
+            assert parser.extract_metadata()['umbrella_code'] == 'NASA'
+            records = parser.parse_records()
+
+        assert records[0]['employee_id'] == '812001'
+        assert records[0]['amount'] == Money.parse('9000.00')
+        assert records[0]['gross_amount'] == Money.parse('10800.00')
+
+    def test_sniffed_delimiter_and_encodings(self):
+        """Test semicolon sniffing, a UTF-8 BOM and Windows-1252 pound signs"""
+        text = ';'.join(HEADER) + '\r\n' + '812001;Mays;Jonathan;20;450;"£9,000.00";£1800;NASA GROUP;\r\n'
+
+        for data in (text.encode('utf-8-sig'), text.encode('cp1252')):
+            records = parse(io.BytesIO(data), engine='csv', filename='NASA pay 01092025')
+
+            assert len(records) == 1
+            assert records[0]['employee_id'] == '812001'
+            assert records[0]['amount'] == Money.parse('9000.00')
+            assert records[0]['vat_amount'] == Money.parse('1800.00')
+
+    def test_cp1252_past_sniff_window(self):
+        """Test a Windows-1252 file that is plain ASCII until after the first SNIFF_BYTES"""
+        row = '812001,Mays,Jonathan,20,450,9000,1800,NASA GROUP,\r\n'
+        rows = [row] * (SNIFF_BYTES // len(row) + 100)
+        rows.append('812002,Dupont,Renée,20,450,9000,1800,NASA GROUP,\r\n')
+        data = (','.join(HEADER) + '\r\n' + ''.join(rows)).encode('cp1252')
+        assert data.index('é'.encode('cp1252')) > SNIFF_BYTES
+
+        records = parse(io.BytesIO(data), engine='csv', filename='NASA pay 01092025.csv')
+
+        assert len(records) == len(rows)
+        assert records[-1]['forename'] == 'Renée'
+
+    def test_iter_rows_window(self):
+        """Test min_row/max_row/max_col and empty fields as None"""
+        reader = CsvReader(io.BytesIO(b'a,b,c\nd,,f\ng,h,i\n'), filename='rows.csv')
+
+        rows = list(reader.active.iter_rows(min_row=2, max_row=3, max_col=2))
+
+        assert rows == [('d', None), ('g', 'h')]
+        reader.close()
+
+    def test_is_delimited_filename(self):
+        """Test suffix detection for filenames and S3 keys"""
+        assert is_delimited_filename('uploads/2025/09/x.csv')
+        assert is_delimited_filename('PAY.CSV')
+        assert is_delimited_filename('pay.tsv')
+        assert not is_delimited_filename('pay.xlsx')
+        assert not is_delimited_filename(None)
@@ -7,7 +7,8 @@ import os
 import pytest
 from unittest.mock import MagicMock, patch
 from openpyxl import Workbook
-from common.excel_parser import PayFileParser
+from common.money import Money
+from common.excel_parser import PayFileParser, choose_engine, resolve_filename_metadata, umbrella_code_from_records
 
 
 class TestPayFileParser:
@@ -137,10 +138,10 @@ class TestPayFileParser:
         assert records[0]['surname'] == 'Mays'
         assert records[0]['forename'] == 'Jonathan'
         assert records[0]['unit_days'] == 20
-        assert records[0]['day_rate'] == 450.00
-        assert records[0]['amount'] == 9000.00
-        assert records[0]['vat_amount'] == 1800.00
-        assert records[0]['gross_amount'] == 10800.00
+        assert records[0]['day_rate'] == Money.parse('450.00')
+        assert records[0]['amount'] == Money.parse('9000.00')
+        assert records[0]['vat_amount'] == Money.parse('1800.00')
+        assert records[0]['gross_amount'] == Money.parse('10800.00')
         assert records[0]['record_type'] == 'NORMAL'
 
         parser.close()
@@ -160,7 +161,7 @@ class TestPayFileParser:
         assert records[1]['record_type'] == 'OVERTIME'
         assert records[1]['employee_id'] == '812001'
         assert records[1]['unit_days'] == 2
-        assert records[1]['day_rate'] == 675.00
+        assert records[1]['day_rate'] == Money.parse('675.00')
 
         parser.close()
 
@@ -287,10 +288,10 @@ class TestPayFileParser:
 
         # Check types
         assert isinstance(record['unit_days'], (int, float))
-        assert isinstance(record['day_rate'], (int, float))
-        assert isinstance(record['amount'], (int, float))
-        assert isinstance(record['vat_amount'], (int, float))
-        assert isinstance(record['gross_amount'], (int, float))
+        assert isinstance(record['day_rate'], Money)
+        assert isinstance(record['amount'], Money)
+        assert isinstance(record['vat_amount'], Money)
+        assert isinstance(record['gross_amount'], Money)
 
         parser.close()
 
@@ -381,3 +382,204 @@ class TestPayFileParser:
         assert records[0]['forename'] == 'Seán'
 
         parser.close()
+
+    def test_streaming_engine_matches_full_engine(self, excel_file_with_empty_rows):
+        """Test that the streaming engine parses the same records as the full engine"""
+        with PayFileParser(excel_file_with_empty_rows) as parser:
+            full_records = parser.parse_records()
+
+        with PayFileParser(excel_file_with_empty_rows, engine='streaming') as parser:
+            streaming_records = parser.parse_records()
+
+        assert len(full_records) == 2
+        assert streaming_records == full_records
+
+    def test_unknown_engine_rejected(self, simple_excel_file):
+        """Test that an unknown engine name raises ValueError"""
+        with pytest.raises(ValueError):
+            PayFileParser(simple_excel_file, engine='turbo')
+
+    def test_choose_engine_by_size(self):
+        """Test engine tiers, threshold overrides and the file-size fallback"""
+        assert choose_engine(sheet_bytes=50_000)[0] == 'full'
+        assert choose_engine(sheet_bytes=5_000_000)[0] == 'streaming'
+        assert choose_engine(sheet_bytes=50_000_000)[0] == 'xml'
+
+        overrides = {'PARSE_STREAMING_MIN_BYTES': 10_000, 'PARSE_XML_MIN_BYTES': 40_000}
+        assert choose_engine(sheet_bytes=20_000, thresholds=overrides)[0] == 'streaming'
+        assert choose_engine(sheet_bytes=50_000, thresholds=overrides)[0] == 'xml'
+        assert choose_engine(sheet_bytes=5_000, thresholds={'PARSE_XML_MIN_BYTES': 4_000})[0] == 'xml'
+
+        engine, reason = choose_engine(file_bytes=1_000_000)
+        assert engine == 'streaming'
+        assert 'file 1000000 bytes' in reason
+
+        # Sheet size wins over file size when both are known
+        assert choose_engine(sheet_bytes=50_000, file_bytes=10_000_000)[0] == 'full'
+        assert choose_engine() == ('full', 'size unknown')
+
+    def test_auto_engine_selection(self, simple_excel_file):
+        """Test that the default engine is picked from the sheet size and recorded"""
+        with PayFileParser(simple_excel_file) as parser:
+            assert parser.engine == 'full'
+            assert 'sheet XML' in parser.engine_reason
+            expected = parser.parse_records()
+
+        with open(simple_excel_file, 'rb') as f:
+            data = f.read()
+
+        with PayFileParser(data, filename='pay.xlsx', engine_thresholds={'PARSE_XML_MIN_BYTES': 1}) as parser:
+            assert parser.engine == 'xml'
+            assert parser.parse_records() == expected
+
+        # An explicit engine is used as-is
+        with PayFileParser(simple_excel_file, engine='full') as parser:
+            assert parser.engine_reason == 'requested'
+
+    def test_iter_records_is_lazy(self, simple_excel_file):
+        """Test that iter_records yields records one at a time"""
+        with PayFileParser(simple_excel_file, engine='streaming') as parser:
+            iterator = parser.iter_records()
+
+            first = next(iterator)
+            assert first['surname'] == 'Mays'
+            assert len(list(iterator)) == 2
+
+    def test_keeps_rows_after_empty_gap(self, tmp_path):
+        """Test that a run of empty rows doesn't end parsing - rows after the gap are kept"""
+        file_path = tmp_path / "trailing_rows.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+
+        ws.append(['Employee ID', 'Surname', 'Forename', 'Unit (Days)', 'Day Rate', 'Amount', 'VAT', 'Gross Amount'])
+        ws.append(['812001', 'Mays', 'Jonathan', 20, 450.00, 9000.00, 1800.00, 10800.00])
+        ws.append([None])
+        ws.append(['812002', 'Hunt', 'David', 18, 500.00, 9000.00, 1800.00, 10800.00])
+
+        # Styled but empty rows, then a stray value well past the end of the data
+        for _ in range(5):
+            ws.append([None])
+        ws.append(['999999', 'Stray', 'Row', 1, 1.00, 1.00, 0.20, 1.20])
+
+        wb.save(file_path)
+
+        for engine in ('full', 'streaming', 'xml'):
+            with PayFileParser(str(file_path), engine=engine) as parser:
+                records = parser.parse_records()
+                blank_rows = parser.blank_rows
+
+            assert [r['employee_id'] for r in records] == ['812001', '812002', '999999']
+            stray = records[-1]
+            assert (stray['surname'], stray['forename']) == ('Stray', 'Row')
+            assert stray['gross_amount'] == Money.parse('1.20')
+            assert blank_rows == 6
+
+    def test_parse_records_single_pass(self, excel_file_with_empty_rows):
+        """Test that header detection, mapping and parsing share one row iterator"""
+        for engine in ('full', 'streaming'):
+            with PayFileParser(excel_file_with_empty_rows, engine=engine) as parser:
+                with patch.object(parser.worksheet, 'iter_rows', wraps=parser.worksheet.iter_rows) as iter_rows:
+                    records = parser.parse_records()
+
+                assert iter_rows.call_count == 1
+                assert len(records) == 2
+                assert parser.header_row == 3
+                assert parser.column_map['employee_id'] == 0
+
+    def test_header_defaults_to_first_row(self, tmp_path):
+        """Test that rows are replayed when no header is detected"""
+        file_path = tmp_path / "no_header.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+
+        # Too few header indicators to be detected, so row 1 is used
+        ws.append(['Employee ID', 'Surname', 'Forename', 'Days'])
+        ws.append(['812001', 'Mays', 'Jonathan', 20])
+        ws.append(['812002', 'Hunt', 'David', 18])
+
+        wb.save(file_path)
+
+        with PayFileParser(str(file_path)) as parser:
+            records = parser.parse_records()
+
+        assert parser.header_row == 1
+        assert [r['employee_id'] for r in records] == ['812001', '812002']
+        assert records[0]['row_number'] == 2
+
+    def test_parse_from_bytes_and_file_objects(self, simple_excel_file):
+        """Test that the parser accepts bytes and file-like objects"""
+        import io
+
+        with open(simple_excel_file, 'rb') as f:
+            content = f.read()
+
+        with PayFileParser(simple_excel_file) as parser:
+            expected = parser.parse_records()
+
+        class NonSeekableBody:
+            """Mimics an S3 StreamingBody"""
+            def __init__(self, data):
+                self._stream = io.BytesIO(data)
+
+            def read(self, *args):
+                return self._stream.read(*args)
+
+        source_factories = [lambda: content, lambda: io.BytesIO(content), lambda: NonSeekableBody(content)]
+        for make_source in source_factories:
+            for engine in ('full', 'streaming'):
+                with PayFileParser(make_source(), engine=engine, filename='NASA_GCI_Nasstar_Contractor_Pay_01092025.xlsx') as parser:
+                    assert parser.parse_records() == expected
+                    metadata = parser.extract_metadata()
+
+                assert metadata['umbrella_code'] == 'NASA'
+                assert metadata['submission_date'] == '01092025'
+                assert parser.file_path is None
+
+    def test_unsupported_source_rejected(self):
+        """Test that unsupported source types raise TypeError"""
+        with pytest.raises(TypeError):
+            PayFileParser(12345)
+
+    def test_resolve_filename_metadata(self):
+        """Test metadata resolution from filenames without opening a workbook"""
+        metadata = resolve_filename_metadata(
+            'NASA GCI Nasstar Contractor Pay Figures 01092025.xlsx',
+            'uploads/2025/09/20250901_120000_abc.xlsx'
+        )
+
+        assert metadata == {
+            'filename': 'NASA GCI Nasstar Contractor Pay Figures 01092025.xlsx',
+            'umbrella_code': 'NASA',
+            'submission_date': '01092025'
+        }
+
+    def test_resolve_filename_metadata_falls_through_candidates(self):
+        """Test that later candidates are tried and unresolvable names return None"""
+        metadata = resolve_filename_metadata(None, 'uploads/2025/09/Parasol_Pay_15082025.xlsx')
+        assert metadata['umbrella_code'] == 'PARASOL'
+        assert metadata['filename'] == 'Parasol_Pay_15082025.xlsx'
+
+        assert resolve_filename_metadata('payroll.xlsx', 'uploads/2025/09/20250901_120000_abc.xlsx') is None
+        assert resolve_filename_metadata() is None
+
+    def test_resolve_filename_metadata_input_data(self):
+        """Test that every sample file resolves from its filename alone"""
+        input_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'InputData')
+        filenames = [f for f in os.listdir(input_dir) if f.endswith('.xlsx')]
+        assert filenames
+
+        for filename in filenames:
+            metadata = resolve_filename_metadata(filename)
+            assert metadata is not None, f"Failed for {filename}"
+
+    def test_umbrella_code_from_records(self):
+        """Test umbrella inference from the company column"""
+        records = [
+            {'company': ''},
+            {'company': 'GIANT PROFESSIONAL LIMITED (PRG)'},
+        ]
+
+        assert umbrella_code_from_records(records) == 'GIANT'
+        assert umbrella_code_from_records([{'company': 'Unknown Ltd'}]) is None
@@ -3,8 +3,14 @@ Unit tests for fuzzy_matcher.py
 Tests Levenshtein distance name matching with various scenarios
 """
 
+import logging
+import random
+import string
+from unittest.mock import patch
+
 import pytest
-from common.fuzzy_matcher import FuzzyMatcher
+from common import fuzzy_matcher
+from common.fuzzy_matcher import CandidateIndex, FuzzyMatcher
 
 
 class TestFuzzyMatcher:
@@ -212,3 +218,202 @@ class TestFuzzyMatcher:
         # Both empty
         result = matcher.match_contractor_name('', '', sample_contractors)
         assert result is None
+
+
+def levenshtein_ratio(s1, s2):
+    """fuzzywuzzy's fuzz.ratio as computed with python-Levenshtein installed (the Lambda layer)"""
+    from rapidfuzz.distance import Indel
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+    return int(round(100 * Indel.normalized_similarity(s1, s2)))
+
+
+def random_registry(rng, size):
+    """Contractor dicts with random, partly repeated names"""
+    surnames = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(size // 3 + 1)]
+    forenames = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))) for _ in range(12)]
+    return [
+        {'ContractorID': f'C{idx:04d}', 'NormalizedName': f"{rng.choice(forenames)} {rng.choice(surnames)}"}
+        for idx in range(size)
+    ]
+
+
+def mutate(rng, name):
+    """Up to two random edits"""
+    chars = list(name)
+    for _ in range(rng.randint(0, 2)):
+        pos = rng.randrange(len(chars))
+        op = rng.choice('sid')
+        if op == 's':
+            chars[pos] = rng.choice(string.ascii_lowercase)
+        elif op == 'i':
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        elif len(chars) > 1:
+            del chars[pos]
+    return ''.join(chars)
+
+
+@pytest.mark.skipif(not fuzzy_matcher.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not installed")
+class TestRapidfuzzEngine:
+    """Test that the rapidfuzz engine matches the per-candidate fuzzywuzzy loop"""
+
+    @pytest.mark.parametrize('threshold', [75, 85])
+    def test_same_results_as_fuzzywuzzy_loop(self, monkeypatch, threshold):
+        """Test match type, contractor and confidence on random names and typos"""
+        monkeypatch.setattr(fuzzy_matcher.fuzz, 'ratio', levenshtein_ratio)
+        rng = random.Random(threshold)
+        registry = random_registry(rng, 300)
+        loop = FuzzyMatcher(threshold=threshold, engine='fuzzywuzzy')
+        fast = FuzzyMatcher(threshold=threshold, engine='rapidfuzz')
+        index = fast.index(registry)
+
+        matched = 0
+        for _ in range(400):
+            name = mutate(rng, rng.choice(registry)['NormalizedName'])
+            expected = loop.find_best_match(name, registry)
+
+            assert fast.find_best_match(name, index) == expected
+            assert fast.find_best_match(name, registry) == expected
+            matched += expected is not None
+
+        assert matched > 100
+
+    def test_ties_go_to_first_candidate(self):
+        """Test that equal rounded scores keep the earliest candidate, like the loop"""
+        contractors = [
+            {'ContractorID': 'C001', 'NormalizedName': 'jonathon mays'},
+            {'ContractorID': 'C002', 'NormalizedName': 'jonathan mays'},
+            {'ContractorID': 'C003', 'NormalizedName': 'jonathan mays'},
+        ]
+        matcher = FuzzyMatcher(threshold=85, engine='rapidfuzz')
+
+        assert matcher.find_best_match('Jonathan Mays', contractors)['contractor']['ContractorID'] == 'C002'
+        assert matcher.find_best_match('Jonathen Mays', contractors)['contractor']['ContractorID'] == 'C001'
+
+    def test_candidate_index(self, sample_contractors):
+        """Test the prepared index and engine selection"""
+        index = CandidateIndex(sample_contractors)
+
+        assert len(index) == 4
+        assert index.names[0] == 'jonathan mays'
+        assert index.exact['david hunt'] == 1
+        assert FuzzyMatcher(engine='fuzzywuzzy').find_best_match('David Hunt', index)['contractor']['ContractorID'] == 'C002'
+
+        with pytest.raises(ValueError):
+            FuzzyMatcher(engine='difflib')
+
+
+@pytest.mark.skipif(not fuzzy_matcher.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not installed")
+class TestMatchMany:
+    """Test that batch matching gives the same result as matching each name"""
+
+    def names_and_registry(self, seed):
+        rng = random.Random(seed)
+        registry = random_registry(rng, 200)
+        names = [mutate(rng, rng.choice(registry)['NormalizedName']) for _ in range(150)]
+        names += ['Nobody Atall', '', registry[3]['NormalizedName'].upper()]
+        return names, registry
+
+    @pytest.mark.parametrize('engine', ['rapidfuzz', 'fuzzywuzzy'])
+    def test_per_name_fallback(self, monkeypatch, caplog, engine):
+        """Test the per-name path used without numpy, and the warning when rapidfuzz loses cdist"""
+        monkeypatch.setattr(fuzzy_matcher, 'NUMPY_AVAILABLE', False)
+        names, registry = self.names_and_registry(1)
+        matcher = FuzzyMatcher(threshold=80, engine=engine)
+
+        with caplog.at_level(logging.WARNING, logger=fuzzy_matcher.__name__):
+            results = matcher.match_many(names, registry)
+
+        assert results == [matcher.find_best_match(name, registry) for name in names]
+        assert results[-1]['match_type'] == 'EXACT'
+        warned = [r for r in caplog.records if r.levelno == logging.WARNING and 'numpy' in r.getMessage()]
+        assert len(warned) == (1 if engine == 'rapidfuzz' else 0)
+
+    @pytest.mark.skipif(not fuzzy_matcher.NUMPY_AVAILABLE, reason="numpy not installed")
+    @pytest.mark.parametrize('max_cells', [fuzzy_matcher.MATCH_MANY_MAX_CELLS, 1000])
+    def test_cdist_matches_find_best_match(self, monkeypatch, max_cells):
+        """Test the cdist path, including when it is split into row chunks"""
+        monkeypatch.setattr(fuzzy_matcher, 'MATCH_MANY_MAX_CELLS', max_cells)
+        names, registry = self.names_and_registry(2)
+        matcher = FuzzyMatcher(threshold=80, engine='rapidfuzz')
+        index = matcher.index(registry)
+
+        results = matcher.match_many(names, index)
+
+        assert results == [matcher.find_best_match(name, index) for name in names]
+
+    @pytest.mark.skipif(not fuzzy_matcher.NUMPY_AVAILABLE, reason="numpy not installed")
+    @pytest.mark.parametrize('max_cells', [fuzzy_matcher.MATCH_MANY_MAX_CELLS, 1000])
+    def test_cdist_over_blocks(self, monkeypatch, max_cells):
+        """Test a blocked index is scored with cdist over the union of blocks, per-block results unchanged"""
+        monkeypatch.setattr(fuzzy_matcher, 'MATCH_MANY_MAX_CELLS', max_cells)
+        names, registry = self.names_and_registry(3)
+        matcher = FuzzyMatcher(threshold=80, engine='rapidfuzz')
+        index = matcher.index(registry, blocking=True)
+
+        with patch.object(fuzzy_matcher.rapidfuzz_process, 'cdist', wraps=fuzzy_matcher.rapidfuzz_process.cdist) as cdist:
+            results = matcher.match_many(names, index)
+
+        assert cdist.call_count >= 1
+        assert results == [matcher.find_best_match(name, index) for name in names]
+
+    def test_empty_inputs(self, sample_contractors):
+        """Test no names and no candidates"""
+        matcher = FuzzyMatcher(threshold=80, engine='rapidfuzz')
+
+        assert matcher.match_many([], sample_contractors) == []
+        assert matcher.match_many(['Jonathan Mays'], []) == [None]
+
+
+class TestExactIndex:
+    """Test hash lookups for exact, honorific-stripped and swapped names"""
+
+    @pytest.mark.parametrize('engine', fuzzy_matcher.MATCH_ENGINES)
+    def test_exact_forms_resolve_without_scoring(self, monkeypatch, sample_contractors, engine):
+        """Test that exact, titled and swapped names never reach fuzzy scoring"""
+        if engine == 'rapidfuzz' and not fuzzy_matcher.RAPIDFUZZ_AVAILABLE:
+            pytest.skip("rapidfuzz not installed")
+        monkeypatch.setattr(fuzzy_matcher.fuzz, 'ratio', None)
+        monkeypatch.setattr(fuzzy_matcher, 'rapidfuzz_process', None)
+        matcher = FuzzyMatcher(threshold=85, engine=engine)
+        index = matcher.index(sample_contractors)
+
+        cases = [
+            ('Jonathan Mays', 'EXACT'),
+            ('Mr. Jonathan Mays', 'EXACT'),
+            ('Dr Jonathan  Mays', 'EXACT'),
+            ('Mays Jonathan', 'SWAPPED'),
+            ('Mr Mays, Jonathan', 'SWAPPED'),
+        ]
+        for name, match_type in cases:
+            result = matcher.find_best_match(name, index)
+            assert result['match_type'] == match_type, name
+            assert result['confidence'] == 100
+            assert result['contractor']['ContractorID'] == 'C001'
+            assert result['searched_name'] == name
+
+    def test_name_keys(self):
+        """Test the plain and swapped keys"""
+        assert fuzzy_matcher.name_keys('Mrs Jane Smith') == ('jane smith', 'jane smith')
+        assert fuzzy_matcher.name_keys('smith jane') == ('smith jane', 'jane smith')
+        # A name that is only a title keeps it
+        assert fuzzy_matcher.name_keys('Dr') == ('dr', 'dr')
+        assert fuzzy_matcher.name_keys('') == ('', '')
+
+    def test_direct_name_wins_over_variants(self):
+        """Test that a registry entry with the exact name beats a titled or swapped one"""
+        contractors = [
+            {'ContractorID': 'C001', 'NormalizedName': 'smith john'},
+            {'ContractorID': 'C002', 'NormalizedName': 'dr john smith'},
+            {'ContractorID': 'C003', 'NormalizedName': 'john smith'},
+        ]
+        index = CandidateIndex(contractors)
+
+        assert index.lookup('john smith') == (2, 'EXACT')
+        assert index.lookup('dr john smith') == (1, 'EXACT')
+        assert index.lookup('prof john smith') == (2, 'EXACT')
+        assert index.lookup('smith john') == (0, 'EXACT')
+        assert index.lookup('mr smith john') == (0, 'EXACT')
+        assert index.lookup('john smyth') is None
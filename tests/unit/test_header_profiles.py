@@ -0,0 +1,108 @@
+"""
+Unit tests for header_profiles.py
+Tests per-umbrella header profile caching and drift detection
+"""
+
+import pytest
+from unittest.mock import patch
+from openpyxl import Workbook
+from common.excel_parser import PayFileParser
+from common.header_profiles import (
+    HeaderProfileRegistry,
+    header_fingerprint,
+    PROFILE_HIT,
+    PROFILE_NEW,
+    PROFILE_DRIFT,
+)
+
+
+HEADERS = ['Employee ID', 'Surname', 'Forename', 'Unit (Days)', 'Day Rate', 'Amount', 'VAT', 'Gross Amount']
+
+
+def make_pay_file(path, headers, blank_rows_before_header=0):
+    """Write a small pay file with the given header layout"""
+    wb = Workbook()
+    ws = wb.active
+
+    for _ in range(blank_rows_before_header):
+        ws.append(['Pay figures'])
+
+    ws.append(headers)
+    ws.append(['812001', 'Mays', 'Jonathan', 20, 450.00, 9000.00, 1800.00, 10800.00])
+    ws.append(['812002', 'Hunt', 'David', 18, 500.00, 9000.00, 1800.00, 10800.00])
+
+    wb.save(path)
+    return str(path)
+
+
+class TestHeaderProfiles:
+    """Test header profile registry"""
+
+    def test_fingerprint_ignores_case_and_trailing_blanks(self):
+        """Test that cosmetic header differences give the same fingerprint"""
+        assert header_fingerprint(['Employee ID', ' Surname ', None, None]) == header_fingerprint(['employee id', 'surname'])
+        assert header_fingerprint(['Employee ID', 'Surname']) != header_fingerprint(['Surname', 'Employee ID'])
+
+    def test_first_file_creates_profile(self, tmp_path):
+        """Test that the first file for an umbrella records a profile"""
+        registry = HeaderProfileRegistry()
+        path = make_pay_file(tmp_path / 'NASA_Pay_01092025.xlsx', HEADERS, blank_rows_before_header=2)
+
+        with PayFileParser(path, header_profiles=registry) as parser:
+            records = parser.parse_records()
+
+        assert len(records) == 2
+        assert parser.header_profile_status == PROFILE_NEW
+        assert registry.get('NASA')['header_row'] == 3
+        assert registry.get('NASA')['column_map'] == parser.column_map
+
+    def test_matching_file_skips_discovery(self, tmp_path):
+        """Test that a file matching the cached profile skips header discovery"""
+        registry = HeaderProfileRegistry()
+        first = make_pay_file(tmp_path / 'NASA_Pay_01092025.xlsx', HEADERS, blank_rows_before_header=2)
+        second = make_pay_file(tmp_path / 'NASA_Pay_08092025.xlsx', HEADERS, blank_rows_before_header=2)
+
+        with PayFileParser(first, header_profiles=registry) as parser:
+            expected = parser.parse_records()
+
+        for engine in ('full', 'streaming'):
+            with PayFileParser(second, engine=engine, header_profiles=registry) as parser:
+                with patch.object(PayFileParser, '_is_header_row', side_effect=AssertionError('discovery should be skipped')):
+                    records = parser.parse_records()
+
+            assert parser.header_profile_status == PROFILE_HIT
+            assert parser.header_row == 3
+            assert records == expected
+
+        assert registry.stats[PROFILE_HIT] == 2
+
+    def test_layout_change_is_drift(self, tmp_path):
+        """Test that a changed layout reruns discovery and is recorded as drift"""
+        registry = HeaderProfileRegistry()
+        first = make_pay_file(tmp_path / 'GIANT_Pay_01092025.xlsx', HEADERS)
+        moved = make_pay_file(tmp_path / 'GIANT_Pay_08092025.xlsx', HEADERS, blank_rows_before_header=1)
+
+        with PayFileParser(first, header_profiles=registry) as parser:
+            parser.parse_records()
+
+        with PayFileParser(moved, header_profiles=registry) as parser:
+            records = parser.parse_records()
+
+        assert len(records) == 2
+        assert parser.header_profile_status == PROFILE_DRIFT
+        assert parser.header_row == 2
+        assert registry.stats[PROFILE_DRIFT] == 1
+        assert registry.drift_events[0]['umbrella_code'] == 'GIANT'
+        assert registry.drift_events[0]['previous_header_row'] == 1
+        assert registry.get('GIANT')['header_row'] == 2
+
+    def test_no_umbrella_no_profile(self, tmp_path):
+        """Test that files without an umbrella in the name are not profiled"""
+        registry = HeaderProfileRegistry()
+        path = make_pay_file(tmp_path / 'payroll.xlsx', HEADERS)
+
+        with PayFileParser(path, header_profiles=registry) as parser:
+            assert len(parser.parse_records()) == 2
+
+        assert parser.header_profile_status is None
+        assert registry.profiles == {}
@@ -0,0 +1,72 @@
+"""
+Unit tests for money.py
+Tests integer-pence money parsing, arithmetic and formatting
+"""
+
+from decimal import Decimal
+
+import pytest
+from common.money import Money, pence_to_pounds, total
+
+
+class TestMoney:
+    """Test the Money type"""
+
+    @pytest.mark.parametrize('value, pence', [
+        (9000, 900000),
+        (9000.0, 900000),
+        (1800.2, 180020),
+        (0.1 + 0.2, 30),
+        (1993.024, 199302),
+        (1.005, 101),
+        (2.675, 268),
+        (-12.5, -1250),
+        (Decimal('1234.565'), 123457),
+        ('£1,234.50', 123450),
+        ('-.5', -50),
+        ('12.', 1200),
+        ('1.2e3', 120000),
+        ('  -  ', 0),
+        ('', 0),
+        ('n/a', 0),
+        (None, 0),
+        (float('nan'), 0),
+    ])
+    def test_parse(self, value, pence):
+        """Test parsing pounds from floats, Decimals and text"""
+        money = Money.parse(value)
+
+        assert isinstance(money, Money)
+        assert money.pence == pence
+
+    def test_arithmetic_stays_exact(self):
+        """Test that sums are exact and stay Money"""
+        values = [0.1] * 10 + [1993.024, 314.688]
+
+        assert total(values) == Money(1 * 100 + 199302 + 31469)
+        assert sum([Money(10), Money(20)]) == Money(30)
+        assert isinstance(sum([Money(10), Money(20)]), Money)
+        assert isinstance(Money(500) - Money(200), Money)
+        assert abs(Money(-5)) == Money(5)
+
+    def test_conversions_and_formatting(self):
+        """Test pounds, Decimal and string forms"""
+        money = Money.parse('9000.5')
+
+        assert money.pounds == 9000.5
+        assert money.to_decimal() == Decimal('9000.50')
+        assert str(money.to_decimal()) == '9000.50'
+        assert f"£{money:.2f}" == '£9000.50'
+        assert f"£{money:,.2f}" == '£9,000.50'
+        assert repr(money) == "Money('9000.50')"
+
+    def test_scale_by_rate(self):
+        """Test VAT and overtime style multiplication without rounding"""
+        amount = Money.parse(9001)
+
+        expected_vat = amount.scale(Decimal('0.20'))
+
+        assert expected_vat == Decimal('180020')
+        assert pence_to_pounds(expected_vat) == Decimal('1800.2')
+        assert Money.parse(450).scale(1.5) == Decimal('67500')
+        assert abs(Money.parse('1800.19') - expected_vat) <= 1
@@ -0,0 +1,34 @@
+"""
+Unit tests for name_aliases.py
+Tests alias items and the alias lookup table
+"""
+
+from common.name_aliases import ALIASES_GSI1PK, AliasTable, alias_item, alias_gsi1sk_prefix
+
+
+class TestNameAliases:
+    """Test learned alias items and lookups"""
+
+    def test_alias_item_keys(self, sample_contractors):
+        """Test the item is stored under the contractor and indexed by variant and umbrella"""
+        item = alias_item('jonathon mays', sample_contractors[0], 'U1', 92, 'file-1')
+
+        assert item['PK'] == 'CONTRACTOR#C001'
+        assert item['SK'] == 'ALIAS#U1#jonathon mays'
+        assert item['EntityType'] == 'NameAlias'
+        assert item['GSI2PK'] == 'NAME#jonathon mays'
+        assert item['GSI1PK'] == ALIASES_GSI1PK
+        assert item['GSI1SK'].startswith(alias_gsi1sk_prefix('U1'))
+        assert (item['Confidence'], item['FirstSeenFileID'], item['MatchedName']) == (92, 'file-1', 'jonathan mays')
+
+    def test_lookup_is_per_umbrella_and_first_seen_wins(self, sample_contractors):
+        """Test umbrella scoping and duplicate resolution"""
+        first = dict(alias_item('jonathon mays', sample_contractors[0], 'U1', 92, 'file-1'), FirstSeenAt='2025-01-01T00:00:00Z')
+        later = dict(alias_item('jonathon mays', sample_contractors[1], 'U1', 90, 'file-2'), FirstSeenAt='2025-02-01T00:00:00Z')
+
+        table = AliasTable([later, first])
+
+        assert len(table) == 1
+        assert table.lookup('jonathon mays', 'U1') is first
+        assert table.lookup('jonathon mays', 'U2') is None
+        assert table.lookup('jon mays', 'U1') is None
@@ -0,0 +1,80 @@
+"""
+Unit tests for name_blocking.py
+Tests phonetic keys, n-grams and candidate blocking
+"""
+
+import glob
+import os
+
+import pytest
+from common import fuzzy_matcher
+from common.excel_parser import PayFileParser
+from common.fuzzy_matcher import FuzzyMatcher
+from common.name_blocking import BlockingIndex, blocking_keys, ngrams, soundex, split_name
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+
+
+class TestNameBlocking:
+    """Test blocking keys and the blocking index"""
+
+    @pytest.mark.parametrize('word,code', [
+        ('Robert', 'R163'), ('Rupert', 'R163'), ('Ashcraft', 'A261'), ('Tymczak', 'T522'),
+        ('Pfister', 'P236'), ('Lee', 'L000'), ('Smith', 'S530'), ('Smyth', 'S530'), ('', ''),
+    ])
+    def test_soundex(self, word, code):
+        """Test Soundex codes against the standard examples"""
+        assert soundex(word) == code
+
+    def test_ngrams_and_split(self):
+        """Test padded n-grams and forename/surname split"""
+        assert ngrams('ann') == {'$an', 'ann', 'nn$'}
+        assert ngrams('al', 2) == {'$a', 'al', 'l$'}
+        assert ngrams('') == {'$$'}
+        assert split_name('Jane Smith-Jones') == ('jane', 'smithjones')
+        assert split_name('  ') == ('', '')
+
+    def test_single_typo_keeps_a_key(self):
+        """Test that a typo in either part still shares a key with the real name"""
+        keys = blocking_keys('jonathan mays')
+
+        for typo in ('jonahtan mays', 'jonathan mais', 'yonathan mays', 'jonathan says'):
+            assert keys & blocking_keys(typo), typo
+        assert not keys & blocking_keys('donna smith')
+        assert blocking_keys('') == set()
+
+    def test_candidates_in_registry_order(self):
+        """Test that blocks are sorted positions and min_shared narrows them"""
+        names = ['donna smith', 'jonathan mays', 'david hunt', 'jonathon mays', 'jon mays']
+        index = BlockingIndex(names)
+
+        assert index.candidates('jonathan maye') == [1, 3, 4]
+        assert index.candidates('nobody') == []
+        assert BlockingIndex(names, min_shared=20).candidates('jonathan mays') == [1, 3]
+        assert BlockingIndex(names, min_shared=40).candidates('jonathan mays') == [1]
+
+
+@pytest.mark.skipif(not fuzzy_matcher.RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not installed")
+class TestBlockingRecall:
+    """Test that blocking never drops a match the full scan would make"""
+
+    def test_fixture_pay_files(self, sample_contractors):
+        """Test every name in the fixture pay files against the fixture contractors"""
+        names = []
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.xlsx'))):
+            with PayFileParser(path) as parser:
+                names += [f"{r['forename']} {r['surname']}" for r in parser.parse_records()]
+        assert names
+
+        for threshold in (75, 85):
+            matcher = FuzzyMatcher(threshold=threshold, engine='rapidfuzz')
+            blocked = matcher.index(sample_contractors, blocking=True)
+            full = matcher.index(sample_contractors, blocking=False)
+
+            for name in names:
+                expected = matcher.find_best_match(name, full)
+                assert matcher.find_best_match(name, blocked) == expected, name
+
+        matcher = FuzzyMatcher(threshold=75, engine='rapidfuzz')
+        blocked = matcher.index(sample_contractors, blocking=True)
+        assert matcher.find_best_match('Jon Mays', blocked)['match_type'] == 'FUZZY'
@@ -0,0 +1,66 @@
+"""
+Unit tests for permanent_staff.py
+Tests the versioned permanent staff registry
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from common.permanent_staff import PermanentStaffRegistry, normalize_staff_name, staff_name
+
+
+def staff_db(version='v1'):
+    db = MagicMock()
+    db.get_permanent_staff_version = MagicMock(return_value=version)
+    db.get_permanent_staff = MagicMock(return_value=[
+        {'FirstName': 'Gareth', 'LastName': 'Jones', 'NormalizedName': 'gareth jones'},
+        {'FirstName': 'Victor', 'LastName': 'Cheung'},
+    ])
+    return db
+
+
+class TestPermanentStaffRegistry:
+    """Test loading, version refresh and failure handling"""
+
+    def test_names(self):
+        """Test names are normalised the way PERMANENT# keys are"""
+        assert normalize_staff_name('Gareth', 'Jones') == 'gareth jones'
+        assert staff_name({'FirstName': 'Victor', 'LastName': 'Cheung'}) == 'victor cheung'
+
+        registry = PermanentStaffRegistry(staff_db())
+        assert registry.is_permanent('GARETH', 'jones')
+        assert registry.is_permanent('Victor', 'Cheung')
+        assert not registry.is_permanent('Jonathan', 'Mays')
+        assert len(registry) == 2
+
+    def test_reloads_only_when_version_changes(self):
+        """Test the profiles are queried once per version stamp"""
+        db = staff_db()
+        registry = PermanentStaffRegistry(db)
+
+        first = registry.refresh()
+        assert registry.refresh() is first
+        assert db.get_permanent_staff.call_count == 1
+
+        db.get_permanent_staff_version.return_value = 'v2'
+        db.get_permanent_staff.return_value = []
+        assert registry.refresh() == frozenset()
+        assert registry.version == 'v2'
+        assert db.get_permanent_staff.call_count == 2
+
+    def test_reloads_every_time_without_stamp(self):
+        """Test a missing version stamp never serves a cached set"""
+        db = staff_db(version=None)
+        registry = PermanentStaffRegistry(db)
+
+        registry.refresh()
+        registry.refresh()
+        assert db.get_permanent_staff.call_count == 2
+
+    def test_read_failure_raises(self):
+        """Test a failed read is raised, not treated as 'not permanent'"""
+        db = staff_db()
+        db.get_permanent_staff.side_effect = RuntimeError('throttled')
+
+        with pytest.raises(RuntimeError):
+            PermanentStaffRegistry(db).is_permanent('Gareth', 'Jones')
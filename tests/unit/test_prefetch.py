@@ -0,0 +1,53 @@
+"""
+Unit tests for prefetch.py
+Tests concurrent reference-data prefetch
+"""
+
+import threading
+import time
+
+import pytest
+from common.prefetch import Prefetch
+
+
+class TestPrefetch:
+    """Test the prefetch thread pool"""
+
+    def test_tasks_run_concurrently(self):
+        """Test that slow reads overlap instead of adding up"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def read(value):
+            barrier.wait()
+            return value
+
+        start = time.perf_counter()
+        with Prefetch() as prefetch:
+            prefetch.submit('period', read, {'PeriodNumber': 8})
+            prefetch.submit('contractors', read, {'c1': {}})
+            prefetch.submit('params', read, {'VAT_RATE': 0.2})
+            results = prefetch.results()
+
+        assert results == {'period': {'PeriodNumber': 8}, 'contractors': {'c1': {}}, 'params': {'VAT_RATE': 0.2}}
+        assert time.perf_counter() - start < 5
+        assert set(prefetch.timings) == {'period', 'contractors', 'params'}
+
+    def test_result_reraises_task_error(self):
+        """Test that a failed read surfaces in the caller"""
+        def fail():
+            raise RuntimeError("scan failed")
+
+        with Prefetch() as prefetch:
+            prefetch.submit('contractors', fail)
+            prefetch.submit('period', dict, PeriodNumber=8)
+
+            assert prefetch.result('period') == {'PeriodNumber': 8}
+            with pytest.raises(RuntimeError, match="scan failed"):
+                prefetch.result('contractors')
+
+    def test_duplicate_name_rejected(self):
+        """Test that a task name can only be used once"""
+        with Prefetch() as prefetch:
+            prefetch.submit('period', dict)
+            with pytest.raises(ValueError):
+                prefetch.submit('period', dict)
@@ -0,0 +1,163 @@
+"""
+Unit tests for record_batch.py
+Tests the columnar pay record container
+"""
+
+import json
+from array import array
+
+import pytest
+from openpyxl import Workbook
+from common.excel_parser import PayFileParser
+from common.money import Money
+from common.record_batch import RecordBatch, RECORD_FIELDS
+from common.validators import ValidationEngine
+
+
+def make_record(row_number, employee_id, surname, forename, amount, record_type='NORMAL'):
+    """Build a parser-shaped record dict (money as Money pence)"""
+    return {
+        'row_number': row_number,
+        'row_idx': row_number,
+        'employee_id': employee_id,
+        'surname': surname,
+        'forename': forename,
+        'unit_days': 20.0,
+        'day_rate': Money.parse(amount / 20),
+        'amount': Money.parse(amount),
+        'vat_amount': Money.parse(round(amount * 0.2, 2)),
+        'gross_amount': Money.parse(round(amount * 1.2, 2)),
+        'total_hours': 160.0,
+        'record_type': record_type,
+        'notes': '',
+        'company': 'NASA GROUP'
+    }
+
+
+@pytest.fixture
+def sample_records():
+    return [
+        make_record(2, '812001', 'Mays', 'Jonathan', 9000.0),
+        make_record(3, '812002', 'Hunt', 'David', 9000.0),
+        make_record(4, '812001', 'Mays', 'Jonathan', 1350.0, record_type='OVERTIME'),
+    ]
+
+
+class TestRecordBatch:
+    """Test columnar record batches"""
+
+    def test_roundtrip_records(self, sample_records):
+        """Test that row views read back the original records"""
+        batch = RecordBatch.from_records(sample_records)
+
+        assert len(batch) == 3
+        assert batch.to_records() == sample_records
+        assert batch[1] == sample_records[1]
+        assert batch[-1]['record_type'] == 'OVERTIME'
+        assert batch[0].get('missing', 'default') == 'default'
+
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_typed_columns_and_interned_strings(self, sample_records):
+        """Test that numeric columns are typed arrays and strings are shared"""
+        batch = RecordBatch.from_records(sample_records)
+
+        assert isinstance(batch.column('amount'), array)
+        assert batch.column('amount').typecode == 'q'
+        assert list(batch.column('amount')) == [900000, 900000, 135000]
+        assert batch.column('unit_days').typecode == 'd'
+        assert batch.column('row_number').typecode == 'q'
+
+        assert isinstance(batch[0]['amount'], Money)
+        assert batch[0]['vat_amount'].pence == 180000
+
+        surnames = batch.column('surname')
+        assert surnames[0] is surnames[2]
+        assert batch.column('record_type')[0] is batch.column('record_type')[1]
+
+    def test_payload_is_json_roundtrippable(self, sample_records):
+        """Test that the payload survives JSON (Step Functions, artifact cache)"""
+        batch = RecordBatch.from_records(sample_records, attrs={'umbrella_id': 'U1'})
+
+        payload = json.loads(json.dumps(batch.to_payload()))
+        restored = RecordBatch.from_payload(payload)
+
+        assert restored.to_records() == sample_records
+        # Money leaves the batch in pounds
+        assert payload['columns']['amount'] == [9000.0, 9000.0, 1350.0]
+        assert restored.attrs == {'umbrella_id': 'U1'}
+
+        # Field names appear once, not once per row
+        assert len(json.dumps(payload)) < len(json.dumps(sample_records))
+
+    def test_take_adds_columns_and_attrs(self, sample_records):
+        """Test selecting valid rows with contractor columns attached"""
+        batch = RecordBatch.from_records(sample_records)
+
+        valid = batch.take([0, 2], extra_columns={'contractor_id': ['C001', 'C001']},
+                           attrs={'period_id': '8'})
+
+        assert len(valid) == 2
+        assert valid.fields == RECORD_FIELDS + ('contractor_id',)
+        assert [r['row_number'] for r in valid] == [2, 4]
+        assert valid[1]['contractor_id'] == 'C001'
+        assert valid.attrs == {'period_id': '8'}
+
+        with pytest.raises(ValueError):
+            batch.take([0, 1], extra_columns={'contractor_id': ['C001']})
+
+    def test_take_replaces_existing_columns(self, sample_records):
+        """Test re-taking a batch with a column it already has"""
+        valid = RecordBatch.from_records(sample_records).take([0, 2], extra_columns={'contractor_id': ['C001', 'C002']})
+
+        retaken = valid.take([1], extra_columns={'contractor_id': ['C009'], 'notes': ['checked']})
+
+        assert retaken.fields == RECORD_FIELDS + ('contractor_id',)
+        assert len(retaken.column('contractor_id')) == 1
+        assert len(retaken.column('notes')) == 1
+        assert retaken[0]['contractor_id'] == 'C009'
+        assert retaken[0]['notes'] == 'checked'
+        assert retaken[0]['row_number'] == 4
+        assert RecordBatch.from_payload(retaken.to_payload()).to_records() == retaken.to_records()
+
+    def test_coerce(self, sample_records):
+        """Test accepting batches, payloads and record lists"""
+        batch = RecordBatch.from_records(sample_records)
+
+        assert RecordBatch.coerce(batch) is batch
+        assert RecordBatch.coerce(batch.to_payload()).to_records() == sample_records
+        assert RecordBatch.coerce(sample_records).to_records() == sample_records
+        assert len(RecordBatch.coerce([])) == 0
+
+        # Records with money still in pounds (older callers) are converted to pence
+        pounds = [dict(r, **{f: r[f].pounds for f in ('day_rate', 'amount', 'vat_amount', 'gross_amount')})
+                  for r in sample_records]
+        assert RecordBatch.coerce(pounds).to_records() == sample_records
+
+    def test_parse_batch_matches_parse_records(self, tmp_path):
+        """Test that the parser's batch output matches its record dicts"""
+        file_path = tmp_path / "batch.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Employee ID', 'Surname', 'Forename', 'Unit (Days)', 'Day Rate', 'Amount', 'VAT', 'Gross Amount', 'Notes'])
+        ws.append(['812001', 'Mays', 'Jonathan', 20, 450.00, 9000.00, 1800.00, 10800.00, ''])
+        ws.append(['812001', 'Mays', 'Jonathan', 2, 675.00, 1350.00, 270.00, 1620.00, 'Overtime'])
+        wb.save(file_path)
+
+        with PayFileParser(str(file_path)) as parser:
+            records = parser.parse_records()
+
+        with PayFileParser(str(file_path)) as parser:
+            batch = parser.parse_batch()
+
+        assert batch.to_records() == records
+
+    def test_validators_accept_row_views(self, mock_dynamodb_client):
+        """Test that validation rules read row views like record dicts"""
+        batch = RecordBatch.from_records([make_record(2, '812001', 'Mays', 'Jonathan', 9000.0)])
+        engine = ValidationEngine(mock_dynamodb_client)
+
+        assert engine.validate_vat(batch[0]) == engine.validate_vat(batch[0].to_dict())
+        assert engine.validate_hours(batch[0]) == engine.validate_hours(batch[0].to_dict())
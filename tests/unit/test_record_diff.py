@@ -0,0 +1,98 @@
+"""
+Unit tests for record_diff.py
+Tests row fingerprinting and superseding-file diffs
+"""
+
+from decimal import Decimal
+
+from common.record_diff import (
+    DEFAULT_SUPERSEDE_MODE, diff_records, normalize_supersede_mode, record_fingerprint
+)
+
+
+def make_item(idx, employee_id, amount, record_type='NORMAL', file_id='new'):
+    """Build a pay record item the way import_records does"""
+    return {
+        'PK': f'FILE#{file_id}',
+        'SK': f'RECORD#{idx:03d}',
+        'EntityType': 'PayRecord',
+        'FileID': file_id,
+        'ContractorID': f'contractor-{employee_id}',
+        'AssociationID': f'association-{employee_id}',
+        'EmployeeID': employee_id,
+        'UnitDays': Decimal('20.0'),
+        'DayRate': Decimal(str(amount / 20)),
+        'Amount': Decimal(str(amount)),
+        'VATAmount': Decimal(str(round(amount * 0.2, 2))),
+        'GrossAmount': Decimal(str(round(amount * 1.2, 2))),
+        'TotalHours': Decimal('0'),
+        'RecordType': record_type,
+        'Notes': '',
+        'IsActive': True
+    }
+
+
+class TestRecordDiff:
+    """Test fingerprints and diffs"""
+
+    def test_fingerprint_ignores_keys_and_number_format(self):
+        """Test that file, key and Decimal formatting don't change the fingerprint"""
+        old = make_item(1, '812001', 9000.0, file_id='old')
+        new = make_item(7, '812001', 9000.0)
+        new['Amount'] = Decimal('9000.00')
+        new['TotalHours'] = 0
+
+        assert record_fingerprint(old) == record_fingerprint(new)
+        assert record_fingerprint(old) != record_fingerprint(make_item(1, '812001', 9100.0))
+        assert record_fingerprint(old) != record_fingerprint(make_item(1, '812001', 9000.0, record_type='OVERTIME'))
+
+    def test_diff_classifies_rows(self):
+        """Test unchanged, changed, added and removed rows"""
+        old = [
+            make_item(1, '812001', 9000.0, file_id='old'),
+            make_item(2, '812002', 8000.0, file_id='old'),
+            make_item(3, '812003', 7000.0, file_id='old'),
+            make_item(4, '812001', 1350.0, record_type='OVERTIME', file_id='old'),
+        ]
+        new = [
+            make_item(1, '812001', 9000.0),
+            make_item(2, '812002', 8500.0),
+            make_item(3, '812001', 1350.0, record_type='OVERTIME'),
+            make_item(4, '812004', 6000.0),
+        ]
+
+        diff = diff_records(old, new)
+
+        assert diff.summary() == {'added': 1, 'changed': 1, 'removed': 1, 'unchanged': 2}
+        assert diff.changed == [(old[1], new[1])]
+        assert diff.added == [new[3]]
+        assert diff.removed == [old[2]]
+        assert diff.to_write == [new[1], new[3]]
+        assert diff.to_deactivate == [old[1], old[2]]
+
+    def test_duplicate_rows_counted(self):
+        """Test that repeated identical rows are matched one-for-one"""
+        old = [make_item(1, '812001', 500.0, record_type='EXPENSE', file_id='old')]
+        new = [make_item(1, '812001', 500.0, record_type='EXPENSE'),
+               make_item(2, '812001', 500.0, record_type='EXPENSE')]
+
+        diff = diff_records(old, new)
+
+        assert diff.summary() == {'added': 1, 'changed': 0, 'removed': 0, 'unchanged': 1}
+        assert diff.to_write == [new[1]]
+
+    def test_no_previous_records(self):
+        """Test that everything is added when nothing is active"""
+        new = [make_item(1, '812001', 9000.0), make_item(2, '812002', 8000.0)]
+
+        diff = diff_records([], new)
+
+        assert diff.to_write == new
+        assert diff.to_deactivate == []
+
+    def test_normalize_supersede_mode(self):
+        """Test parameter parsing"""
+        assert normalize_supersede_mode('FULL') == 'full'
+        assert normalize_supersede_mode(' diff ') == 'diff'
+        assert normalize_supersede_mode(None) == DEFAULT_SUPERSEDE_MODE
+        assert normalize_supersede_mode('sometimes') == DEFAULT_SUPERSEDE_MODE
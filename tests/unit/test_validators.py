@@ -5,7 +5,7 @@ Tests all 7 business rules for contractor pay validation
 
 import pytest
 from decimal import Decimal
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from common.validators import ValidationEngine
 
 
@@ -49,6 +49,20 @@ class TestValidationEngine:
             assert result['valid'] is False, f"{first_name} {last_name} should be detected as permanent staff"
             assert result['severity'] == 'CRITICAL'
 
+    def test_rule1_registry_loaded_once_and_failures_raise(self, mock_dynamodb_client, sample_pay_record):
+        """Rule 1: Names come from the permanent staff registry, and a failed load is never a pass"""
+        validator = ValidationEngine(mock_dynamodb_client)
+        mock_dynamodb_client.check_permanent_staff = MagicMock()
+
+        for _ in range(3):
+            assert validator.check_permanent_staff(sample_pay_record)['valid'] is True
+        mock_dynamodb_client.get_permanent_staff.assert_called_once()
+        mock_dynamodb_client.check_permanent_staff.assert_not_called()
+
+        mock_dynamodb_client.get_permanent_staff.side_effect = RuntimeError('throttled')
+        with pytest.raises(RuntimeError):
+            ValidationEngine(mock_dynamodb_client).check_permanent_staff(sample_pay_record)
+
     def test_rule1_contractor_passes(self, mock_dynamodb_client, sample_pay_record):
         """Rule 1: Valid contractor passes permanent staff check"""
         validator = ValidationEngine(mock_dynamodb_client)
@@ -86,6 +100,76 @@ class TestValidationEngine:
         assert result['warning']['warning_type'] == 'FUZZY_NAME_MATCH'
         assert 'confidence' in result['warning']['warning_message']
 
+    def test_rule2_batch_name_matches_used(self, mock_dynamodb_client, sample_pay_record, sample_contractors):
+        """Rule 2: Names matched up front by match_names() give the same results"""
+        validator = ValidationEngine(mock_dynamodb_client)
+        contractors_cache = {c['ContractorID']: c for c in sample_contractors}
+        records = [sample_pay_record, dict(sample_pay_record, forename='Nobody', surname='Known')]
+        expected = [validator.find_contractor(record, contractors_cache) for record in records]
+
+        assert validator.match_names(records, contractors_cache) == 2
+        validator._matcher.find_best_match = MagicMock(side_effect=AssertionError("name scored again"))
+
+        assert [validator.find_contractor(record, contractors_cache) for record in records] == expected
+
+    def test_rule2_learned_alias(self, mock_dynamodb_client, sample_contractors):
+        """Rule 2: A fuzzy match is collected as an alias and resolves without scoring next time"""
+        from common.name_aliases import alias_item
+
+        contractors_cache = {c['ContractorID']: c for c in sample_contractors}
+        record = {'forename': 'Jonathon', 'surname': 'Mays', 'row_number': 5}
+
+        validator = ValidationEngine(mock_dynamodb_client)
+        first = validator.find_contractor(record, contractors_cache, 'U1')
+        assert first['severity'] == 'WARNING'
+        ((key, (contractor, confidence)),) = validator.learned_aliases.items()
+        assert key == ('U1', 'jonathon mays')
+        assert contractor['ContractorID'] == 'C001'
+
+        validator = ValidationEngine(mock_dynamodb_client)
+        validator.set_name_aliases([alias_item('jonathon mays', contractor, 'U1', confidence, 'file-1')])
+        validator._get_matcher().find_best_match = MagicMock(side_effect=AssertionError("name scored again"))
+
+        again = validator.find_contractor(record, contractors_cache, 'U1')
+        assert again['contractor_id'] == 'C001'
+        assert again['warning']['warning_type'] == 'FUZZY_NAME_MATCH'
+        assert 'learned alias' in again['warning']['resolution_notes']
+        assert validator.match_names([record], contractors_cache, 'U1') == 1
+        assert validator.learned_aliases == {}
+
+        # Another umbrella's file is scored as usual
+        validator._matcher = None
+        assert validator.find_contractor(record, contractors_cache, 'U2')['contractor_id'] == 'C001'
+        assert ('U2', 'jonathon mays') in validator.learned_aliases
+
+    def test_rule2_employee_id_resolution(self, mock_dynamodb_client, sample_pay_record, sample_contractors):
+        """Rule 2: The (umbrella, employee ID) association picks the contractor; the name confirms it"""
+        twin = dict(sample_contractors[0], ContractorID='C009', EmployeeID='812009')
+        contractors_cache = {c['ContractorID']: c for c in sample_contractors + [twin]}
+        validator = ValidationEngine(mock_dynamodb_client)
+        validator.set_associations([
+            {'ContractorID': 'C001', 'UmbrellaID': 'U1', 'EmployeeID': '812001'},
+            {'ContractorID': 'C009', 'UmbrellaID': 'U1', 'EmployeeID': '812009'},
+        ])
+
+        # Two contractors share the name; the employee ID (as Excel's float text) separates them
+        record = dict(sample_pay_record, employee_id='812009.0')
+        assert validator.find_contractor(record, contractors_cache, 'U1')['contractor_id'] == 'C009'
+        assert validator.find_contractor(sample_pay_record, contractors_cache, 'U1')['contractor_id'] == 'C001'
+
+        # A fuzzy name is confirmed against the associated contractor only
+        record = dict(sample_pay_record, employee_id='812009', forename='Jonathon')
+        result = validator.find_contractor(record, contractors_cache, 'U1')
+        assert result['contractor_id'] == 'C009'
+        assert result['severity'] == 'WARNING'
+
+        # A name that doesn't confirm the ID falls back to name matching
+        record = dict(sample_pay_record, employee_id='812009', forename='David', surname='Hunt')
+        assert validator.find_contractor(record, contractors_cache, 'U1')['contractor_id'] == 'C002'
+
+        # Rows resolved by employee ID are left out of the batch
+        assert validator.match_names([sample_pay_record, record], contractors_cache, 'U1') == 1
+
     def test_rule2_unknown_contractor_critical_error(self, mock_dynamodb_client):
         """Rule 2: Unknown contractor returns CRITICAL error"""
         validator = ValidationEngine(mock_dynamodb_client)
@@ -403,6 +487,72 @@ class TestValidationEngine:
         assert 'FUZZY_NAME_MATCH' in warning_types
         assert 'UNUSUAL_HOURS' in warning_types
 
+    def test_validate_file_reads_reference_data_once(self, mock_dynamodb_client, sample_pay_record, sample_contractors, sample_period_data, sample_umbrella_associations):
+        """validate_file: reference data is read in batched reads, never per record"""
+        db = mock_dynamodb_client
+        db.get_period_rates = MagicMock(side_effect=lambda period_id: {
+            '8': {'C003': Decimal('450')}, '7': {'C001': Decimal('450')}
+        }[period_id])
+        db.get_umbrella_associations = MagicMock(return_value=sample_umbrella_associations[:2])
+        db.get_name_aliases = MagicMock(return_value=[])
+        db.get_contractors = MagicMock(return_value=sample_contractors)
+        db.get_contractor_pay_records = MagicMock(return_value=[{'DayRate': Decimal('400')}])
+        for per_record in ('check_permanent_staff', 'get_contractor_umbrella_associations',
+                           'get_contractor_rate_in_period', 'get_contractor_by_name'):
+            setattr(db, per_record, MagicMock())
+
+        records = [
+            sample_pay_record,
+            dict(sample_pay_record, row_number=6, employee_id='812003', forename='Donna', surname='Smith',
+                 record_type='OVERTIME', unit_days=2, day_rate=675.00, amount=1350.00, vat_amount=270.00),
+            dict(sample_pay_record, row_number=7, forename='Gareth', surname='Jones'),
+            dict(sample_pay_record, row_number=8, employee_id='812004', forename='Stephen', surname='Matthews'),
+        ]
+        validator = ValidationEngine(db)
+        results = validator.validate_file(records, 'U001', sample_period_data)
+
+        assert [r['valid'] for r in results] == [True, True, False, False]
+        assert results[0]['contractor_id'] == 'C001' and results[0]['association_id'] == 'A001'
+        assert results[0]['warnings'] == []
+        assert results[1]['association_id'] == 'A002'
+        assert [w['warning_type'] for w in results[1]['warnings']] == ['RATE_CHANGE']
+        assert results[2]['errors'][0]['error_type'] == 'PERMANENT_STAFF'
+        assert results[3]['errors'][0]['error_type'] == 'NO_UMBRELLA_ASSOCIATION'
+        assert results[3]['contractor_id'] is None
+
+        db.get_permanent_staff.assert_called_once()
+        assert db.get_period_rates.call_count == 2
+        # Only Donna Smith has no rate in period 7, and her history is read once
+        db.get_contractor_pay_records.assert_called_once_with('C003', limit=5)
+        for per_record in ('check_permanent_staff', 'get_contractor_umbrella_associations',
+                           'get_contractor_rate_in_period', 'get_contractor_by_name'):
+            getattr(db, per_record).assert_not_called()
+
+    def test_validate_file_resolves_each_record_once(self, mock_dynamodb_client, sample_pay_record, sample_contractors, sample_period_data, sample_umbrella_associations):
+        """validate_file: each record's contractor and association are resolved once, not again for the result"""
+        db = mock_dynamodb_client
+        db.get_period_rates = MagicMock(return_value={'C001': Decimal('450'), 'C003': Decimal('450')})
+        db.get_umbrella_associations = MagicMock(return_value=sample_umbrella_associations[:2])
+        db.get_name_aliases = MagicMock(return_value=[])
+
+        records = [
+            sample_pay_record,
+            dict(sample_pay_record, row_number=6, employee_id='812003', forename='Donna', surname='Smith'),
+            dict(sample_pay_record, row_number=7, forename='Gareth', surname='Jones'),
+        ]
+        validator = ValidationEngine(db)
+        contractors_cache = {c['ContractorID']: c for c in sample_contractors}
+        with patch.object(validator, 'find_contractor', wraps=validator.find_contractor) as find_contractor, \
+                patch.object(validator, 'validate_umbrella_association',
+                             wraps=validator.validate_umbrella_association) as validate_association:
+            results = validator.validate_file(records, 'U001', sample_period_data, contractors_cache)
+
+        assert [r['valid'] for r in results] == [True, True, False]
+        assert [(r['contractor_id'], r['association_id']) for r in results] == [('C001', 'A001'), ('C003', 'A002'), (None, None)]
+        # Gareth Jones is permanent staff, so Rule 1 stops him before any lookup
+        assert find_contractor.call_count == 2
+        assert validate_association.call_count == 2
+
     def test_system_parameters_loading(self, mock_dynamodb_client):
         """Test that system parameters are loaded correctly"""
         validator = ValidationEngine(mock_dynamodb_client)
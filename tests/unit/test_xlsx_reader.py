@@ -0,0 +1,93 @@
+"""
+Unit tests for xlsx_reader.py
+Tests the direct XML parse engine against the openpyxl engines
+"""
+
+import glob
+import os
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from common.excel_parser import PayFileParser
+from common.header_profiles import HeaderProfileRegistry
+from common.xlsx_reader import XlsxReader, column_index
+
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+SAMPLE_FILES = sorted(
+    glob.glob(os.path.join(REPO_ROOT, 'InputData', '*.xlsx')) +
+    glob.glob(os.path.join(REPO_ROOT, 'tests', 'fixtures', '*.xlsx'))
+)
+
+
+def parse(path, engine):
+    """Parse a file with a fresh header profile registry"""
+    with PayFileParser(path, engine=engine, header_profiles=HeaderProfileRegistry()) as parser:
+        return parser.parse_records()
+
+
+class TestXlsxReader:
+    """Test direct xlsx reading"""
+
+    def test_sample_files_found(self):
+        """Test that the parity corpus is present"""
+        assert len(SAMPLE_FILES) > 0
+
+    @pytest.mark.parametrize('path', SAMPLE_FILES, ids=os.path.basename)
+    def test_xml_engine_parity(self, path):
+        """Test that the xml engine yields the same records as the openpyxl engine"""
+        assert parse(path, 'xml') == parse(path, 'full')
+
+    def test_column_index(self):
+        """Test cell reference to column index conversion"""
+        assert column_index('A1') == 1
+        assert column_index('Z99') == 26
+        assert column_index('AA1') == 27
+        assert column_index('AB12') == 28
+
+    def test_cell_values_match_openpyxl(self, tmp_path):
+        """Test raw cell decoding: strings, ints, floats, bools, dates and gap rows"""
+        file_path = tmp_path / "values.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws['A1'] = 'text'
+        ws['B1'] = 42
+        ws['C1'] = 4.5
+        ws['D1'] = True
+        ws['E1'] = datetime(2025, 9, 1, 9, 30)
+        ws['C4'] = 'after a gap'
+        wb.save(file_path)
+
+        expected = list(load_workbook(file_path, read_only=True, data_only=True).active.iter_rows(values_only=True))
+
+        reader = XlsxReader(str(file_path))
+        rows = list(reader.active.iter_rows(values_only=True))
+        reader.close()
+
+        assert rows[0] == expected[0]
+        assert rows[1] == ()
+        assert rows[2] == ()
+        assert rows[3] == (None, None, 'after a gap')
+
+    def test_column_projection(self, tmp_path):
+        """Test that projected-out columns are not decoded"""
+        file_path = tmp_path / "projection.xlsx"
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['a', 'b', 'c', 'd'])
+        ws.append(['e', 'f', 'g', 'h'])
+        wb.save(file_path)
+
+        reader = XlsxReader(str(file_path))
+        sheet = reader.active
+        rows = sheet.iter_rows(values_only=True)
+
+        assert next(rows) == ('a', 'b', 'c', 'd')
+
+        sheet.project_columns({0, 2})
+        assert next(rows) == ('e', None, 'g')
+
+        reader.close()